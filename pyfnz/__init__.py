@@ -33,4 +33,7 @@
 #------------------------------------------------------------------------------
 
 from .either import Either, Left, Right
-from .tri import Try
+from .tri import Try, partition_results
+from .compiler import compile_do
+from .pipeline import Pipeline, batched
+from .memoize import memoize_try, memoize_either
@@ -0,0 +1,613 @@
+#------------------------------------------------------------------------------
+# array.py - columnar disjunctions backed by numpy
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import numpy as np
+
+from functools import wraps
+
+from .either import Left, Right
+from .tri import Failure, Success
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['EitherArray',
+           'TryArray',
+           'ElementError',
+           'vectorize',
+           'ERR_NONE',
+           'ERR_DIVIDE',
+           'ERR_OVERFLOW',
+           'ERR_INVALID',
+           'ERR_NONFINITE',
+           'ERR_RAISED']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# per element error codes of a TryArray
+ERR_NONE      = 0
+ERR_DIVIDE    = 1
+ERR_OVERFLOW  = 2
+ERR_INVALID   = 3
+ERR_NONFINITE = 4
+ERR_RAISED    = 5
+
+_MESSAGES = {ERR_DIVIDE    : 'divide by zero',
+             ERR_OVERFLOW  : 'overflow',
+             ERR_INVALID   : 'invalid value',
+             ERR_NONFINITE : 'non-finite value'}
+
+# numpy error callback flags, in order of precedence
+_FLAG_CODES = ((1, ERR_DIVIDE),
+               (2, ERR_OVERFLOW),
+               (8, ERR_INVALID))
+
+_SINGLE = frozenset(flag for flag, _ in _FLAG_CODES)
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class ElementError(FloatingPointError):
+    """Floating point failure of a single element of a vectorized Try, the
+    error code is its only argument.
+    """
+
+    @property
+    def code(self):
+        return self.args[0]
+
+    def __str__(self):
+        return _MESSAGES.get(self.code, 'error')
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _item(array, i):
+    """Return element i of array as a python object.
+    """
+
+    value = array[i]
+    return value.item() if isinstance(value, np.generic) else value
+
+#------------------------------------------------------------------------------
+
+def _objects(n):
+    """Return an object array of n Nones.
+    """
+
+    return np.full(n, None, dtype=object)
+
+#------------------------------------------------------------------------------
+# ResultArray
+#------------------------------------------------------------------------------
+
+class ResultArray(object):
+    """Columnar storage for a sequence of disjunctions.  Right values live in a
+    single numpy array next to a boolean mask which is true where the element
+    is right.  Left values are kept in an object array which is only allocated
+    once the column holds a left.  The slots of `values` under a left hold a
+    fill value and should be ignored.
+
+    Subclasses pick the variant classes, see `EitherArray` and `TryArray`.
+
+    Note: Requires numpy.
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_values', '_mask', '_lefts')
+
+    _left  = None
+    _right = None
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, values, mask=None, lefts=None):
+        """Wrap values, all right unless a mask is given.  `lefts` holds the
+        left values aligned with `values`, entries under a true mask are
+        ignored.  Without it lefts hold None.
+        """
+
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("expected a 1-d array, got shape {0}".format(
+                values.shape))
+
+        if mask is None:
+            mask = np.ones(len(values), dtype=bool)
+        else:
+            mask = np.asarray(mask, dtype=bool)
+
+        if lefts is not None:
+            lefts = np.asarray(lefts, dtype=object)
+
+        for other in (mask, lefts):
+            if other is not None and other.shape != values.shape:
+                raise ValueError("shape mismatch {0} != {1}".format(
+                    other.shape, values.shape))
+
+        if lefts is None and not mask.all():
+            lefts = _objects(len(values))
+
+        self._values = values
+        self._mask   = mask
+        self._lefts  = lefts
+
+    #--------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._values)
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    #--------------------------------------------------------------------------
+
+    def __getitem__(self, index):
+        """Integer indexing returns a single disjunction, anything else (slices,
+        boolean masks, index arrays) returns a new array.
+        """
+
+        if isinstance(index, (int, np.integer)):
+            if self._mask[index]:
+                return self._right(_item(self._values, index))
+            return self._left(self._lefts[index])
+
+        lefts = None if self._lefts is None else self._lefts[index]
+        return type(self)(self._values[index], self._mask[index], lefts)
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        items = [repr(self[i]) for i in range(min(len(self), 6))]
+        if len(self) > 6:
+            items.append('...')
+        return "{cls}([{items}])".format(**{
+            'cls'   : self.__class__.__name__,
+            'items' : ', '.join(items)})
+
+    #--------------------------------------------------------------------------
+    # properties
+    #--------------------------------------------------------------------------
+
+    @property
+    def values(self):
+        """The underlying value array, slots under a left hold a fill value.
+        """
+
+        return self._values
+
+    #--------------------------------------------------------------------------
+
+    @property
+    def mask(self):
+        """Boolean array, true where the element is right.
+        """
+
+        return self._mask
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    @classmethod
+    def from_list(cls, results, dtype=None, fill=0):
+        """Build an array from a list of disjunctions.  Left slots of the value
+        array are set to `fill`.
+        """
+
+        right  = cls._right
+        values = []
+        mask   = []
+        lefts  = None
+        for i, result in enumerate(results):
+            if type(result) is right:
+                values.append(result._value)
+                mask.append(True)
+            else:
+                if lefts is None:
+                    lefts = {}
+                lefts[i] = result._value
+                values.append(fill)
+                mask.append(False)
+
+        array = cls(np.array(values, dtype=dtype), mask)
+        if lefts is not None:
+            array._lefts = _objects(len(values))
+            for i, value in lefts.items():
+                array._lefts[i] = value
+        return array
+
+    #--------------------------------------------------------------------------
+
+    def to_list(self):
+        """Convert to a list of disjunctions.
+        """
+
+        left, right = self._left, self._right
+        lefts = self._lefts
+        return [right(v) if m else left(lefts[i])
+                for i, (v, m) in enumerate(zip(self._values.tolist(),
+                                               self._mask.tolist()))]
+
+    #--------------------------------------------------------------------------
+
+    def is_left(self):
+        """Boolean array, true where the element is left.
+        """
+
+        return ~self._mask
+
+    #--------------------------------------------------------------------------
+
+    def is_right(self):
+        """Boolean array, true where the element is right.
+        """
+
+        return self._mask.copy()
+
+    #--------------------------------------------------------------------------
+
+    def get_or_else(self, x):
+        """Return the values with lefts replaced by x, which may be a scalar or
+        an array.
+        """
+
+        return np.where(self._mask, self._values, x)
+
+    #--------------------------------------------------------------------------
+
+    def partition(self):
+        """Return `(lefts, rights)`, an object array of the left values and an
+        array of the right values.
+        """
+
+        lefts = _objects(0) if self._lefts is None else \
+                self._lefts[~self._mask]
+        return lefts, self._values[self._mask]
+
+    #--------------------------------------------------------------------------
+
+    def ensure(self, p, left):
+        """Turn rights whose value fails the vectorized predicate p into left.
+        `left` may be a scalar or an array aligned with this one.
+        """
+
+        failed = self._mask & ~np.asarray(p(self._values), dtype=bool)
+        if not failed.any():
+            return self
+
+        lefts = _objects(len(self)) if self._lefts is None else \
+                self._lefts.copy()
+        lefts[failed] = left if np.ndim(left) == 0 else \
+                        np.asarray(left, dtype=object)[failed]
+        return type(self)(self._values, self._mask & ~failed, lefts)
+
+    #--------------------------------------------------------------------------
+
+    def left_map(self, f):
+        """Run the given function on each left value.
+        """
+
+        if self._lefts is None:
+            return self
+
+        lefts = self._lefts.copy()
+        for i in np.flatnonzero(~self._mask):
+            lefts[i] = f(lefts[i])
+        return type(self)(self._values, self._mask, lefts)
+
+    #- Functor ----------------------------------------------------------------
+
+    def map(self, f):
+        """Map the element-wise vectorized function f (ie. a ufunc) over the
+        right values in a single call.  Lefts are left untouched, f only sees
+        the slots under them when every element is right.
+        """
+
+        if self._mask.all():
+            return type(self)(f(self._values), self._mask, self._lefts)
+
+        return type(self)(self._scatter(f(self._values[self._mask])),
+                          self._mask, self._lefts)
+
+    #- Monad ------------------------------------------------------------------
+
+    def flatmap(self, g):
+        """Bind the vectorized function g over the right values, it must return
+        an array of the same type and length as its input.  An element is right
+        only if it is right in both, lefts of this array take precedence.
+        """
+
+        everything = self._mask.all()
+        values     = self._values if everything else self._values[self._mask]
+        other      = g(values)
+        if not isinstance(other, type(self)) or len(other) != len(values):
+            raise TypeError("flatmap expects a {0} of length {1}".format(
+                type(self).__name__, len(values)))
+
+        if everything:
+            return type(self)(other._values, other._mask, other._lefts)
+
+        mask = self._mask.copy()
+        mask[self._mask] = other._mask
+        lefts = self._lefts.copy()
+        if other._lefts is not None:
+            lefts[self._mask] = other._lefts
+        return type(self)(self._scatter(other._values), mask, lefts)
+
+    #--------------------------------------------------------------------------
+    # internal methods
+    #--------------------------------------------------------------------------
+
+    def _scatter(self, rights):
+        """Full length value array holding the given values of the right
+        slots, the left slots are zero filled.
+        """
+
+        rights = np.asarray(rights)
+        values = np.zeros(len(self), dtype=rights.dtype)
+        values[self._mask] = rights
+        return values
+
+    #--------------------------------------------------------------------------
+
+    def _merge_lefts(self, lefts):
+        """Overlay this array's lefts onto the aligned lefts array given.
+        """
+
+        if self._lefts is None:
+            return lefts
+
+        merged = _objects(len(self)) if lefts is None else lefts.copy()
+        ours   = ~self._mask
+        merged[ours] = self._lefts[ours]
+        return merged
+
+#------------------------------------------------------------------------------
+# EitherArray
+#------------------------------------------------------------------------------
+
+class EitherArray(ResultArray):
+    """Columnar Either, converts to and from lists of `Left`/`Right`.
+
+    ex:
+        >>> column = EitherArray(np.array([4.0, -1.0, 9.0]))
+        >>> column.ensure(lambda v: v >= 0, 'negative').map(np.sqrt)
+        >>> EitherArray([Right(2.0), Left('negative'), Right(3.0)])
+    """
+
+    __slots__ = ()
+
+    _left  = Left
+    _right = Right
+
+#------------------------------------------------------------------------------
+# TryArray
+#------------------------------------------------------------------------------
+
+class TryArray(ResultArray):
+    """Columnar Try, converts to and from lists of `Failure`/`Success`.  An
+    exception raised by a vectorized `map` fails every successful element.
+    """
+
+    __slots__ = ()
+
+    _left  = Failure
+    _right = Success
+
+    #--------------------------------------------------------------------------
+    # properties
+    #--------------------------------------------------------------------------
+
+    @property
+    def codes(self):
+        """Array of per element error codes, `ERR_NONE` for successes and
+        `ERR_RAISED` for failures not produced by a floating point error.
+        """
+
+        codes  = np.zeros(len(self), dtype=np.uint8)
+        failed = np.flatnonzero(~self._mask)
+        if len(failed):
+            codes[failed] = [e.code if isinstance(e, ElementError) else
+                             ERR_RAISED for e in self._lefts[failed]]
+        return codes
+
+    #- Functor ----------------------------------------------------------------
+
+    def map(self, f):
+        """Map the vectorized function f over the successes capturing floating
+        point errors per element, see `vectorize`.
+        """
+
+        return vectorize(f)(self)
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def vectorize(f):
+    """Wrap the element-wise vectorized function f (ie. a ufunc) so it returns
+    a `TryArray`.  f runs once over the whole input with floating point errors
+    recorded instead of raised.  Elements which hit a divide by zero, overflow
+    or invalid operation, or whose result is not finite, become failures
+    holding an `ElementError` with the matching code, non-finite inputs are
+    passed through as `ERR_NONFINITE`.  Non-finite results are classified by
+    re-running f on them as a group.  Errors leaving no inf/nan behind (ie.
+    integer division by zero) are located by re-running f on halves of the
+    input that reported one, which is only cheap when such errors are rare.
+
+    Positional arguments are broadcast together, `TryArray` arguments
+    contribute their successful values and keep their failures.  An exception
+    raised by f fails every element.
+    """
+
+    @wraps(f)
+    def vectorized(*args, **kwargs):
+        arrays = np.broadcast_arrays(*[a._values if isinstance(a, TryArray)
+                                       else a for a in args])
+        arrays = [np.atleast_1d(a) for a in arrays]
+        n      = len(arrays[0])
+
+        # failures of the inputs, the leftmost wins
+        mask  = np.ones(n, dtype=bool)
+        lefts = None
+        for arg in reversed(args):
+            if isinstance(arg, TryArray):
+                if len(arg) != n:
+                    raise ValueError("TryArray of length {0} can't broadcast "
+                                     "to {1}".format(len(arg), n))
+                mask &= arg._mask
+                lefts = arg._merge_lefts(lefts)
+
+        try:
+            values, flags = _run(f, arrays, kwargs)
+        except Exception as e:
+            failed = _objects(n)
+            failed[mask] = e
+            lefts = TryArray(arrays[0], mask, lefts)._merge_lefts(failed)
+            return TryArray(arrays[0], np.zeros(n, dtype=bool), lefts)
+
+        values = np.atleast_1d(values)
+        if values.shape != (n,):
+            raise ValueError("vectorized function returned shape {0}, "
+                             "expected {1}".format(values.shape, (n,)))
+
+        # non-finite results are failures.  Non-finite inputs pass through,
+        # nan and inf results are classified per group first and the rest is
+        # only searched if they don't explain every error raised
+        codes     = np.zeros(n, dtype=np.uint8)
+        found     = 0
+        mask_rest = mask
+        if values.dtype.kind in 'fc':
+            bad = mask & ~np.isfinite(values)
+            if bad.any():
+                passed = bad & ~_finite(arrays, n)
+                codes[passed] = ERR_NONFINITE
+                for group in (bad & ~passed & np.isnan(values),
+                              bad & ~passed & np.isinf(values)):
+                    if group.any():
+                        found |= _locate(f, arrays, kwargs,
+                                         np.flatnonzero(group), codes,
+                                         failed=True)
+                mask_rest = mask & ~bad
+
+        if flags & ~found:
+            _locate(f, arrays, kwargs, np.flatnonzero(mask_rest), codes)
+
+        failed = mask & (codes != ERR_NONE)
+        if failed.any():
+            lefts = _objects(n) if lefts is None else lefts.copy()
+            for code in np.unique(codes[failed]).tolist():
+                lefts[failed & (codes == code)] = ElementError(code)
+
+        return TryArray(values, mask & ~failed, lefts)
+    return vectorized
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _run(f, arrays, kwargs):
+    """Call f with floating point errors recorded, underflow is ignored.
+    Returns the result and the numpy error flags raised.
+    """
+
+    flags = [0]
+    def record(err, flag):
+        flags[0] |= flag
+
+    with np.errstate(all='call', under='ignore', call=record):
+        values = f(*arrays, **kwargs)
+    return values, flags[0]
+
+#------------------------------------------------------------------------------
+
+def _finite(arrays, n):
+    """Boolean array, true where every numeric input is finite.
+    """
+
+    finite = np.ones(n, dtype=bool)
+    for a in arrays:
+        if a.dtype.kind in 'fc':
+            finite &= np.isfinite(a)
+    return finite
+
+#------------------------------------------------------------------------------
+
+def _locate(f, arrays, kwargs, index, codes, failed=False):
+    """Set the error code of the elements at index which raise a floating
+    point error, bisecting groups down to single elements.  When `failed`
+    every element is known to have failed and a group reporting a single kind
+    of error (or none, `ERR_NONFINITE`) is coded at once.  Returns the error
+    flags seen.
+    """
+
+    seen    = 0
+    pending = [index]
+    while pending:
+        index = pending.pop()
+        if not len(index):
+            # nothing to search, f may still report errors on empty input
+            continue
+        try:
+            _, flags = _run(f, [a[index] for a in arrays], kwargs)
+        except Exception:
+            continue
+
+        seen |= flags
+        if failed and not flags:
+            codes[index] = ERR_NONFINITE
+        elif not flags:
+            continue
+        elif len(index) == 1 or (failed and flags in _SINGLE):
+            codes[index] = next(code for flag, code in _FLAG_CODES
+                                     if flags & flag)
+        else:
+            half = len(index) // 2
+            pending.append(index[:half])
+            pending.append(index[half:])
+
+    return seen
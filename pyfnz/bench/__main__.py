@@ -0,0 +1,95 @@
+#------------------------------------------------------------------------------
+# __main__.py - command line entry point for the micro-benchmarks
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import argparse
+import sys
+
+from . import runner
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='python -m pyfnz.bench',
+        description='Time pyfnz hot paths and report ops/sec and ns/op.')
+    parser.add_argument('-k', '--pattern', default=None,
+        help="glob over 'group.name', ie. 'either.*' or '*.map_*'")
+    parser.add_argument('-s', '--sizes', default=None,
+        help="comma separated input sizes overriding the defaults")
+    parser.add_argument('-o', '--output', default=None,
+        help="write json results to this path")
+    parser.add_argument('-c', '--compare', default=None,
+        help="json results of a previous run to compute speedups against")
+    parser.add_argument('-t', '--min-time', type=float, default=0.2,
+        help="minimum seconds per timing run (default: 0.2)")
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+        help="timing runs per benchmark, best is kept (default: 5)")
+    parser.add_argument('-l', '--list', action='store_true',
+        help="list benchmarks and exit")
+    return parser.parse_args(argv)
+
+#------------------------------------------------------------------------------
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    if args.list:
+        for bench in runner.registry():
+            sizes = ','.join(map(str, bench.sizes or ()))
+            print("{0:<40} {1}".format(bench.key, sizes))
+        return 0
+
+    sizes = args.sizes and tuple(int(s) for s in args.sizes.split(','))
+
+    results = runner.run(pattern=args.pattern, sizes=sizes,
+                         min_time=args.min_time, repeat=args.repeat,
+                         out=sys.stdout)
+
+    if args.compare:
+        print('')
+        print(runner.report(results, runner.load(args.compare)))
+
+    if args.output:
+        runner.dump(results, args.output)
+
+    return 0
+
+#------------------------------------------------------------------------------
+# entry point
+#------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#------------------------------------------------------------------------------
+# array.py - benchmarks for the numpy backed columnar disjunctions
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from ..either import Left, Right
+from ..tri import Try
+from .runner import benchmark
+
+try:
+    import numpy as np
+    from ..array import EitherArray
+except ImportError:
+    np = None
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+SIZES = (1000, 100000, 1000000)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def make_eithers(n):
+    """Every tenth element is a left.
+    """
+
+    return [Left('bad') if i % 10 == 0 else Right(float(i)) for i in range(n)]
+
+#------------------------------------------------------------------------------
+# column pass, objects vs columnar
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'map_objects', sizes=SIZES)
+def map_objects(n):
+    eithers = make_eithers(n)
+    f = lambda x: x * 2.0 + 1.0
+    return lambda: [e.map(f) for e in eithers]
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'map_column', sizes=SIZES)
+def map_column(n):
+    if np is None:
+        return None
+
+    column = EitherArray.from_list(make_eithers(n), dtype=float)
+    f = lambda v: v * 2.0 + 1.0
+    return lambda: column.map(f)
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'get_or_else_objects', sizes=SIZES)
+def get_or_else_objects(n):
+    eithers = make_eithers(n)
+    return lambda: [e.get_or_else(0.0) for e in eithers]
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'get_or_else_column', sizes=SIZES)
+def get_or_else_column(n):
+    if np is None:
+        return None
+
+    column = EitherArray.from_list(make_eithers(n), dtype=float)
+    return lambda: column.get_or_else(0.0)
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'validate_objects', sizes=SIZES)
+def validate_objects(n):
+    values = [float(i) for i in range(n)]
+    check  = lambda x: Right(x) if x % 7 else Left('div7')
+    return lambda: [check(x).map(abs) for x in values]
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'validate_column', sizes=SIZES)
+def validate_column(n):
+    if np is None:
+        return None
+
+    values = np.arange(n, dtype=float)
+    return lambda: EitherArray(values).ensure(lambda v: v % 7 != 0,
+                                              'div7').map(np.abs)
+
+#------------------------------------------------------------------------------
+# vectorized try, scalar loop vs per element capture
+#------------------------------------------------------------------------------
+
+def make_denominators(n, every=100):
+    """Every `every`th element is a zero.
+    """
+
+    return [0.0 if i % every == 0 else float(i) for i in range(n)]
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'try_objects', sizes=SIZES)
+def try_objects(n):
+    xs  = make_denominators(n)
+    inv = lambda x: 1.0 / x
+    return lambda: [Try(inv, x) for x in xs]
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'try_vectorize', sizes=SIZES)
+def try_vectorize(n):
+    if np is None:
+        return None
+
+    xs  = np.array(make_denominators(n))
+    inv = Try.vectorize(lambda x: 1.0 / x)
+    return lambda: inv(xs)
+
+#------------------------------------------------------------------------------
+
+@benchmark('array', 'try_vectorize_integer', sizes=SIZES)
+def try_vectorize_integer(n):
+    """Integer division errors leave no inf/nan behind and are located by
+    bisection, which is only cheap when they are rare.
+    """
+
+    if np is None:
+        return None
+
+    xs  = np.array(make_denominators(n, 10000), dtype=np.int64)
+    div = Try.vectorize(lambda x: 1000 // x)
+    return lambda: div(xs)
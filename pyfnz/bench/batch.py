@@ -0,0 +1,104 @@
+#------------------------------------------------------------------------------
+# batch.py - benchmarks for batched Try/Either helpers
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from ..either import Either, Left, Right
+from ..tri import Try, partition_results
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+SIZES = (1000, 1000000)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def make_inputs(n, every=100):
+    """Strings parsable by `int` except for every `every`th one.
+    """
+
+    return ['x' if i % every == 0 else str(i) for i in range(n)]
+
+#------------------------------------------------------------------------------
+
+def parse(s):
+    return Right(int(s)) if s.isdigit() else Left(s)
+
+#------------------------------------------------------------------------------
+# partition
+#------------------------------------------------------------------------------
+
+@benchmark('batch', 'partition_comprehension', sizes=SIZES)
+def partition_comprehension(n):
+    """The list comprehension followed by filtering idiom.
+    """
+
+    inputs = make_inputs(n)
+    def op():
+        results = [Try(int, s) for s in inputs]
+        return ([r.get() for r in results if r.is_success()],
+                [r._value for r in results if r.is_failure()])
+    return op
+
+#------------------------------------------------------------------------------
+
+@benchmark('batch', 'partition_results', sizes=SIZES)
+def partition_results_(n):
+    inputs = make_inputs(n)
+    return lambda: partition_results(inputs, int)
+
+#------------------------------------------------------------------------------
+# traverse
+#------------------------------------------------------------------------------
+
+@benchmark('batch', 'try_per_item', sizes=SIZES)
+def try_per_item(n):
+    inputs = [str(i) for i in range(n)]
+    return lambda: Try.sequence([Try(int, s) for s in inputs])
+
+#------------------------------------------------------------------------------
+
+@benchmark('batch', 'try_traverse', sizes=SIZES)
+def try_traverse(n):
+    inputs = [str(i) for i in range(n)]
+    return lambda: Try.traverse(int, inputs)
+
+#------------------------------------------------------------------------------
+
+@benchmark('batch', 'either_traverse', sizes=SIZES)
+def either_traverse(n):
+    inputs = [str(i) for i in range(n)]
+    return lambda: Either.traverse(parse, inputs)
@@ -0,0 +1,81 @@
+#------------------------------------------------------------------------------
+# breaker.py - benchmarks for CircuitBreaker
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from ..breaker import CircuitBreaker
+from ..tri import Try
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def ok():
+    return 1
+
+#------------------------------------------------------------------------------
+
+def fail():
+    raise IOError('down')
+
+#------------------------------------------------------------------------------
+# overhead
+#------------------------------------------------------------------------------
+
+@benchmark('breaker', 'plain')
+def plain():
+    """Baseline, the call wrapped in a Try without a breaker.
+    """
+
+    return lambda: Try(ok)
+
+#------------------------------------------------------------------------------
+
+@benchmark('breaker', 'closed')
+def closed():
+    """The same call through a closed breaker.
+    """
+
+    breaker = CircuitBreaker()
+    return lambda: breaker.call(ok)
+
+#------------------------------------------------------------------------------
+
+@benchmark('breaker', 'open')
+def open_():
+    """A call rejected by an open breaker.
+    """
+
+    breaker = CircuitBreaker(window=1, min_calls=1, reset_timeout=3600.0)
+    breaker.call(fail)
+    return lambda: breaker.call(ok)
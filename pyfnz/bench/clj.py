@@ -0,0 +1,286 @@
+#------------------------------------------------------------------------------
+# clj.py - benchmarks for the clojure core functions
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from .. import clj
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+SIZES = (10, 100, 1000)
+
+# sizes showing a scan grows linearly
+LINEAR_SIZES = (1000, 10000, 100000)
+
+# sizes of first/nxt walks, quadratic over lists
+WALK_SIZES = (100, 1000, 10000)
+
+# number of composed fns, past 8 comp loops over them
+COMP_SIZES = (2, 4, 8, 16)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def make_list(n):
+    return list(range(n))
+
+#------------------------------------------------------------------------------
+
+def make_dict(n, offset=0):
+    return {k : k for k in range(offset, offset + n)}
+
+#------------------------------------------------------------------------------
+# predicates
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'is_some')
+def is_some():
+    return lambda: clj.is_some(1)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'is_empty', sizes=SIZES)
+def is_empty(n):
+    lst = make_list(n)
+    return lambda: clj.is_empty(lst)
+
+#------------------------------------------------------------------------------
+# sequences
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'first', sizes=SIZES)
+def first(n):
+    lst = make_list(n)
+    return lambda: clj.first(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'second', sizes=SIZES)
+def second(n):
+    lst = make_list(n)
+    return lambda: clj.second(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'ffirst', sizes=SIZES)
+def ffirst(n):
+    lst = [make_list(n)]
+    return lambda: clj.ffirst(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'last', sizes=SIZES)
+def last(n):
+    lst = make_list(n)
+    return lambda: clj.last(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'butlast', sizes=SIZES)
+def butlast(n):
+    lst = make_list(n)
+    return lambda: clj.butlast(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'nxt', sizes=SIZES)
+def nxt(n):
+    lst = make_list(n)
+    return lambda: clj.nxt(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'rest', sizes=SIZES)
+def rest(n):
+    lst = make_list(n)
+    return lambda: clj.rest(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'some', sizes=LINEAR_SIZES)
+def some(n):
+    lst  = make_list(n)
+    last = n - 1
+    pred = lambda x: x == last
+    return lambda: clj.some(pred, lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'some_generator', sizes=LINEAR_SIZES)
+def some_generator(n):
+    """Scan a fresh generator, walked once.
+    """
+
+    last = n - 1
+    pred = lambda x: x == last
+    return lambda: clj.some(pred, (x for x in range(n)))
+
+#------------------------------------------------------------------------------
+
+def _walk(seq):
+    """Seq style loop over first/nxt.
+    """
+
+    total = 0
+    while seq is not None:
+        total += clj.first(seq)
+        seq = clj.nxt(seq)
+    return total
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'walk_list', sizes=WALK_SIZES)
+def walk_list(n):
+    """Walk a list, nxt copies the remainder on every step.
+    """
+
+    lst = make_list(n)
+    return lambda: _walk(lst)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'walk_lazy_seq', sizes=WALK_SIZES)
+def walk_lazy_seq(n):
+    """Walk a fresh LazySeq over the same items, nxt shares the cells.
+    """
+
+    lst = make_list(n)
+    return lambda: _walk(clj.LazySeq(lst))
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'walk_view', sizes=WALK_SIZES)
+def walk_view(n):
+    """Walk views of the same list, nxt copies nothing.
+    """
+
+    lst = make_list(n)
+    def op():
+        total, seq = 0, lst
+        while seq is not None:
+            total += clj.first(seq)
+            seq = clj.nxt(seq, view=True)
+        return total
+    return op
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'walk_bytes', sizes=LINEAR_SIZES)
+def walk_bytes(n):
+    """Consume a bytes payload one byte at a time, copying the tail.
+    """
+
+    payload = bytes(n)
+    def op():
+        seq = payload
+        while seq is not None:
+            seq = clj.nxt(seq)
+    return op
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'walk_bytes_view', sizes=LINEAR_SIZES)
+def walk_bytes_view(n):
+    """The same payload through memoryview slices.
+    """
+
+    payload = bytes(n)
+    def op():
+        seq = payload
+        while seq is not None:
+            seq = clj.nxt(seq, view=True)
+    return op
+
+#------------------------------------------------------------------------------
+# dicts
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'merge', sizes=SIZES)
+def merge(n):
+    a, b = make_dict(n), make_dict(n, n // 2)
+    return lambda: clj.merge(a, None, b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'select_keys', sizes=SIZES)
+def select_keys(n):
+    dct  = make_dict(n)
+    keys = set(range(0, n, 2))
+    return lambda: clj.select_keys(dct, keys)
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'identity')
+def identity():
+    return lambda: clj.identity(1)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'constantly')
+def constantly():
+    fn = clj.constantly(1)
+    return lambda: fn(2)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'comp', sizes=COMP_SIZES)
+def comp(n):
+    fn = clj.comp(*([lambda x: x + 1] * n))
+    return lambda: fn(1)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'comp_nested', sizes=COMP_SIZES)
+def comp_nested(n):
+    """A composition of pairwise compositions, flattened by comp.
+    """
+
+    inc = lambda x: x + 1
+    fn  = clj.comp(*([clj.comp(inc, inc)] * (n // 2)))
+    return lambda: fn(1)
+
+#------------------------------------------------------------------------------
+
+@benchmark('clj', 'nested_calls', sizes=COMP_SIZES)
+def nested_calls(n):
+    """Baseline, the same calls nested by hand in a function.
+    """
+
+    inc = lambda x: x + 1
+    fn  = eval("lambda x: {0}x{1}".format('inc(' * n, ')' * n), {'inc' : inc})
+    return lambda: fn(1)
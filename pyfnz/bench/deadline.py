@@ -0,0 +1,87 @@
+#------------------------------------------------------------------------------
+# deadline.py - latency benchmarks for Try.with_timeout
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import itertools
+import time
+
+from ..tri import Try
+from .runner import benchmark, latencies
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+FAST    = 0.001
+SLOW    = 0.05
+TIMEOUT = 0.005
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def flaky(every=20):
+    """A call usually taking FAST seconds but SLOW every `every`th time.
+    """
+
+    counter = itertools.count(1)
+    def call():
+        time.sleep(SLOW if next(counter) % every == 0 else FAST)
+        return 1
+    return call
+
+#------------------------------------------------------------------------------
+# latency
+#------------------------------------------------------------------------------
+
+@benchmark('deadline', 'plain')
+def plain():
+    """Direct calls, 5% of them slow.
+    """
+
+    call = flaky()
+    op   = lambda: Try(call)
+    op.info = latencies(op)
+    return op
+
+#------------------------------------------------------------------------------
+
+@benchmark('deadline', 'with_timeout')
+def with_timeout():
+    """The same calls bounded by a timeout on the shared pool.
+    """
+
+    call = flaky()
+    op   = lambda: Try.with_timeout(call, TIMEOUT)
+    op.info = latencies(op)
+    return op
@@ -0,0 +1,296 @@
+#------------------------------------------------------------------------------
+# either.py - benchmarks for Either
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import sys
+
+from ..compiler import compile_do
+from ..either import Either, Left, Right
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+DEPTHS = (100, 400, 100000)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+inc      = lambda x: x + 1
+inc_safe = lambda x: Right(x + 1)
+
+#------------------------------------------------------------------------------
+# construction
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'construct_right')
+def construct_right():
+    return lambda: Right(1)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'construct_left')
+def construct_left():
+    return lambda: Left(1)
+
+#------------------------------------------------------------------------------
+# functor / monad
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'map_right')
+def map_right():
+    right = Right(1)
+    return lambda: right.map(inc)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'map_left')
+def map_left():
+    left = Left(1)
+    return lambda: left.map(inc)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'flatmap_right')
+def flatmap_right():
+    right = Right(1)
+    return lambda: right.flatmap(inc_safe)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'flatmap_left')
+def flatmap_left():
+    left = Left(1)
+    return lambda: left.flatmap(inc_safe)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'get_or_else_right')
+def get_or_else_right():
+    right = Right(1)
+    return lambda: right.get_or_else(0)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'get_or_else_left')
+def get_or_else_left():
+    left = Left(1)
+    return lambda: left.get_or_else(0)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'map_chain', sizes=(10, 100, 1000))
+def map_chain(n):
+    def chain():
+        e = Right(0)
+        for _ in range(n):
+            e = e.map(inc)
+        return e
+    return chain
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'flatmap_chain', sizes=(10, 100, 1000))
+def flatmap_chain(n):
+    def chain():
+        e = Right(0)
+        for _ in range(n):
+            e = e.flatmap(inc_safe)
+        return e
+    return chain
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'lazy_map_chain', sizes=(10, 100, 1000))
+def lazy_map_chain(n):
+    """`map_chain` as a prebuilt lazy pipeline, run on a fresh value.
+    """
+
+    pipeline = Right(1).lazy()
+    for _ in range(n):
+        pipeline = pipeline.map(inc)
+    pipeline.run()
+    return lambda: pipeline.run(1)
+
+#------------------------------------------------------------------------------
+# hashing
+#------------------------------------------------------------------------------
+
+def _results(n):
+    """n results over a hundred distinct values, one in ten left.
+    """
+
+    return [Left(i % 100) if i % 10 == 0 else Right(i % 100) for i in range(n)]
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'dedupe', sizes=(1000, 100000, 1000000))
+def dedupe(n):
+    """Deduplicate results in a set.
+    """
+
+    results = _results(n)
+    return lambda: set(results)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'count_by', sizes=(1000, 100000, 1000000))
+def count_by(n):
+    """Count results in a dict keyed by the result, the same results counted
+    again so cached hashes are reused.
+    """
+
+    results = _results(n)
+    def op():
+        counts = {}
+        for result in results:
+            counts[result] = counts.get(result, 0) + 1
+        return counts
+    return op
+
+#------------------------------------------------------------------------------
+# recursion
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'tailrec', sizes=DEPTHS)
+def tailrec(n):
+    step = lambda n: Right(Left(n - 1)) if n > 0 else Right(Right(n))
+    return lambda: Either.tailrec(step, n)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'recursive', sizes=DEPTHS)
+def recursive(n):
+    """Naive `flatmap` recursion, skipped once it would blow the stack.
+    """
+
+    if n * 2 + 100 > sys.getrecursionlimit():
+        return None
+
+    step = lambda n: Right(n - 1)
+    def go(x):
+        return step(x).flatmap(go) if x > 0 else Right(x)
+    return lambda: go(n)
+
+#------------------------------------------------------------------------------
+# do notation
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_right')
+def do_right():
+    a, b = Right(1), Right(2)
+    return lambda: Either.do(x + y
+                             for x in a
+                             for y in b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_left')
+def do_left():
+    a, b = Left(1), Right(2)
+    return lambda: Either.do(x + y
+                             for x in a
+                             for y in b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_block_right')
+def do_block_right():
+    a, b = Right(1), Right(2)
+
+    @Either.do_block
+    def block():
+        x = yield a
+        y = yield b
+        return x + y
+    return block
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_block_left')
+def do_block_left():
+    a, b = Left(1), Right(2)
+
+    @Either.do_block
+    def block():
+        x = yield a
+        y = yield b
+        return x + y
+    return block
+
+#------------------------------------------------------------------------------
+
+@compile_do
+def _compiled(a, b):
+    return Either.do(x + y
+                     for x in a
+                     for y in b)
+
+#------------------------------------------------------------------------------
+
+def _handwritten(a, b):
+    if a.is_left():
+        return a
+    if b.is_left():
+        return b
+    return Right((a | None) + (b | None))
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_compiled_right')
+def do_compiled_right():
+    a, b = Right(1), Right(2)
+    return lambda: _compiled(a, b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_compiled_left')
+def do_compiled_left():
+    a, b = Left(1), Right(2)
+    return lambda: _compiled(a, b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_handwritten_right')
+def do_handwritten_right():
+    a, b = Right(1), Right(2)
+    return lambda: _handwritten(a, b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('either', 'do_handwritten_left')
+def do_handwritten_left():
+    a, b = Left(1), Right(2)
+    return lambda: _handwritten(a, b)
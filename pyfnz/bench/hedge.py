@@ -0,0 +1,69 @@
+#------------------------------------------------------------------------------
+# hedge.py - latency benchmarks for Try.hedged
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from ..tri import Try
+from .deadline import flaky
+from .runner import benchmark, latencies
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+AFTER = 0.005
+
+#------------------------------------------------------------------------------
+# latency
+#------------------------------------------------------------------------------
+
+@benchmark('hedge', 'single')
+def single():
+    """One attempt per call on the pool, 5% of attempts slow.
+    """
+
+    call = flaky()
+    op   = lambda: Try.hedged(call, max_attempts=1)
+    op.info = latencies(op)
+    return op
+
+#------------------------------------------------------------------------------
+
+@benchmark('hedge', 'hedged')
+def hedged():
+    """A second attempt once the first takes longer than AFTER.
+    """
+
+    call = flaky()
+    op   = lambda: Try.hedged(call, after=AFTER, max_attempts=2)
+    op.info = latencies(op)
+    return op
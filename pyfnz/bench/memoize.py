@@ -0,0 +1,86 @@
+#------------------------------------------------------------------------------
+# memoize.py - benchmarks for memoize_try
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import functools
+
+from ..memoize import memoize_try
+from ..tri import Try
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+KEYS = 1000
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def lookup(key):
+    return Try(lambda: 100 // (key % 10))
+
+#------------------------------------------------------------------------------
+# hits
+#------------------------------------------------------------------------------
+
+@benchmark('memoize', 'lru_cache_hits')
+def lru_cache_hits():
+    """Baseline, cached lookups through functools.lru_cache.
+    """
+
+    cached = functools.lru_cache(maxsize=KEYS)(lookup)
+    return lambda: [cached(k) for k in range(KEYS)]
+
+#------------------------------------------------------------------------------
+
+@benchmark('memoize', 'memoize_try_hits')
+def memoize_try_hits():
+    """The same lookups through memoize_try, failures cached for a minute.
+    """
+
+    cached = memoize_try(maxsize=KEYS, failure_ttl=60.0)(lookup)
+    return lambda: [cached(k) for k in range(KEYS)]
+
+#------------------------------------------------------------------------------
+# misses
+#------------------------------------------------------------------------------
+
+@benchmark('memoize', 'uncached_failures')
+def uncached_failures():
+    """Lookups with failures never cached, every tenth reaches the backend.
+    """
+
+    cached = memoize_try(maxsize=KEYS, failure_ttl=0)(lookup)
+    return lambda: [cached(k) for k in range(KEYS)]
@@ -0,0 +1,111 @@
+#------------------------------------------------------------------------------
+# parallel.py - benchmarks for Try.map_parallel
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import os
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from ..tri import Try
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# the size of these benchmarks is the number of workers, counts above the
+# number of cores are skipped
+WORKERS = (1, 2, 4, 8, 16)
+ITEMS   = 256
+
+_pools = {}
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def work(n):
+    """CPU bound task taking roughly 100us, fails for multiples of 50.
+    """
+
+    if n % 50 == 0:
+        raise ValueError(n)
+    return sum(i * i for i in range(2000))
+
+#------------------------------------------------------------------------------
+
+def pool(cls, workers):
+    """Return a pool shared across runs, so startup isn't timed.
+    """
+
+    if workers > (os.cpu_count() or 1):
+        return None
+
+    key = (cls, workers)
+    if key not in _pools:
+        _pools[key] = cls(workers)
+    return _pools[key]
+
+#------------------------------------------------------------------------------
+# scaling
+#------------------------------------------------------------------------------
+
+@benchmark('parallel', 'serial')
+def serial():
+    inputs = list(range(ITEMS))
+    return lambda: [Try(work, x) for x in inputs]
+
+#------------------------------------------------------------------------------
+
+@benchmark('parallel', 'process', sizes=WORKERS)
+def process(workers):
+    executor = pool(ProcessPoolExecutor, workers)
+    if executor is None:
+        return None
+
+    inputs = list(range(ITEMS))
+    return lambda: Try.map_parallel(work, inputs, executor=executor)
+
+#------------------------------------------------------------------------------
+
+@benchmark('parallel', 'thread', sizes=WORKERS)
+def thread(workers):
+    """Threads only scale for work releasing the GIL, shown for reference.
+    """
+
+    executor = pool(ThreadPoolExecutor, workers)
+    if executor is None:
+        return None
+
+    inputs = list(range(ITEMS))
+    return lambda: Try.map_parallel(work, inputs, executor=executor)
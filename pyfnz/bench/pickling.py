@@ -0,0 +1,119 @@
+#------------------------------------------------------------------------------
+# pickling.py - benchmarks for pickling Either and Try
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import copyreg
+import io
+import pickle
+
+from ..either import Right
+from ..tri import Try
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+COUNT = 10000
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def boom(i):
+    raise ValueError(i)
+
+#------------------------------------------------------------------------------
+
+def make(kind):
+    """COUNT results of the given kind: right, success or failure.
+    """
+
+    if kind == 'right':
+        return [Right(i) for i in range(COUNT)]
+    elif kind == 'success':
+        return [Try.pure(i) for i in range(COUNT)]
+    return [Try(boom, i) for i in range(COUNT)]
+
+#------------------------------------------------------------------------------
+
+def generic(obj):
+    """The slot state reduce used before `__reduce__` was defined.
+    """
+
+    return copyreg.__newobj__, (type(obj),), (None, {'_value' : obj._value})
+
+#------------------------------------------------------------------------------
+
+def dumps_generic(objs):
+    out     = io.BytesIO()
+    pickler = pickle.Pickler(out, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    for cls in set(type(obj) for obj in objs):
+        pickler.dispatch_table[cls] = generic
+    pickler.dump(objs)
+    return out.getvalue()
+
+#------------------------------------------------------------------------------
+
+def dumps_compact(objs):
+    return pickle.dumps(objs, pickle.HIGHEST_PROTOCOL)
+
+#------------------------------------------------------------------------------
+
+def register(kind, encoding, dumps):
+    """Register dump and load benchmarks of COUNT results, reporting the
+    pickled bytes per object.
+    """
+
+    def setup_dumps():
+        objs = make(kind)
+        op   = lambda: dumps(objs)
+        op.info = {'bytes/obj' : round(len(dumps(objs)) / float(COUNT), 1)}
+        return op
+
+    def setup_loads():
+        data = dumps(make(kind))
+        return lambda: pickle.loads(data)
+
+    name = '{0}_{1}'.format(kind, encoding)
+    benchmark('pickle', 'dumps_' + name)(setup_dumps)
+    benchmark('pickle', 'loads_' + name)(setup_loads)
+
+#------------------------------------------------------------------------------
+# registration
+#------------------------------------------------------------------------------
+
+for _kind in ('right', 'success', 'failure'):
+    register(_kind, 'generic', dumps_generic)
+    register(_kind, 'compact', dumps_compact)
@@ -0,0 +1,107 @@
+#------------------------------------------------------------------------------
+# pipeline.py - benchmarks for Pipeline
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from ..either import Left, Right
+from ..pipeline import Pipeline, batched
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+SIZES = (1000, 100000)
+
+TABLE = dict((i, i * 2) for i in range(1000))
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+parse    = lambda s: Right(int(s)) if s.isdigit() else Left(s)
+positive = lambda x: Right(x) if x > 0 else Left(x)
+small    = lambda x: Right(x % 1000)
+
+#------------------------------------------------------------------------------
+
+def query(keys):
+    """Stands in for a database round trip, a fixed cost per call on top of
+    the cost per key.
+    """
+
+    sum(range(2000))
+    return [Right(TABLE[k]) if k in TABLE else Left(k) for k in keys]
+
+lookup       = lambda x: query([x])[0]
+lookup_batch = batched(query)
+
+#------------------------------------------------------------------------------
+
+def make_inputs(n):
+    return ['x' if i % 100 == 0 else str(i) for i in range(n)]
+
+#------------------------------------------------------------------------------
+# steps
+#------------------------------------------------------------------------------
+
+@benchmark('pipeline', 'flatmap_chain', sizes=SIZES)
+def flatmap_chain(n):
+    inputs = make_inputs(n)
+    return lambda: [parse(s).flatmap(positive).flatmap(small)
+                    for s in inputs]
+
+#------------------------------------------------------------------------------
+
+@benchmark('pipeline', 'run_many', sizes=SIZES)
+def run_many(n):
+    inputs   = make_inputs(n)
+    pipeline = Pipeline([parse, positive, small])
+    return lambda: list(pipeline.run_many(inputs))
+
+#------------------------------------------------------------------------------
+# batching
+#------------------------------------------------------------------------------
+
+@benchmark('pipeline', 'lookup_per_record', sizes=SIZES)
+def lookup_per_record(n):
+    inputs   = make_inputs(n)
+    pipeline = Pipeline([parse, positive, small, lookup])
+    return lambda: list(pipeline.run_many(inputs))
+
+#------------------------------------------------------------------------------
+
+@benchmark('pipeline', 'lookup_batched', sizes=SIZES)
+def lookup_batched(n):
+    inputs   = make_inputs(n)
+    pipeline = Pipeline([parse, positive, small, lookup_batch])
+    return lambda: list(pipeline.run_batches(inputs, 256))
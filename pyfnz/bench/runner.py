@@ -0,0 +1,282 @@
+#------------------------------------------------------------------------------
+# runner.py - timing harness for the pyfnz micro-benchmarks
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import fnmatch
+import json
+import platform
+import time
+import timeit
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['Benchmark',
+           'benchmark',
+           'registry',
+           'measure',
+           'latencies',
+           'run',
+           'report',
+           'dump',
+           'load',
+           'compare']
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class Benchmark(object):
+    """A registered benchmark.  `setup` builds the operation to time and
+    returns it as a zero argument callable.  Sized benchmarks receive the input
+    size as their only argument, unsized benchmarks receive none.  Returning
+    None from `setup` skips the benchmark (ie. optional dependency missing).
+    The returned callable may carry an `info` dict of extra figures (ie. bytes
+    per object) which is kept with its result and printed after the timings.
+    """
+
+    __slots__ = ('group', 'name', 'setup', 'sizes')
+
+    #--------------------------------------------------------------------------
+
+    def __init__(self, group, name, setup, sizes):
+        self.group = group
+        self.name  = name
+        self.setup = setup
+        self.sizes = sizes
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        return "Benchmark({0}.{1})".format(self.group, self.name)
+
+    #--------------------------------------------------------------------------
+
+    @property
+    def key(self):
+        return "{0}.{1}".format(self.group, self.name)
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+_registry = []
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def benchmark(group, name=None, sizes=None):
+    """Decorator registering a benchmark setup function under `group`.  The
+    benchmark name defaults to the function name.  When `sizes` is given the
+    setup function is called once per size.
+    """
+
+    def register(setup):
+        _registry.append(Benchmark(group, name or setup.__name__, setup, sizes))
+        return setup
+    return register
+
+#------------------------------------------------------------------------------
+
+def registry():
+    """Returns the registered benchmarks in registration order.
+    """
+
+    return list(_registry)
+
+#------------------------------------------------------------------------------
+
+def measure(op, min_time=0.2, repeat=5):
+    """Time the zero argument callable `op`.  The loop count is grown until a
+    single timing run takes at least `min_time` seconds, then the best of
+    `repeat` runs is kept.  Returns `(number, seconds_per_op)`.
+    """
+
+    timer  = timeit.Timer(op)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed < (min_time / 10.0) else 2
+
+    times = timer.repeat(repeat, number)
+    return number, min(times) / number
+
+#------------------------------------------------------------------------------
+
+def latencies(op, count=200):
+    """Call the zero argument callable `op` `count` times and return the
+    median and 99th percentile latency in milliseconds, as a dict meant for
+    the `info` of an operation.
+    """
+
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        op()
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    pick = lambda q: round(samples[min(count - 1, int(q * count))] * 1e3, 2)
+    return {'p50_ms' : pick(0.5),
+            'p99_ms' : pick(0.99)}
+
+#------------------------------------------------------------------------------
+
+def run(pattern=None, sizes=None, min_time=0.2, repeat=5, out=None):
+    """Run every registered benchmark whose `group.name` key matches the glob
+    `pattern`.  `sizes` overrides the default sizes of sized benchmarks.
+    Progress is written to `out` if given.  Returns a list of result dicts.
+    """
+
+    if out is not None:
+        out.write(_format_header() + '\n')
+
+    results = []
+    for bench in _registry:
+        if pattern and not fnmatch.fnmatch(bench.key, pattern):
+            continue
+
+        for size in (bench.sizes and (sizes or bench.sizes)) or (None,):
+            op = bench.setup() if size is None else bench.setup(size)
+            if op is None:
+                continue
+
+            number, seconds = measure(op, min_time, repeat)
+            result = {'group'       : bench.group,
+                      'name'        : bench.name,
+                      'size'        : size,
+                      'number'      : number,
+                      'repeat'      : repeat,
+                      'ns_per_op'   : seconds * 1e9,
+                      'ops_per_sec' : 1.0 / seconds if seconds else float('inf')}
+            info = getattr(op, 'info', None)
+            if info:
+                result['info'] = info
+            results.append(result)
+
+            if out is not None:
+                out.write(_format_row(result) + '\n')
+                out.flush()
+
+    return results
+
+#------------------------------------------------------------------------------
+
+def report(results, baseline=None):
+    """Returns a printable table of results.  If a baseline result list is
+    given, a speedup column relative to it is added.
+    """
+
+    lines = [_format_header(baseline is not None)]
+    index = _index(baseline or [])
+    for result in results:
+        speedup = None
+        if baseline is not None:
+            base    = index.get(_result_key(result))
+            speedup = base and base['ns_per_op'] / result['ns_per_op']
+        lines.append(_format_row(result, baseline is not None, speedup))
+    return '\n'.join(lines)
+
+#------------------------------------------------------------------------------
+
+def dump(results, path):
+    """Write results along with interpreter details as json to `path`.
+    """
+
+    document = {'python'    : platform.python_version(),
+                'impl'      : platform.python_implementation(),
+                'platform'  : platform.platform(),
+                'timestamp' : time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results'   : results}
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+#------------------------------------------------------------------------------
+
+def load(path):
+    """Read a results list previously written by `dump`.
+    """
+
+    with open(path) as f:
+        return json.load(f)['results']
+
+#------------------------------------------------------------------------------
+
+def compare(results, baseline):
+    """Returns a dict mapping `(group, name, size)` to the speedup of results
+    over baseline, for every benchmark present in both.
+    """
+
+    index = _index(baseline)
+    return {_result_key(r) : index[_result_key(r)]['ns_per_op'] / r['ns_per_op']
+            for r in results
+                if _result_key(r) in index}
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _result_key(result):
+    return (result['group'], result['name'], result['size'])
+
+#------------------------------------------------------------------------------
+
+def _index(results):
+    return {_result_key(r) : r for r in results}
+
+#------------------------------------------------------------------------------
+
+def _format_header(with_speedup=False):
+    header = "{0:<40} {1:>10} {2:>16} {3:>14}".format(
+        'benchmark', 'size', 'ops/sec', 'ns/op')
+    return header + (" {0:>9}".format('speedup') if with_speedup else '')
+
+#------------------------------------------------------------------------------
+
+def _format_row(result, with_speedup=False, speedup=None):
+    row = "{0:<40} {1:>10} {2:>16,.0f} {3:>14,.1f}".format(
+        "{0}.{1}".format(result['group'], result['name']),
+        '-' if result['size'] is None else result['size'],
+        result['ops_per_sec'],
+        result['ns_per_op'])
+    if with_speedup:
+        row += " {0:>9}".format('-' if speedup is None else
+                                "{0:.2f}x".format(speedup))
+    if result.get('info'):
+        row += "  " + " ".join("{0}={1}".format(k, v)
+                               for k, v in sorted(result['info'].items()))
+    return row
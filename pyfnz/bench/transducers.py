@@ -0,0 +1,95 @@
+#------------------------------------------------------------------------------
+# transducers.py - benchmarks for transducers
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import operator
+
+from ..clj import comp
+from ..transducers import filtering, mapping, removing, transduce
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+SIZES = (10000, 1000000, 10000000)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+inc     = lambda x: x + 1
+is_even = lambda x: x % 2 == 0
+square  = lambda x: x * x
+is_3n   = lambda x: x % 3 == 0
+half    = lambda x: x // 2
+
+#------------------------------------------------------------------------------
+# five stages: map, filter, map, remove, map, then sum
+#------------------------------------------------------------------------------
+
+@benchmark('transducers', 'transduce', sizes=SIZES)
+def transduce_(n):
+    xform = comp(mapping(inc), filtering(is_even), mapping(square),
+                 removing(is_3n), mapping(half))
+    return lambda: transduce(xform, operator.add, 0, range(n))
+
+#------------------------------------------------------------------------------
+
+@benchmark('transducers', 'generators', sizes=SIZES)
+def generators(n):
+    """Chained generator expressions calling the same functions.
+    """
+
+    def op():
+        xs = (inc(x) for x in range(n))
+        xs = (x for x in xs if is_even(x))
+        xs = (square(x) for x in xs)
+        xs = (x for x in xs if not is_3n(x))
+        return sum(half(x) for x in xs)
+    return op
+
+#------------------------------------------------------------------------------
+
+@benchmark('transducers', 'list_comprehensions', sizes=SIZES)
+def list_comprehensions(n):
+    """A list per stage calling the same functions.
+    """
+
+    def op():
+        xs = [inc(x) for x in range(n)]
+        xs = [x for x in xs if is_even(x)]
+        xs = [square(x) for x in xs]
+        xs = [x for x in xs if not is_3n(x)]
+        return sum([half(x) for x in xs])
+    return op
@@ -0,0 +1,301 @@
+#------------------------------------------------------------------------------
+# tri.py - benchmarks for Try
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import gc
+import sys
+import tracemalloc
+
+from ..compiler import compile_do
+from ..either import Left, Right
+from ..tri import CAPTURE_ARGS, CAPTURE_FULL, CAPTURE_SUMMARY, Try
+from .runner import benchmark
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+DEPTHS = (100, 400, 100000)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+inc      = lambda x: x + 1
+inc_safe = lambda x: Try(inc, x)
+one      = lambda: 1
+boom     = lambda: 1 / 0
+
+#------------------------------------------------------------------------------
+# construction
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'construct_success')
+def construct_success():
+    return lambda: Try(one)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'construct_failure')
+def construct_failure():
+    return lambda: Try(boom)
+
+#------------------------------------------------------------------------------
+# functor / monad
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'map_success')
+def map_success():
+    success = Try(one)
+    return lambda: success.map(inc)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'map_failure')
+def map_failure():
+    failure = Try(boom)
+    return lambda: failure.map(inc)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'flatmap_success')
+def flatmap_success():
+    success = Try(one)
+    return lambda: success.flatmap(inc_safe)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'flatmap_failure')
+def flatmap_failure():
+    failure = Try(boom)
+    return lambda: failure.flatmap(inc_safe)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'get_or_else_success')
+def get_or_else_success():
+    success = Try(one)
+    return lambda: success.get_or_else(0)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'get_or_else_failure')
+def get_or_else_failure():
+    failure = Try(boom)
+    return lambda: failure.get_or_else(0)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'map_chain', sizes=(10, 100, 1000))
+def map_chain(n):
+    def chain():
+        t = Try(one)
+        for _ in range(n):
+            t = t.map(inc)
+        return t
+    return chain
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'flatmap_chain', sizes=(10, 100, 1000))
+def flatmap_chain(n):
+    def chain():
+        t = Try(one)
+        for _ in range(n):
+            t = t.flatmap(inc_safe)
+        return t
+    return chain
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'lazy_map_chain', sizes=(10, 100, 1000))
+def lazy_map_chain(n):
+    """`map_chain` as a prebuilt lazy pipeline, run on a fresh value.
+    """
+
+    pipeline = Try(one).lazy()
+    for _ in range(n):
+        pipeline = pipeline.map(inc)
+    pipeline.run()
+    return lambda: pipeline.run(1)
+
+#------------------------------------------------------------------------------
+# recursion
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'tailrec', sizes=DEPTHS)
+def tailrec(n):
+    step = lambda n: Try.pure(Left(n - 1)) if n > 0 else Try.pure(Right(n))
+    return lambda: Try.tailrec(step, n)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'recursive', sizes=DEPTHS)
+def recursive(n):
+    """Naive `flatmap` recursion, skipped once it would blow the stack.
+    """
+
+    if n * 2 + 100 > sys.getrecursionlimit():
+        return None
+
+    step = lambda n: Try.pure(n - 1)
+    def go(x):
+        return step(x).flatmap(go) if x > 0 else Try.pure(x)
+    return lambda: go(n)
+
+#------------------------------------------------------------------------------
+# do notation
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'do_success')
+def do_success():
+    a, b = Try(one), Try(one)
+    return lambda: Try.do(x + y
+                          for x in a
+                          for y in b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'do_failure')
+def do_failure():
+    a, b = Try(boom), Try(one)
+    return lambda: Try.do(x + y
+                          for x in a
+                          for y in b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'do_block_success')
+def do_block_success():
+    a, b = Try(one), Try(one)
+
+    @Try.do_block
+    def block():
+        x = yield a
+        y = yield b
+        return x + y
+    return block
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'do_block_failure')
+def do_block_failure():
+    a, b = Try(boom), Try(one)
+
+    @Try.do_block
+    def block():
+        x = yield a
+        y = yield b
+        return x + y
+    return block
+
+#------------------------------------------------------------------------------
+
+@compile_do
+def _compiled(a, b):
+    return Try.do(x + y
+                  for x in a
+                  for y in b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'do_compiled_success')
+def do_compiled_success():
+    a, b = Try(one), Try(one)
+    return lambda: _compiled(a, b)
+
+#------------------------------------------------------------------------------
+
+@benchmark('try', 'do_compiled_failure')
+def do_compiled_failure():
+    a, b = Try(boom), Try(one)
+    return lambda: _compiled(a, b)
+
+#------------------------------------------------------------------------------
+# traceback capture
+#------------------------------------------------------------------------------
+
+def parse_record(record):
+    """Fails a few frames down with sizeable locals in every frame, like a
+    real parser would.
+    """
+
+    fields = record.split(',') * 10
+    return parse_fields(fields)
+
+#------------------------------------------------------------------------------
+
+def parse_fields(fields):
+    widths = [len(f) for f in fields]
+    return [int(f) for f in fields] + widths
+
+#------------------------------------------------------------------------------
+
+def retained(policy, count=1000):
+    """Bytes retained per failure built under the policy, measured with
+    tracemalloc.
+    """
+
+    previous = Try.set_capture(policy)
+    try:
+        gc.collect()
+        tracemalloc.start()
+        before   = tracemalloc.get_traced_memory()[0]
+        failures = [Try(parse_record, 'a,b,c') for _ in range(count)]
+        gc.collect()
+        after    = tracemalloc.get_traced_memory()[0]
+        del failures
+    finally:
+        tracemalloc.stop()
+        Try.set_capture(previous)
+
+    return int((after - before) / count)
+
+#------------------------------------------------------------------------------
+
+def register_capture(name, policy):
+    def setup():
+        def op():
+            previous = Try.set_capture(policy)
+            try:
+                return [Try(parse_record, 'a,b,c') for _ in range(100)]
+            finally:
+                Try.set_capture(previous)
+        op.info = {'retained_bytes' : retained(policy)}
+        return op
+
+    benchmark('try', name)(setup)
+
+register_capture('capture_full', CAPTURE_FULL)
+register_capture('capture_summary', CAPTURE_SUMMARY)
+register_capture('capture_args', CAPTURE_ARGS)
@@ -0,0 +1,319 @@
+#------------------------------------------------------------------------------
+# breaker.py - circuit breaker returning Try
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import threading
+
+from time import monotonic
+
+from .tri import Failure, Success, _failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['CircuitBreaker',
+           'CircuitOpen',
+           'CLOSED',
+           'OPEN',
+           'HALF_OPEN']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+CLOSED    = 'closed'
+OPEN      = 'open'
+HALF_OPEN = 'half_open'
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class CircuitOpen(Exception):
+    """Returned in a failure instead of calling through an open circuit.
+    """
+
+#------------------------------------------------------------------------------
+# CircuitBreaker
+#------------------------------------------------------------------------------
+
+class CircuitBreaker(object):
+    """Wraps calls to a dependency, returning a Try.  The outcome of the last
+    `window` calls is tracked and once at least `min_calls` of them were made
+    and the share that failed reaches `failure_rate` the circuit opens: calls
+    return `Failure(CircuitOpen)` at once without calling through.  After
+    `reset_timeout` seconds it turns half open and lets `probes` calls
+    through, if they all succeed it closes again, a failing one reopens it.
+
+    Only exceptions of the `failure_on` types count as failures, others are
+    still returned as failures.  Thread safe, `call_async` shares the state
+    with `call`.
+
+    ex:
+        >>> breaker = CircuitBreaker(failure_rate=0.5, window=20,
+                                     reset_timeout=5.0)
+        >>> breaker.call(fetch, 'key')
+        >>> Failure(CircuitOpen())
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_failure_rate', '_min_calls', '_reset_timeout', '_probes',
+                 '_failure_on', '_lock', '_state', '_retry_at', '_outcomes',
+                 '_index', '_count', '_failures', '_probing', '_passed')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, failure_rate=0.5, window=20, min_calls=10,
+                 reset_timeout=30.0, probes=1, failure_on=(Exception,)):
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be in (0, 1], got {0}".format(
+                failure_rate))
+        if window < 1 or probes < 1:
+            raise ValueError("window and probes must be positive")
+
+        self._failure_rate  = failure_rate
+        self._min_calls     = min(min_calls, window)
+        self._reset_timeout = reset_timeout
+        self._probes        = probes
+        self._failure_on    = failure_on
+        self._lock          = threading.Lock()
+        self._outcomes      = [False] * window
+        self._close()
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        return "CircuitBreaker({0}, {1}/{2} failed)".format(
+            self.state, self._failures, self._count)
+
+    #--------------------------------------------------------------------------
+    # properties
+    #--------------------------------------------------------------------------
+
+    @property
+    def state(self):
+        """`CLOSED`, `OPEN` or `HALF_OPEN`.
+        """
+
+        if self._state is OPEN and monotonic() >= self._retry_at:
+            return HALF_OPEN
+        return self._state
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def call(self, f, *args, **kwargs):
+        """Call f through the breaker, see the Try constructor.
+        """
+
+        probe = False
+        if self._state is not CLOSED:
+            # reject while open without taking the lock
+            if self._state is OPEN and monotonic() < self._retry_at:
+                probe = None
+            else:
+                probe = self._admit()
+            if probe is None:
+                instance = object.__new__(Failure)
+                instance._value = CircuitOpen()
+                return instance
+
+        try:
+            value = f(*args, **kwargs)
+        except Exception as e:
+            self._record(isinstance(e, self._failure_on), probe)
+            return _failure(e)
+        except BaseException:
+            if probe:
+                self._abandon()
+            raise
+
+        # inline recording of a success while closed, the common case
+        with self._lock:
+            if self._state is CLOSED:
+                outcomes = self._outcomes
+                index    = self._index
+                if outcomes[index]:
+                    outcomes[index] = False
+                    self._failures -= 1
+                self._index = index + 1 if index + 1 < len(outcomes) else 0
+
+                # a success lowers the failure rate, it can only trip the
+                # circuit by bringing the count up to `min_calls`
+                if self._count < len(outcomes):
+                    self._count += 1
+                    if self._count >= self._min_calls and \
+                       self._failures >= self._failure_rate * self._count:
+                        self._open()
+            else:
+                self._settle(False, probe)
+
+        instance = object.__new__(Success)
+        instance._value = value
+        return instance
+
+    #--------------------------------------------------------------------------
+
+    async def call_async(self, f, *args, **kwargs):
+        """Await the coroutine function f through the breaker, see
+        `Try.of_async`.
+        """
+
+        probe = False
+        if self._state is not CLOSED:
+            probe = self._admit()
+            if probe is None:
+                return _rejected()
+
+        try:
+            value = await f(*args, **kwargs)
+        except Exception as e:
+            self._record(isinstance(e, self._failure_on), probe)
+            return _failure(e)
+        except BaseException:
+            # ie. cancelled, give the probe back
+            if probe:
+                self._abandon()
+            raise
+
+        self._record(False, probe)
+        return Success(value)
+
+    #--------------------------------------------------------------------------
+    # internal methods
+    #--------------------------------------------------------------------------
+
+    def _admit(self):
+        """Decide on a call made while the circuit wasn't closed.  Returns
+        None to reject it, true if it goes through as a probe and false if
+        the circuit closed meanwhile.
+        """
+
+        with self._lock:
+            if self._state is OPEN:
+                if monotonic() < self._retry_at:
+                    return None
+                self._state   = HALF_OPEN
+                self._probing = 0
+                self._passed  = 0
+            elif self._state is CLOSED:
+                return False
+
+            if self._probing >= self._probes:
+                return None
+            self._probing += 1
+            return True
+
+    #--------------------------------------------------------------------------
+
+    def _abandon(self):
+        """Release the probe of a call that ended without an outcome.
+        """
+
+        with self._lock:
+            if self._state is HALF_OPEN and self._probing > self._passed:
+                self._probing -= 1
+
+    #--------------------------------------------------------------------------
+
+    def _record(self, failed, probe):
+        with self._lock:
+            self._settle(failed, probe)
+
+    #--------------------------------------------------------------------------
+
+    def _settle(self, failed, probe):
+        """Account for the outcome of a call, the lock must be held.  A call
+        finishing after the circuit opened is not counted, only probes are
+        while it is half open.
+        """
+
+        state = self._state
+        if state is CLOSED:
+            outcomes = self._outcomes
+            index    = self._index
+            self._failures += failed - outcomes[index]
+            outcomes[index] = failed
+            self._index = index + 1 if index + 1 < len(outcomes) else 0
+            if self._count < len(outcomes):
+                self._count += 1
+
+            if self._count >= self._min_calls and \
+               self._failures >= self._failure_rate * self._count:
+                self._open()
+
+        elif state is HALF_OPEN and probe:
+            if failed:
+                self._open()
+            else:
+                self._passed += 1
+                if self._passed >= self._probes:
+                    self._close()
+
+    #--------------------------------------------------------------------------
+
+    def _open(self):
+        self._state    = OPEN
+        self._retry_at = monotonic() + self._reset_timeout
+
+    #--------------------------------------------------------------------------
+
+    def _close(self):
+        window = len(self._outcomes)
+        self._state    = CLOSED
+        self._retry_at = 0.0
+        self._outcomes = [False] * window
+        self._index    = 0
+        self._count    = 0
+        self._failures = 0
+        self._probing  = 0
+        self._passed   = 0
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _rejected():
+    """Build the failure returned by an open circuit.
+    """
+
+    instance = object.__new__(Failure)
+    instance._value = CircuitOpen()
+    return instance
@@ -33,9 +33,14 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #------------------------------------------------------------------------------
 
+import array
+import builtins
+import itertools
 import sys
+import weakref
 
-from functools import reduce
+from collections.abc import Sequence
+from types import FunctionType
 
 #------------------------------------------------------------------------------
 # module
@@ -55,7 +60,15 @@ __all__ = ['is_some',
            'some',
            'identity',
            'constantly',
-           'comp']
+           'comp',
+           'LazySeq',
+           'SeqView',
+           'take',
+           'drop',
+           'iterate',
+           'repeat',
+           'cycle',
+           'concat']
 
 #------------------------------------------------------------------------------
 # helper functions
@@ -63,6 +76,242 @@ __all__ = ['is_some',
 
 is_python3 = sys.version_info > (3, 0)
 
+# fns of the compositions made by comp, by the composed fn
+_composed = weakref.WeakKeyDictionary()
+
+# compositions up to this many fns get a generated caller
+_MAX_INLINE = 8
+
+# types viewed through a memoryview
+_BUFFERS = frozenset([bytes, bytearray, array.array])
+
+#------------------------------------------------------------------------------
+# LazySeq
+#------------------------------------------------------------------------------
+
+class LazySeq(object):
+    """A sequence realized one item at a time from any iterable, each cell is
+    read from the source once and cached.  `first`, `rest` and `nxt` are
+    O(1) and share the cells, so seq style recursion doesn't copy.  Cells
+    only point forward, once nothing refers to the head of a sequence the
+    consumed prefix can be collected.
+
+    The clj functions (`first`, `rest`, `nxt`, `last`, ...) accept it.
+
+    ex:
+        >>> lines = LazySeq(open('log.txt'))
+        >>> first(lines), second(lines)
+        >>> ('line 1\\n', 'line 2\\n')
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    # `_source` is the iterator until the cell is realized, then None, an
+    # empty cell has no `_rest`
+    __slots__ = ('_first', '_rest', '_source')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, iterable=()):
+        self._first  = None
+        self._rest   = None
+        self._source = iter(iterable)
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        seq = self
+        del self    # don't keep the head alive while walking
+        while True:
+            if seq._source is not None:
+                seq._realize()
+            if seq._rest is None:
+                return
+            yield seq._first
+            seq = seq._rest
+
+    #--------------------------------------------------------------------------
+
+    def __bool__(self):
+        return not self.is_empty()
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        """Show the realized prefix only, never reads from the source.
+        """
+
+        items = []
+        seq   = self
+        while seq._source is None and seq._rest is not None and \
+              len(items) < 10:
+            items.append(repr(seq._first))
+            seq = seq._rest
+        if seq._source is not None or seq._rest is not None:
+            items.append('...')
+        return "LazySeq([{0}])".format(', '.join(items))
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def is_empty(self):
+        """Returns true if the sequence has no items.
+        """
+
+        if self._source is not None:
+            self._realize()
+        return self._rest is None
+
+    #--------------------------------------------------------------------------
+
+    def first(self):
+        """Returns the first item, None if empty.
+        """
+
+        if self._source is not None:
+            self._realize()
+        return self._first
+
+    #--------------------------------------------------------------------------
+
+    def rest(self):
+        """Returns the possibly empty sequence after the first item.
+        """
+
+        if self._source is not None:
+            self._realize()
+        return self._rest if self._rest is not None else self
+
+    #--------------------------------------------------------------------------
+
+    def nxt(self):
+        """Returns the sequence after the first item, None if it is empty.
+        """
+
+        rest = self.rest()
+        if not rest.is_empty():
+            return rest
+
+    #--------------------------------------------------------------------------
+    # internal methods
+    #--------------------------------------------------------------------------
+
+    def _realize(self):
+        """Read this cell from the source.  The cell stays unrealized if the
+        source raises, the error is raised again on every later access
+        instead of ending the sequence early.
+        """
+
+        source = self._source
+        try:
+            for x in source:
+                rest = object.__new__(LazySeq)
+                rest._first  = None
+                rest._rest   = None
+                rest._source = source
+                self._first  = x
+                self._rest   = rest
+                self._source = None
+                return
+        except Exception as e:
+            self._source = _Raising(e)
+            raise
+        self._source = None
+
+#------------------------------------------------------------------------------
+
+class _Raising(object):
+    """Iterator raising the given error on every `next`, the source of a
+    LazySeq cell whose source failed.
+    """
+
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        raise self.error
+
+#------------------------------------------------------------------------------
+# SeqView
+#------------------------------------------------------------------------------
+
+class SeqView(Sequence):
+    """A read only view of a slice of a sequence, the items stay in the
+    original sequence and slicing the view gives another view.  The range
+    of indexes is fixed when the view is made, later changes to the items
+    of a mutable sequence show through.
+
+    ex:
+        >>> records = SeqView(tuple(rows))[1:]
+        >>> records[0], len(records)
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_seq', '_range')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, seq, indexes=None):
+        """View seq at the given range of indexes, all of seq if None.
+        """
+
+        self._seq   = seq
+        self._range = builtins.range(len(seq)) if indexes is None else indexes
+
+    #--------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._range)
+
+    #--------------------------------------------------------------------------
+
+    def __getitem__(self, index):
+        if type(index) is slice:
+            view = object.__new__(SeqView)
+            view._seq   = self._seq
+            view._range = self._range[index]
+            return view
+        return self._seq[self._range[index]]
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        return map(self._seq.__getitem__, self._range)
+
+    #--------------------------------------------------------------------------
+
+    def __eq__(self, other):
+        """Operator `==`.  Equal to another view or a list or tuple with the
+        same items.
+        """
+
+        if not isinstance(other, (SeqView, list, tuple)) or \
+           len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        return "SeqView({0!r})".format(list(self))
+
 #------------------------------------------------------------------------------
 # functions
 #------------------------------------------------------------------------------
@@ -79,6 +328,8 @@ def is_empty(coll):
     """Returns true if coll has no items.
     """
 
+    if type(coll) is LazySeq:
+        return coll.is_empty()
     return (coll is None) or (len(coll) == 0)
 
 #------------------------------------------------------------------------------
@@ -87,16 +338,21 @@ def first(lst):
     """Returns the first item in the list. If lst is None, returns None.
     """
 
+    if type(lst) is LazySeq:
+        return lst.first()
     if not is_empty(lst):
         return lst[0]
 
 #------------------------------------------------------------------------------
 
 def second(lst):
-    """Same as first(nxt(lst)).
+    """Same as first(nxt(lst)), also accepts any iterable.
     """
 
-    return first(nxt(lst))
+    if is_some(lst):
+        items = iter(lst)
+        next(items, None)
+        return next(items, None)
 
 #------------------------------------------------------------------------------
 
@@ -112,36 +368,55 @@ def last(lst):
     """Returns the last item in the list. If lst is None, returns None.
     """
 
+    if type(lst) is LazySeq:
+        x = None
+        for x in lst:
+            pass
+        return x
     if not is_empty(lst):
         return lst[-1]
 
 #------------------------------------------------------------------------------
 
-def butlast(lst):
-    """Return all but the last item in lst.
+def butlast(lst, view=False):
+    """Return all but the last item in lst.  A LazySeq gives a LazySeq
+    holding back one item.  With view true the items aren't copied, see
+    `rest`.
     """
 
+    if type(lst) is LazySeq:
+        if lst.nxt() is not None:
+            return LazySeq(_butlast(lst))
+        return None
     if is_some(lst) and len(lst) > 1:
-        return lst[:-1]
+        return _view(lst)[:-1] if view else lst[:-1]
 
 #------------------------------------------------------------------------------
 
-def nxt(lst):
+def nxt(lst, view=False):
     """Returns a seq of the items after the first. If there are no more items,
-    returns None.
+    returns None.  With view true the items aren't copied, see `rest`.
     """
 
+    if type(lst) is LazySeq:
+        return lst.nxt()
     if is_some(lst) and len(lst) > 1:
-        return lst[1:]
+        return _view(lst)[1:] if view else lst[1:]
 
 #------------------------------------------------------------------------------
 
-def rest(lst):
+def rest(lst, view=False):
     """Returns a possibly empty seq of the items after the first.
+
+    With view true the items aren't copied: bytes, bytearray and array
+    values give a memoryview, other sequences a `SeqView`, both over the
+    original and sliced again without copying.
     """
 
+    if type(lst) is LazySeq:
+        return lst.rest()
     if is_some(lst):
-        return lst[1:]
+        return _view(lst)[1:] if view else lst[1:]
 
 #------------------------------------------------------------------------------
 
@@ -183,24 +458,17 @@ def select_keys_py3(dct, keys):
 
 def some(pred, lst):
     """Returns the first logical true value of pred(x) for any x in lst, else
-    None.
+    None.  lst may be any iterable, it is walked once and only as far as
+    needed.
 
     Note: logical falses: False, None, '', [], (), {}, set(), 0, 0.0
     """
 
-    #if not is_empty(lst):
-    #    return pred(first(lst)) or some(pred, nxt(lst))
-
-    # compensate for the fact python doesn't optimize tail recursion
-    while True:
-        if is_empty(lst):
-            return None
-        else:
-            value = pred(first(lst))
+    if is_some(lst):
+        for x in lst:
+            value = pred(x)
             if value:
                 return value
-            else:
-                lst = nxt(lst)
 
 #------------------------------------------------------------------------------
 
@@ -227,18 +495,160 @@ def comp(*fns):
     those fns.  The returned fn takes a variable number of args, applies the
     rightmost of fns to the args, the next fn (right-to-left) to the result,
     etc.
+
+    Compositions passed in are flattened and the call order is fixed once,
+    up to `_MAX_INLINE` fns are called by a generated function nesting the
+    calls directly.
     """
 
+    fns = tuple(g for f in fns
+                    for g in (_composed.get(f, (f,)) if type(f) is FunctionType
+                              else (f,)))
     if (is_empty(fns)):
         return identity
     elif len(fns) == 1:
         return first(fns)
 
+    if len(fns) <= _MAX_INLINE:
+        fn = _callers[len(fns)](*reversed(fns))
+    else:
+        fn = _chain(fns[-1], fns[-2::-1])
+    _composed[fn] = fns
+    return fn
+
+#------------------------------------------------------------------------------
+# lazy sequences
+#------------------------------------------------------------------------------
+
+def take(n, coll):
+    """Returns a LazySeq of the first n items in coll.
+    """
+
+    return LazySeq(itertools.islice(coll, n))
+
+#------------------------------------------------------------------------------
+
+def drop(n, coll):
+    """Returns a LazySeq of all but the first n items in coll.
+    """
+
+    return LazySeq(itertools.islice(coll, n, None))
+
+#------------------------------------------------------------------------------
+
+def iterate(f, x):
+    """Returns a LazySeq of x, f(x), f(f(x)) etc.
+    """
+
+    return LazySeq(_iterate(f, x))
+
+#------------------------------------------------------------------------------
+
+def repeat(x, n=None):
+    """Returns a LazySeq of x, n times or forever if n is None.
+    """
+
+    return LazySeq(itertools.repeat(x) if n is None else
+                   itertools.repeat(x, n))
+
+#------------------------------------------------------------------------------
+
+def cycle(coll):
+    """Returns an infinite LazySeq repeating the items in coll.
+    """
+
+    return LazySeq(itertools.cycle(coll))
+
+#------------------------------------------------------------------------------
+
+def concat(*colls):
+    """Returns a LazySeq of the items in each coll in turn.
+    """
+
+    return LazySeq(itertools.chain.from_iterable(colls))
+
+#------------------------------------------------------------------------------
+
+def range(*args):
+    """Returns a LazySeq of numbers, takes the arguments of the builtin
+    range.  Without arguments counts up from 0 forever.
+
+    Note: not exported by `from pyfnz.clj import *` as it would shadow the
+    builtin, use `clj.range`.
+    """
+
+    return LazySeq(builtins.range(*args) if args else itertools.count())
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _view(lst):
+    """Wrap lst so slicing it doesn't copy.
+    """
+
+    cls = type(lst)
+    if cls is SeqView or cls is memoryview:
+        return lst
+    if cls in _BUFFERS:
+        return memoryview(lst)
+    return SeqView(lst)
+
+#------------------------------------------------------------------------------
+
+def _caller(n):
+    """Generate a factory of fns calling n fns in turn, the first with the
+    arguments, ie. for 3 `f2(f1(f0(*args, **kwargs)))`.
+    """
+
+    names = ['f{0}'.format(i) for i in builtins.range(n)]
+    call  = '*args, **kwargs'
+    for name in names:
+        call = '{0}({1})'.format(name, call)
+
+    source = ("def make({0}):\n"
+              "    def fn(*args, **kwargs):\n"
+              "        return {1}\n"
+              "    return fn\n").format(', '.join(names), call)
+    namespace = {}
+    exec(source, namespace)
+    return namespace['make']
+
+#------------------------------------------------------------------------------
+
+def _chain(f, fs):
+    """Fn calling f with the arguments, then each of fs in turn.
+    """
+
     def fn(*args, **kwargs):
-        f, fs = last(fns), butlast(fns)
-        return reduce(lambda a, g: g(a), reversed(fs), f(*args, **kwargs))
+        x = f(*args, **kwargs)
+        for g in fs:
+            x = g(x)
+        return x
     return fn
 
+#------------------------------------------------------------------------------
+
+def _iterate(f, x):
+    while True:
+        yield x
+        x = f(x)
+
+#------------------------------------------------------------------------------
+
+def _butlast(items):
+    items = iter(items)
+    prev  = next(items)
+    for x in items:
+        yield prev
+        prev = x
+
+#------------------------------------------------------------------------------
+# generated callers
+#------------------------------------------------------------------------------
+
+_callers = {n : _caller(n) for n in builtins.range(2, _MAX_INLINE + 1)}
+
 #------------------------------------------------------------------------------
 # compatability
 #------------------------------------------------------------------------------
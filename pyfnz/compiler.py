@@ -0,0 +1,563 @@
+#------------------------------------------------------------------------------
+# compiler.py - compile time lowering of do notation
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import ast
+import inspect
+import textwrap
+import types
+
+import builtins
+
+from .either import Either, Left, Right
+from .tri import Failure, Success, Try
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['compile_do']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# names the lowered code uses to reach the variant classes, provided to the
+# compiled function as closure variables
+_HELPERS = {'_pyfnz_Left'    : Left,
+            '_pyfnz_Right'   : Right,
+            '_pyfnz_Failure' : Failure,
+            '_pyfnz_Success' : Success}
+
+# do implementation -> (class short-circuited on, class wrapping the result)
+_LOWERINGS = {Either.do : ('_pyfnz_Left', '_pyfnz_Right'),
+              Try.do    : ('_pyfnz_Failure', '_pyfnz_Success')}
+
+_FACTORY = '_pyfnz_factory'
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def compile_do(f):
+    """Decorator lowering `Either.do` and `Try.do` generator comprehensions in
+    the body of `f` into straight-line type checks at decoration time.
+
+        Either.do(x + y
+                  for x in a
+                  for y in b(x))
+
+    is compiled as the equivalent of
+
+        m0 if type(m0 := a) is Left else
+            m1 if type(m1 := b(m0._value)) is Left else
+                Right(m0._value + m1._value)
+
+    so the compiled code creates no generator and raises no exception to
+    short-circuit.  Every `for` clause must iterate over an Either (or a Try),
+    a clause of the other kind is iterated as the generator would, anything
+    else raises a TypeError.  `if` clauses and starred targets are not lowered and keep their runtime
+    behaviour.  Names bound by the `for` clauses are read through the matched
+    value, so lambdas in the body see it late bound.  Private names in the
+    body of a method are mangled for its class as the compiler would.  The
+    source of `f` must be available and `compile_do` must be its innermost
+    decorator.
+
+    ex:
+        >>> @compile_do
+            def total(a, b):
+                return Either.do(x + y
+                                 for x in parse(a)
+                                 for y in parse(b))
+    """
+
+    if getattr(f, '__wrapped__', None) is not None:
+        raise TypeError("compile_do must be the innermost decorator")
+
+    source = textwrap.dedent(inspect.getsource(f))
+    module = ast.parse(source)
+    fdef   = module.body[0]
+    if not isinstance(fdef, (ast.FunctionDef, ast.AsyncFunctionDef)) or \
+       fdef.name != f.__code__.co_name:
+        raise TypeError("compile_do expects a function defined with def")
+
+    # the source is compiled outside its class, apply its private name
+    # mangling by hand
+    owner = _owner(f.__qualname__)
+    if owner is not None:
+        fdef.body = [_Mangle(owner).visit(stmt) for stmt in fdef.body]
+        fdef.args = _Mangle(owner).visit(fdef.args)
+
+    lowerer = _Lowerer(f)
+    fdef.body = [lowerer.visit(stmt) for stmt in fdef.body]
+    if lowerer.count == 0:
+        return f
+
+    fdef.decorator_list = []
+    _strip_signature(fdef)
+    ast.fix_missing_locations(module)
+    ast.increment_lineno(module, f.__code__.co_firstlineno - 1)
+
+    # nest the function in a factory so helpers and the original free
+    # variables are closure variables of the compiled code
+    helpers  = dict(_HELPERS, _pyfnz_first=_first)
+    freevars = f.__code__.co_freevars
+    params   = list(helpers) + list(freevars)
+    factory  = ast.FunctionDef(
+        name=_FACTORY,
+        args=_arguments(params),
+        body=[fdef, ast.Return(value=ast.Name(id=fdef.name, ctx=ast.Load()))],
+        decorator_list=[],
+        returns=None)
+    if 'type_params' in ast.FunctionDef._fields:
+        factory.type_params = []
+    module.body = [factory]
+    ast.fix_missing_locations(module)
+
+    namespace = {}
+    code = compile(module, f.__code__.co_filename, 'exec')
+    exec(code, f.__globals__, namespace)
+    built = namespace[_FACTORY](*(list(helpers.values()) +
+                                  [None] * len(freevars)))
+
+    # reuse the original cells so rebinding an outer variable is still seen
+    cells   = dict(zip(freevars, f.__closure__ or ()))
+    closure = tuple(cells.get(name, cell)
+                    for name, cell in zip(built.__code__.co_freevars,
+                                          built.__closure__ or ()))
+
+    compiled = types.FunctionType(built.__code__, f.__globals__, f.__name__,
+                                  f.__defaults__, closure or None)
+    compiled.__kwdefaults__   = f.__kwdefaults__
+    compiled.__annotations__  = f.__annotations__
+    compiled.__qualname__     = f.__qualname__
+    compiled.__module__       = f.__module__
+    compiled.__doc__          = f.__doc__
+    compiled.__dict__.update(f.__dict__)
+    return compiled
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _arguments(names):
+    """Positional only argument list for the given names.
+    """
+
+    return ast.arguments(posonlyargs=[],
+                         args=[ast.arg(arg=n, annotation=None) for n in names],
+                         vararg=None,
+                         kwonlyargs=[],
+                         kw_defaults=[],
+                         kwarg=None,
+                         defaults=[])
+
+#------------------------------------------------------------------------------
+
+def _strip_signature(fdef):
+    """Replace defaults and annotations by placeholders, the originals are
+    copied from the decorated function instead of being evaluated again.
+    """
+
+    args = fdef.args
+    args.defaults    = [ast.Constant(value=None) for _ in args.defaults]
+    args.kw_defaults = [d and ast.Constant(value=None) for d in args.kw_defaults]
+    for arg in args.posonlyargs + args.args + args.kwonlyargs + \
+               [args.vararg, args.kwarg]:
+        if arg is not None:
+            arg.annotation = None
+    fdef.returns = None
+
+#------------------------------------------------------------------------------
+
+def _owner(qualname):
+    """Name of the innermost class a function with the given qualified name
+    is defined in, None if it isn't defined in one.  A name followed by
+    `<locals>` is a function, any other enclosing name is a class.
+    """
+
+    parts = qualname.split('.')[:-1]
+    for i in reversed(range(len(parts))):
+        if parts[i] == '<locals>':
+            continue
+        if i + 1 < len(parts) and parts[i + 1] == '<locals>':
+            continue
+        return parts[i]
+
+#------------------------------------------------------------------------------
+
+def _mangle(owner, name):
+    """Private name mangling as done by the compiler inside class `owner`.
+    """
+
+    owner = owner.lstrip('_')
+    if not owner or name is None or not name.startswith('__') or \
+       name.endswith('__') or '.' in name:
+        return name
+    return '_{0}{1}'.format(owner, name)
+
+#------------------------------------------------------------------------------
+
+def _first(value):
+    """Value a `do` generator binds when a clause iterates over a variant of
+    the other monad, raising like the generator does on a left or failure.
+    """
+
+    if not isinstance(value, (Either, Try)):
+        raise TypeError("do clauses must iterate over an Either or a Try, "
+                        "got {0!r}".format(value))
+    return next(iter(value))
+
+#------------------------------------------------------------------------------
+
+def _target_paths(target, path=()):
+    """Yield `(name, index path)` for every name bound by a for target, None
+    if the target can't be lowered.
+    """
+
+    if isinstance(target, ast.Name):
+        return [(target.id, path)]
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        paths = []
+        for i, elt in enumerate(target.elts):
+            sub = _target_paths(elt, path + (i,))
+            if sub is None:
+                return None
+            paths.extend(sub)
+        return paths
+
+#------------------------------------------------------------------------------
+
+def _bound_names(node):
+    """Names bound by the parameters of a lambda or targets of a
+    comprehension.
+    """
+
+    if isinstance(node, ast.Lambda):
+        args = node.args
+        return set(a.arg for a in args.posonlyargs + args.args +
+                   args.kwonlyargs + [args.vararg, args.kwarg] if a)
+    return set(n.id for g in node.generators
+                        for n in ast.walk(g.target)
+                            if isinstance(n, ast.Name))
+
+#------------------------------------------------------------------------------
+
+def _accessor(temp, path):
+    """Factory building `temp._value[i][j]...` expressions.
+    """
+
+    def build():
+        node = ast.Attribute(value=ast.Name(id=temp, ctx=ast.Load()),
+                             attr='_value', ctx=ast.Load())
+        for i in path:
+            node = ast.Subscript(value=node, slice=ast.Constant(value=i),
+                                 ctx=ast.Load())
+        return node
+    return build
+
+#------------------------------------------------------------------------------
+
+def _call(name, *args):
+    """Call of the function bound to `name`.
+    """
+
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=list(args),
+                    keywords=[])
+
+#------------------------------------------------------------------------------
+
+def _bind(temp, value):
+    """Assignment expression `(temp := value)`.
+    """
+
+    return ast.NamedExpr(target=ast.Name(id=temp, ctx=ast.Store()),
+                         value=value)
+
+#------------------------------------------------------------------------------
+
+def _class_is(value, op, name):
+    """Comparison `value.__class__ <op> name`.
+    """
+
+    return ast.Compare(
+        left=ast.Attribute(value=value, attr='__class__', ctx=ast.Load()),
+        ops=[op],
+        comparators=[ast.Name(id=name, ctx=ast.Load())])
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class _Substitute(ast.NodeTransformer):
+    """Replace loads of names with a copy of their replacement expression,
+    honoring lambdas and comprehensions that rebind them.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+
+    #--------------------------------------------------------------------------
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load) and node.id in self.mapping:
+            return ast.copy_location(self.mapping[node.id](), node)
+        return node
+
+    #--------------------------------------------------------------------------
+
+    def _scoped(self, node):
+        shadowed = _bound_names(node) & set(self.mapping)
+        if not shadowed:
+            return self.generic_visit(node)
+
+        inner = _Substitute(dict((k, v) for k, v in self.mapping.items()
+                                     if k not in shadowed))
+
+        # defaults and the first iterable of a comprehension are evaluated
+        # in the enclosing scope
+        if isinstance(node, ast.Lambda):
+            node.args = self.visit(node.args)
+            node.body = inner.visit(node.body)
+            return node
+
+        first = node.generators[0]
+        first.iter = self.visit(first.iter)
+        return inner.generic_visit(node)
+
+    visit_Lambda       = _scoped
+    visit_ListComp     = _scoped
+    visit_SetComp      = _scoped
+    visit_DictComp     = _scoped
+    visit_GeneratorExp = _scoped
+
+#------------------------------------------------------------------------------
+
+class _Mangle(ast.NodeTransformer):
+    """Mangle the private names of a function body defined in class `owner`.
+    """
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    #--------------------------------------------------------------------------
+
+    def visit_Name(self, node):
+        node.id = _mangle(self.owner, node.id)
+        return node
+
+    #--------------------------------------------------------------------------
+
+    def visit_Attribute(self, node):
+        node.attr = _mangle(self.owner, node.attr)
+        return self.generic_visit(node)
+
+    #--------------------------------------------------------------------------
+
+    def _bind(self, node):
+        # nodes binding their `name` field, `rest` for mapping patterns
+        field = 'rest' if 'rest' in node._fields else \
+                'arg' if 'arg' in node._fields else 'name'
+        setattr(node, field, _mangle(self.owner, getattr(node, field)))
+        return self.generic_visit(node)
+
+    visit_arg           = _bind
+    visit_ExceptHandler = _bind
+    visit_MatchAs       = _bind
+    visit_MatchStar     = _bind
+    visit_MatchMapping  = _bind
+
+    #--------------------------------------------------------------------------
+
+    def visit_Global(self, node):
+        node.names = [_mangle(self.owner, n) for n in node.names]
+        return node
+
+    visit_Nonlocal = visit_Global
+
+    #--------------------------------------------------------------------------
+
+    def visit_alias(self, node):
+        # `import __a.b` binds a mangled `__a`, which `as` can't express
+        head = node.name.split('.')[0]
+        if node.asname is None and head != node.name and \
+           _mangle(self.owner, head) != head:
+            raise TypeError("compile_do can't mangle the import of "
+                            "{0}".format(node.name))
+        node.name   = _mangle(self.owner, node.name)
+        node.asname = _mangle(self.owner, node.asname)
+        return node
+
+    #--------------------------------------------------------------------------
+
+    def visit_ImportFrom(self, node):
+        node.module = _mangle(self.owner, node.module)
+        return self.generic_visit(node)
+
+    #--------------------------------------------------------------------------
+
+    def _definition(self, node):
+        # the compiler binds a mangled name but keeps the original `__name__`,
+        # which can't be expressed in source
+        if _mangle(self.owner, node.name) != node.name:
+            raise TypeError("compile_do can't mangle the nested definition "
+                            "{0}".format(node.name))
+        if isinstance(node, ast.ClassDef):
+            node.bases    = [self.visit(b) for b in node.bases]
+            node.keywords = [self.visit(k) for k in node.keywords]
+            node.decorator_list = [self.visit(d) for d in node.decorator_list]
+            inner = _Mangle(node.name)
+            node.body = [inner.visit(stmt) for stmt in node.body]
+            return node
+        return self.generic_visit(node)
+
+    visit_FunctionDef      = _definition
+    visit_AsyncFunctionDef = _definition
+    visit_ClassDef         = _definition
+
+#------------------------------------------------------------------------------
+
+class _Lowerer(ast.NodeTransformer):
+    """Rewrite recognised `do` calls found in the body of a function.
+    """
+
+    def __init__(self, f):
+        self.f     = f
+        self.count = 0
+
+    #--------------------------------------------------------------------------
+
+    def _skip(self, node):
+        # assignment expressions are not allowed everywhere inside these
+        return node
+
+    visit_Lambda       = _skip
+    visit_ListComp     = _skip
+    visit_SetComp      = _skip
+    visit_DictComp     = _skip
+    visit_GeneratorExp = _skip
+    visit_ClassDef     = _skip
+
+    #--------------------------------------------------------------------------
+
+    def visit_Call(self, node):
+        lowering = self._lowering(node)
+        if lowering is None:
+            return self.generic_visit(node)
+
+        genexp = node.args[0]
+        paths  = [_target_paths(g.target) for g in genexp.generators]
+        if any(g.ifs or g.is_async for g in genexp.generators) or None in paths:
+            return self.generic_visit(node)
+
+        # lower nested do calls first, they then live in the function scope
+        genexp.elt = self.visit(genexp.elt)
+        for g in genexp.generators:
+            g.iter = self.visit(g.iter)
+
+        return ast.copy_location(self._lower(genexp, paths, *lowering), node)
+
+    #--------------------------------------------------------------------------
+
+    def _lowering(self, node):
+        """Return the lowering for a call of a known `do` implementation with a
+        single generator expression, None otherwise.
+        """
+
+        if len(node.args) != 1 or node.keywords or \
+           not isinstance(node.args[0], ast.GeneratorExp):
+            return None
+
+        try:
+            return _LOWERINGS.get(self._resolve(node.func))
+        except (TypeError, ValueError):
+            return None
+
+    #--------------------------------------------------------------------------
+
+    def _resolve(self, node):
+        """Resolve a dotted name through the globals, closure and builtins of
+        the decorated function.
+        """
+
+        if isinstance(node, ast.Attribute):
+            return getattr(self._resolve(node.value), node.attr, None)
+        elif isinstance(node, ast.Name):
+            code = self.f.__code__
+            if node.id in code.co_freevars:
+                cell = self.f.__closure__[code.co_freevars.index(node.id)]
+                return cell.cell_contents
+            if node.id in self.f.__globals__:
+                return self.f.__globals__[node.id]
+            return getattr(builtins, node.id, None)
+
+    #--------------------------------------------------------------------------
+
+    def _lower(self, genexp, paths, stop, wrap):
+        temps   = []
+        mapping = {}
+        for paths_i in paths:
+            temp = '_pyfnz_do{0}'.format(self.count)
+            self.count += 1
+            temps.append(temp)
+            for name, path in paths_i:
+                mapping[name] = _accessor(temp, path)
+
+        # substitute names bound by earlier clauses, clause by clause
+        generators = genexp.generators
+        bound = {}
+        iters = []
+        for g, paths_i, temp in zip(generators, paths, temps):
+            iters.append(_Substitute(dict(bound)).visit(g.iter))
+            for name, path in paths_i:
+                bound[name] = mapping[name]
+        elt = _Substitute(bound).visit(genexp.elt)
+
+        # each clause tests `(m := it).__class__ is stop or
+        # (m.__class__ is not wrap and (m := wrap(first(m))).__class__ is
+        # stop)`, the last check never holds and only rebinds a value of the
+        # other monad to what the generator would have bound
+        expr = _call(wrap, elt)
+        for it, temp in reversed(list(zip(iters, temps))):
+            first = _call(wrap, _call('_pyfnz_first',
+                                      ast.Name(id=temp, ctx=ast.Load())))
+            test  = ast.BoolOp(op=ast.Or(), values=[
+                _class_is(_bind(temp, it), ast.Is(), stop),
+                ast.BoolOp(op=ast.And(), values=[
+                    _class_is(ast.Name(id=temp, ctx=ast.Load()),
+                              ast.IsNot(), wrap),
+                    _class_is(_bind(temp, first), ast.Is(), stop)])])
+            expr = ast.IfExp(test=test,
+                             body=ast.Name(id=temp, ctx=ast.Load()),
+                             orelse=expr)
+        return expr
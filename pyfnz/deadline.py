@@ -0,0 +1,189 @@
+#------------------------------------------------------------------------------
+# deadline.py - timeouts and deadlines for Try
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from .tri import Failure, Success, _failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['Deadline',
+           'with_timeout',
+           'with_timeout_async']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# pool shared by every `with_timeout` call not given an executor, created on
+# first use
+_pool      = None
+_pool_lock = threading.Lock()
+
+#------------------------------------------------------------------------------
+# Deadline
+#------------------------------------------------------------------------------
+
+class Deadline(object):
+    """A point in time, `seconds` from its creation, shared by the calls of a
+    flatmap chain so each only gets the budget the previous ones left over.
+    Accepted wherever a timeout in seconds is.
+
+    ex:
+        >>> deadline = Deadline(0.5)
+        >>> with_timeout(fetch, deadline, key).flatmap(
+                lambda row: with_timeout(render, deadline, row))
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_at',)
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, seconds):
+        self._at = time.monotonic() + seconds
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        return "Deadline({0:.3f}s left)".format(self.remaining())
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def remaining(self):
+        """Seconds left, never negative.
+        """
+
+        return max(0.0, self._at - time.monotonic())
+
+    #--------------------------------------------------------------------------
+
+    def expired(self):
+        """Return true once the deadline has passed.
+        """
+
+        return time.monotonic() >= self._at
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def with_timeout(f, seconds, *args, executor=None, **kwargs):
+    """Run f on a thread pool and wait at most `seconds`, a number or a
+    `Deadline`.  See `Try.with_timeout`.
+    """
+
+    budget = _budget(seconds)
+    if budget <= 0:
+        return _timed_out(seconds)
+
+    # `exception` only raises a timeout when f is still running, so one
+    # raised by f itself isn't mistaken for the budget running out
+    future = (executor or _shared_pool()).submit(f, *args, **kwargs)
+    try:
+        error = future.exception(budget)
+    except FutureTimeoutError:
+        future.cancel()
+        return _timed_out(seconds)
+    except Exception as e:
+        return _failure(e)
+    if error is not None:
+        return _failure(error)
+    return Success(future.result())
+
+#------------------------------------------------------------------------------
+
+async def with_timeout_async(f, seconds, *args, **kwargs):
+    """Await the coroutine function f for at most `seconds`, a number or a
+    `Deadline`.  See `Try.with_timeout_async`.
+    """
+
+    import asyncio
+
+    budget = _budget(seconds)
+    if budget <= 0:
+        return _timed_out(seconds)
+
+    # f's errors are caught inside the awaited coroutine, so a timeout
+    # reaching here can only come from `wait_for`
+    try:
+        return await asyncio.wait_for(_attempt(f, args, kwargs), budget)
+    except asyncio.TimeoutError:
+        return _timed_out(seconds)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _budget(seconds):
+    return seconds.remaining() if isinstance(seconds, Deadline) else seconds
+
+#------------------------------------------------------------------------------
+
+async def _attempt(f, args, kwargs):
+    try:
+        return Success(await f(*args, **kwargs))
+    except Exception as e:
+        return _failure(e)
+
+#------------------------------------------------------------------------------
+
+def _timed_out(seconds):
+    if isinstance(seconds, Deadline):
+        return Failure(TimeoutError("deadline exceeded"))
+    return Failure(TimeoutError("timed out after {0}s".format(seconds)))
+
+#------------------------------------------------------------------------------
+
+def _shared_pool():
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(thread_name_prefix='pyfnz-timeout')
+    return _pool
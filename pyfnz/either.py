@@ -34,7 +34,7 @@
 
 import abc
 
-from functools import partial
+from functools import partial, wraps
 
 #------------------------------------------------------------------------------
 # module
@@ -44,6 +44,15 @@ __all__ = ['Either',
            'Left',
            'Right']
 
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# variant tags written by `__reduce__` and hashed with the value, distinct
+# from the tags of the try variants in tri.py
+_LEFT  = 0
+_RIGHT = 1
+
 #------------------------------------------------------------------------------
 # helper classes
 #------------------------------------------------------------------------------
@@ -73,6 +82,10 @@ class Either(object):
     (`A`) chosen for the "left" could be any type representing an error and has
     no need to actually extend `Exception`.
 
+    The methods below document the interface, `Left` and `Right` each carry
+    their own implementation so a call dispatches once through the class
+    instead of branching on the type of the instance.
+
     Note: This class is currently experimental and the implementation will
     change, but the interface will stay consistent.
     """
@@ -120,6 +133,13 @@ class Either(object):
 
     #--------------------------------------------------------------------------
 
+    def __hash__(self):
+        """Hash of the variant tag and the value, consistent with `==`.
+        Computed on first use and kept with the disjunction.
+        """
+
+    #--------------------------------------------------------------------------
+
     def __repr__(self):
         return "{cls}({value!r})".format(**{
             'cls' : self.__class__.__name__,
@@ -132,10 +152,12 @@ class Either(object):
         disjunction.
         """
 
-        if type(self) is Left:
-            raise EitherIterExcept(self)
-        elif type(self) is Right:
-            yield self._value
+    #--------------------------------------------------------------------------
+
+    def __reduce__(self):
+        """Pickle as a one byte variant tag plus the value instead of the
+        generic slot state.
+        """
 
     #--------------------------------------------------------------------------
     # public methods
@@ -169,57 +191,177 @@ class Either(object):
 
     #--------------------------------------------------------------------------
 
+    @staticmethod
+    def do_block(f):
+        """Decorator version of `do` notation.  The decorated generator
+        function yields disjunctions and is sent back their right values, the
+        value it returns is wrapped in a right.  The first left yielded is
+        returned and the generator closed, running its `finally` clauses, so
+        unlike `do` no exception is raised to short-circuit.
+
+        ex:
+            >>> @do_block
+                def add(a, b):
+                    x = yield a
+                    y = yield b
+                    return x + y
+
+            >>> add(Right(1), Right(2))
+            >>> Right(3)
+
+            >>> add(Left(1), Right(2))
+            >>> Left(1)
+        """
+
+        @wraps(f)
+        def block(*args, **kwargs):
+            generator = f(*args, **kwargs)
+            send      = generator.send
+            try:
+                value = next(generator)
+                while type(value) is not Left:
+                    value = send(value._value)
+                generator.close()
+                return value
+            except StopIteration as e:
+                return Right(e.value)
+        return block
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def do_async(generator):
+        """Async version of `do`, expects an asynchronous generator expression
+        ie. one awaiting inside its clauses.  Must be awaited.
+
+        ex:
+            >>> await do_async(x + y
+                               for x in await lookup('a')
+                               for y in await lookup(x))
+            >>> Right(...)
+        """
+
+        # a generator awaiting only in its first clause is not asynchronous,
+        # that iterable is evaluated before the generator is created
+        if not hasattr(generator, '__anext__'):
+            return Either.do(generator)
+
+        try:
+            return Right(await generator.__anext__())
+        except EitherIterExcept as e:
+            return e.obj
+        finally:
+            await generator.aclose()
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def tailrec(step, seed):
+        """Stack safe monadic recursion, modeled after scala's `tailRecM`.
+        `step` is called with the seed and must return a left to stop with an
+        error, a `Right(Left(a))` to step again with `a`, or a
+        `Right(Right(b))` to stop with `Right(b)`, anything else raises a
+        TypeError.  The chain is run in a loop so its depth is not bound by
+        the recursion limit.
+
+        ex:
+            >>> tailrec(lambda n: Right(Left(n - 1)) if n > 0
+                             else Right(Right('done')),
+                        100000)
+            >>> Right('done')
+
+            >>> tailrec(lambda n: Right(Left(n - 1)) if n > 0
+                             else Left('boom'),
+                        100000)
+            >>> Left('boom')
+        """
+
+        value = seed
+        while True:
+            result = step(value)
+            if type(result) is Left:
+                return result
+
+            inner = result._value if type(result) is Right else None
+            if type(inner) is Left:
+                value = inner._value
+            elif type(inner) is Right:
+                return inner
+            else:
+                raise TypeError("tailrec step must return a Left, Right(Left) "
+                                "or Right(Right), got {0!r}".format(result))
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def traverse(f, iterable):
+        """Run f, which returns a disjunction, over every item and collect the
+        right values into a list wrapped in a right.  The first left returned
+        is returned immediately and the remaining items are not visited.
+
+        ex:
+            >>> traverse(lambda x: Right(x * 2), [1, 2, 3])
+            >>> Right([2, 4, 6])
+
+            >>> traverse(lambda x: Right(x) if x < 2 else Left(x), [1, 2, 3])
+            >>> Left(2)
+        """
+
+        values = []
+        append = values.append
+        for x in iterable:
+            result = f(x)
+            if type(result) is Left:
+                return result
+            append(result._value)
+        return Right(values)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def sequence(iterable):
+        """Turn an iterable of disjunctions into a right of the list of their
+        values, or the first left.
+        """
+
+        values = []
+        append = values.append
+        for result in iterable:
+            if type(result) is Left:
+                return result
+            append(result._value)
+        return Right(values)
+
+    #--------------------------------------------------------------------------
+
     def is_left(self):
         """Return `true` if this disjunction is left.
         """
 
-        if type(self) is Left:
-            return True
-        elif type(self) is Right:
-            return False
-
     #--------------------------------------------------------------------------
 
     def is_right(self):
         """Return `true` if this disjunction is right.
         """
 
-        if type(self) is Left:
-            return False
-        elif type(self) is Right:
-            return True
-
     #--------------------------------------------------------------------------
 
     def swap(self):
         """Flip the left/right values in this disjunction. Alias for unary `~`.
         """
 
-        if type(self) is Left:
-            return Right(self._value)
-        elif type(self) is Right:
-            return Left(self._value)
-
     #--------------------------------------------------------------------------
 
     def left_map(self, f):
         """Run the given function on the left value.
         """
 
-        if type(self) is Left:
-            return Left(f(self._value))
-        elif type(self) is Right:
-            return self
-
     #--------------------------------------------------------------------------
 
     def foreach(self, g):
         """Run the side-effect on the right of this disjunction.
         """
 
-        if type(self) is Right:
-            g(self._value)
-
     #--------------------------------------------------------------------------
 
     def exists(self, p):
@@ -227,11 +369,6 @@ class Either(object):
         given predicate.
         """
 
-        if type(self) is Left:
-            return False
-        elif type(self) is Right:
-            return p(self._value)
-
     #--------------------------------------------------------------------------
 
     def forall(self, p):
@@ -239,11 +376,6 @@ class Either(object):
         satisfies the given predicate.
         """
 
-        if type(self) is Left:
-            return True
-        elif type(self) is Right:
-            return p(self._value)
-
     #--------------------------------------------------------------------------
 
     def to_list(self):
@@ -251,11 +383,6 @@ class Either(object):
         disjunction.
         """
 
-        if type(self) is Left:
-            return []
-        elif type(self) is Right:
-            return [self._value]
-
     #--------------------------------------------------------------------------
 
     def to_try(self):
@@ -263,14 +390,6 @@ class Either(object):
         Error should be an exception.
         """
 
-        # prevent circular imports
-        from .tri import Failure, Success
-
-        if type(self) is Left:
-            return Failure(self._value)
-        elif type(self) is Right:
-            return Success(self._value)
-
     #--------------------------------------------------------------------------
 
     def get_or_else(self, x):
@@ -278,22 +397,12 @@ class Either(object):
         left.  Alias for `|`.
         """
 
-        if type(self) is Left:
-            return x
-        elif type(self) is Right:
-            return self._value
-
     #--------------------------------------------------------------------------
 
     def or_else(self, x):
         """Return this if it is a right, otherwise, return the given value.
         """
 
-        if type(self) is Left:
-            return x
-        elif type(self) is Right:
-            return self
-
     #--------------------------------------------------------------------------
 
     def or_elsef(self, f):
@@ -301,22 +410,12 @@ class Either(object):
         running f.
         """
 
-        if type(self) is Left:
-            return f()
-        elif type(self) is Right:
-            return self
-
     #- Functor ----------------------------------------------------------------
 
     def map(self, f):
         """Map on the right of this disjunction.
         """
 
-        if type(self) is Left:
-            return self
-        elif type(self) is Right:
-            return Right(f(self._value))
-
     #- Applicative ------------------------------------------------------------
 
     def ap(self, f):
@@ -350,17 +449,265 @@ class Either(object):
         """Bind through the right of this disjunction.
         """
 
-        if type(self) is Left:
-            return self
-        elif type(self) is Right:
-            return g(self._value)
+    #--------------------------------------------------------------------------
+
+    def lazy(self):
+        """Start a lazy pipeline on this disjunction.  Stages added with `map`
+        and `flatmap` are only recorded, consecutive maps are fused into a
+        single call and the pipeline runs on `run`.  See `pyfnz.lazy.Lazy`.
+
+        ex:
+            >>> pipeline = Right(1).lazy().map(inc).map(double)
+            >>> pipeline.run()
+            >>> Right(4)
+            >>> pipeline.run(2)
+            >>> Right(6)
+        """
+
+        # prevent circular imports
+        from .lazy import Lazy
+        return Lazy(self)
 
 #------------------------------------------------------------------------------
 
 class Left(Either):
-    __slots__ = ('_value',)
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_value', '_hash')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __invert__(self):
+        return Right(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def __or__(self, other):
+        return other
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        # raise on the first `next`, not on `iter`, so `do` can catch it
+        raise EitherIterExcept(self)
+        yield
+
+    #--------------------------------------------------------------------------
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = h = hash((_LEFT, self._value))
+            return h
+
+    #--------------------------------------------------------------------------
+
+    def __reduce__(self):
+        return _restore, (_LEFT, self._value)
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def is_left(self):
+        return True
+
+    #--------------------------------------------------------------------------
+
+    def is_right(self):
+        return False
+
+    #--------------------------------------------------------------------------
+
+    def swap(self):
+        return Right(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def left_map(self, f):
+        return Left(f(self._value))
+
+    #--------------------------------------------------------------------------
+
+    def foreach(self, g):
+        pass
+
+    #--------------------------------------------------------------------------
+
+    def exists(self, p):
+        return False
+
+    #--------------------------------------------------------------------------
+
+    def forall(self, p):
+        return True
+
+    #--------------------------------------------------------------------------
+
+    def to_list(self):
+        return []
+
+    #--------------------------------------------------------------------------
+
+    def to_try(self):
+        # prevent circular imports
+        from .tri import Failure
+        return Failure(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def get_or_else(self, x):
+        return x
+
+    #--------------------------------------------------------------------------
+
+    def or_else(self, x):
+        return x
+
+    #--------------------------------------------------------------------------
+
+    def or_elsef(self, f):
+        return f()
+
+    #--------------------------------------------------------------------------
+
+    def map(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def flatmap(self, g):
+        return self
 
 #------------------------------------------------------------------------------
 
 class Right(Either):
-    __slots__ = ('_value',)
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_value', '_hash')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __invert__(self):
+        return Left(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def __or__(self, other):
+        return self._value
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        yield self._value
+
+    #--------------------------------------------------------------------------
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = h = hash((_RIGHT, self._value))
+            return h
+
+    #--------------------------------------------------------------------------
+
+    def __reduce__(self):
+        return _restore, (_RIGHT, self._value)
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def is_left(self):
+        return False
+
+    #--------------------------------------------------------------------------
+
+    def is_right(self):
+        return True
+
+    #--------------------------------------------------------------------------
+
+    def swap(self):
+        return Left(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def left_map(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def foreach(self, g):
+        g(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def exists(self, p):
+        return p(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def forall(self, p):
+        return p(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def to_list(self):
+        return [self._value]
+
+    #--------------------------------------------------------------------------
+
+    def to_try(self):
+        # prevent circular imports
+        from .tri import Success
+        return Success(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def get_or_else(self, x):
+        return self._value
+
+    #--------------------------------------------------------------------------
+
+    def or_else(self, x):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def or_elsef(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def map(self, f):
+        return Right(f(self._value))
+
+    #--------------------------------------------------------------------------
+
+    def flatmap(self, g):
+        return g(self._value)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _restore(tag, value):
+    """Rebuild a pickled disjunction from its variant tag and value.
+    """
+
+    instance = object.__new__(Right if tag == _RIGHT else Left)
+    instance._value = value
+    return instance
@@ -0,0 +1,127 @@
+#------------------------------------------------------------------------------
+# hedge.py - hedged execution for Try
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from .deadline import _shared_pool
+from .tri import Success, _failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['hedged',
+           'hedged_async']
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def hedged(f, *args, after=0.05, max_attempts=2, executor=None, **kwargs):
+    """Race attempts of f on a thread pool.  See `Try.hedged`.
+    """
+
+    _check(after, max_attempts)
+
+    pool    = executor or _shared_pool()
+    pending = set([pool.submit(f, *args, **kwargs)])
+    started = 1
+    error   = None
+    try:
+        while pending:
+            done, pending = wait(pending,
+                                 after if started < max_attempts else None,
+                                 FIRST_COMPLETED)
+            for future in done:
+                try:
+                    return Success(future.result())
+                except Exception as e:
+                    error = e
+
+            # nothing succeeded, either the delay passed without an answer
+            # or attempts failed, which are replaced straight away
+            if started < max_attempts:
+                pending.add(pool.submit(f, *args, **kwargs))
+                started += 1
+    finally:
+        for future in pending:
+            future.cancel()
+
+    return _failure(error)
+
+#------------------------------------------------------------------------------
+
+async def hedged_async(f, *args, after=0.05, max_attempts=2, **kwargs):
+    """Race attempts of the coroutine function f.  See `Try.hedged_async`.
+    """
+
+    import asyncio
+
+    _check(after, max_attempts)
+
+    pending = set([asyncio.ensure_future(f(*args, **kwargs))])
+    started = 1
+    error   = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=after if started < max_attempts else None,
+                return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    return Success(task.result())
+                except Exception as e:
+                    error = e
+
+            if started < max_attempts:
+                pending.add(asyncio.ensure_future(f(*args, **kwargs)))
+                started += 1
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return _failure(error)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _check(after, max_attempts):
+    if after < 0:
+        raise ValueError("hedge delay must not be negative, got {0}".format(
+            after))
+    if max_attempts < 1:
+        raise ValueError("max_attempts must be positive, got {0}".format(
+            max_attempts))
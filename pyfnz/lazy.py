@@ -0,0 +1,206 @@
+#------------------------------------------------------------------------------
+# lazy.py - lazily built, fused map pipelines
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from .either import Left, Right
+from .tri import Failure, Success, Try, _failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['Lazy']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+_MAP     = True
+_FLATMAP = False
+
+# marks a run on the source the pipeline was started from
+_SOURCE = object()
+
+#------------------------------------------------------------------------------
+# Lazy
+#------------------------------------------------------------------------------
+
+class Lazy(object):
+    """A pipeline of `map` and `flatmap` stages recorded on an Either or a Try
+    and evaluated by `run`, started with `lazy()`.
+
+    Consecutive maps are fused into one call so no wrapper is allocated
+    between them, and on a Try the fused block runs under a single exception
+    guard.  Like the eager methods, a Try flatmap doesn't guard its function
+    and an Either map doesn't catch at all.  Adding a stage returns a new
+    pipeline, the stages are compiled on the first run and a pipeline can be
+    run again on other values with `run(x)`.
+
+    ex:
+        >>> parse = Try.pure(' 1').lazy().map(str.strip).map(int).flatmap(check)
+        >>> parse.run()
+        >>> Success(1)
+        >>> [parse.run(s) for s in lines]
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_source', '_stages', '_try', '_plan')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, source, stages=()):
+        self._source = source
+        self._stages = stages
+        self._try    = isinstance(source, Try)
+        self._plan   = None
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        return "Lazy({0!r}, {1} stages)".format(self._source, len(self._stages))
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def run(self, x=_SOURCE):
+        """Evaluate the pipeline on the source it was started from or, if
+        given, on the plain value x.
+        """
+
+        plan = self._plan
+        if plan is None:
+            plan = self._plan = _compile(self._stages)
+
+        if x is _SOURCE:
+            source = self._source
+            cls    = source.__class__
+            if cls is Left or cls is Failure:
+                return source
+            x = source._value
+
+        return _run_try(plan, x) if self._try else _run_either(plan, x)
+
+    #- Functor ----------------------------------------------------------------
+
+    def map(self, f):
+        """Record a map stage.
+        """
+
+        return Lazy(self._source, self._stages + ((_MAP, f),))
+
+    #- Monad ------------------------------------------------------------------
+
+    def flatmap(self, g):
+        """Record a flatmap stage.
+        """
+
+        return Lazy(self._source, self._stages + ((_FLATMAP, g),))
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _compile(stages):
+    """Fuse runs of map stages, returns a tuple of `(is_map, function)`.
+    """
+
+    plan = []
+    maps = []
+    for kind, f in stages:
+        if kind is _MAP:
+            maps.append(f)
+            continue
+        if maps:
+            plan.append((_MAP, _fuse(maps)))
+            maps = []
+        plan.append((_FLATMAP, f))
+    if maps:
+        plan.append((_MAP, _fuse(maps)))
+    return tuple(plan)
+
+#------------------------------------------------------------------------------
+
+def _fuse(fs):
+    """Compose functions applied left to right into a single call.
+    """
+
+    if len(fs) == 1:
+        return fs[0]
+
+    fs = tuple(fs)
+    def fused(x):
+        for f in fs:
+            x = f(x)
+        return x
+    return fused
+
+#------------------------------------------------------------------------------
+
+def _run_either(plan, x):
+    for is_map, f in plan:
+        if is_map:
+            x = f(x)
+        else:
+            result = f(x)
+            if result.__class__ is Left:
+                return result
+            x = result._value
+
+    instance = object.__new__(Right)
+    instance._value = x
+    return instance
+
+#------------------------------------------------------------------------------
+
+def _run_try(plan, x):
+    for is_map, f in plan:
+        if is_map:
+            try:
+                x = f(x)
+            except Exception as e:
+                return _failure(e)
+        else:
+            result = f(x)
+            if result.__class__ is Failure:
+                return result
+            x = result._value
+
+    instance = object.__new__(Success)
+    instance._value = x
+    return instance
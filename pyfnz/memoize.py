@@ -0,0 +1,232 @@
+#------------------------------------------------------------------------------
+# memoize.py - result aware memoization of Try and Either
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import threading
+
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from time import monotonic
+
+from .either import Left
+from .tri import Failure, _failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['memoize_try',
+           'memoize_either',
+           'CacheInfo']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+CacheInfo = namedtuple('CacheInfo',
+                       ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+# separates positional from keyword arguments in a cache key
+_KWARGS = object()
+
+# argument types hashing to themselves, a single one is used as the key
+_SIMPLE = frozenset([int, str])
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class _Call(object):
+    """A call in flight, waited on by concurrent misses of the same key.
+    """
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done   = threading.Event()
+        self.result = None
+        self.error  = None
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def memoize_try(maxsize=128, ttl=None, failure_ttl=1.0):
+    """Decorator caching the Try returned by a function by its arguments.
+    Successes are kept for `ttl` seconds (forever if None), failures only for
+    `failure_ttl` seconds (not at all if 0) so a failing key is retried soon
+    without every call reaching the backend.  At most `maxsize` results are
+    kept, the least recently used is evicted first (unbounded if None).  An
+    exception raised by the function is cached as a Failure.
+
+    Concurrent misses of the same key are coalesced, a single call is made
+    and the other callers wait for its result.  The decorated function gets
+    `cache_info()` returning a `CacheInfo` of the counters and
+    `cache_clear()`.  Hits are served without taking the lock, under heavy
+    contention the hit count may miss a few.
+
+    ex:
+        >>> @memoize_try(maxsize=1024, ttl=60.0, failure_ttl=1.0)
+            def lookup(key):
+                return Try(backend.get, key)
+    """
+
+    return lambda f: _memoize(f, maxsize, ttl, failure_ttl, Failure, True)
+
+#------------------------------------------------------------------------------
+
+def memoize_either(maxsize=128, ttl=None, failure_ttl=1.0):
+    """Decorator caching the Either returned by a function, see
+    `memoize_try`.  Lefts are kept for `failure_ttl` seconds, exceptions
+    raised by the function are passed on to every waiting caller and not
+    cached.
+    """
+
+    return lambda f: _memoize(f, maxsize, ttl, failure_ttl, Left, False)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _memoize(f, maxsize, ttl, failure_ttl, failed, catch):
+    """Wrap f in the cache, `failed` is the variant cached for `failure_ttl`
+    and `catch` turns exceptions raised by f into failures.
+    """
+
+    if maxsize is not None and maxsize < 1:
+        raise ValueError("maxsize must be positive, got {0}".format(maxsize))
+
+    cache    = OrderedDict()   # key -> (result, expiry time or None)
+    inflight = {}              # key -> _Call
+    lock     = threading.Lock()
+    counts   = [0, 0, 0]       # hits, misses, evictions
+
+    def expiry(result):
+        seconds = failure_ttl if type(result) is failed else ttl
+        return None if seconds is None else monotonic() + seconds
+
+    @wraps(f)
+    def memoized(*args, **kwargs):
+        if kwargs:
+            key = args + (_KWARGS,) + tuple(kwargs.items())
+        elif len(args) == 1 and type(args[0]) in _SIMPLE:
+            key = args[0]
+        else:
+            key = args
+
+        # hits don't take the lock, single operations on the cache are
+        # atomic and a key evicted meanwhile is simply not moved
+        entry = cache.get(key)
+        if entry is not None and (entry[1] is None or monotonic() < entry[1]):
+            try:
+                cache.move_to_end(key)
+            except KeyError:
+                pass
+            counts[0] += 1
+            return entry[0]
+
+        owner = False
+        with lock:
+            entry = cache.pop(key, None)
+            if entry is not None and \
+               (entry[1] is None or monotonic() < entry[1]):
+                # stored since the check above
+                cache[key] = entry
+                counts[0] += 1
+                return entry[0]
+
+            # coalesce with a call of the same key in flight
+            call = inflight.get(key)
+            if call is not None:
+                counts[0] += 1
+            else:
+                counts[1] += 1
+                call = inflight[key] = _Call()
+                owner = True
+
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            result = f(*args, **kwargs)
+        except Exception as e:
+            if not catch:
+                call.error = e
+                raise
+            result = _failure(e)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with lock:
+                del inflight[key]
+                if call.error is None:
+                    call.result = result
+                    _store(cache, key, result, expiry(result), maxsize, counts)
+            call.done.set()
+
+        return result
+
+    def cache_info():
+        with lock:
+            return CacheInfo(counts[0], counts[1], counts[2], maxsize,
+                             len(cache))
+
+    def cache_clear():
+        with lock:
+            cache.clear()
+            counts[:] = [0, 0, 0]
+
+    memoized.cache_info  = cache_info
+    memoized.cache_clear = cache_clear
+    return memoized
+
+#------------------------------------------------------------------------------
+
+def _store(cache, key, result, expiry, maxsize, counts):
+    """Insert a result, evicting the least recently used entries over
+    maxsize.  A result expiring at once (a zero ttl) isn't stored.
+    """
+
+    if expiry is not None and expiry <= monotonic():
+        return
+
+    cache[key] = (result, expiry)
+    cache.move_to_end(key)
+    if maxsize is not None:
+        while len(cache) > maxsize:
+            cache.popitem(last=False)
+            counts[2] += 1
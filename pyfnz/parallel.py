@@ -0,0 +1,232 @@
+#------------------------------------------------------------------------------
+# parallel.py - run Try over thread and process pools
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import collections
+import os
+import pickle
+import time
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+from .tri import Failure, RemoteTraceback, Success, _failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['map_parallel',
+           'RemoteError',
+           'RemoteTraceback']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# seconds of work an adaptively sized chunk aims for, large enough to hide the
+# cost of submitting a task and shipping its results back
+TARGET_CHUNK_TIME = 0.01
+
+# chunks kept in flight per worker
+CHUNKS_PER_WORKER = 2
+
+_EXECUTORS = {'process' : ProcessPoolExecutor,
+              'thread'  : ThreadPoolExecutor}
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class RemoteError(Exception):
+    """Stands in for an exception raised in a worker process that could not be
+    sent back, ie. one holding args that can't be pickled, or for a result
+    that can't be.  The message holds the name of the original type and its
+    message.
+    """
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def map_parallel(f, iterable, executor='process', chunksize=None,
+                 max_workers=None, lazy=False):
+    """Run f over every item on a `concurrent.futures` pool and return a list
+    of `Success`/`Failure` in input order, or an iterator of them if `lazy`.
+    See `Try.map_parallel`.
+    """
+
+    results = _map(f, iterable, executor, chunksize, max_workers)
+    return results if lazy else list(results)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _map(f, iterable, executor, chunksize, max_workers):
+    if isinstance(executor, Executor):
+        pool, owned = executor, False
+    elif executor in _EXECUTORS:
+        pool, owned = _EXECUTORS[executor](max_workers), True
+    else:
+        raise ValueError("executor must be 'process', 'thread' or an "
+                         "Executor, got {0!r}".format(executor))
+
+    remote  = isinstance(pool, ProcessPoolExecutor)
+    workers = max_workers or getattr(pool, '_max_workers', None) or \
+              os.cpu_count() or 1
+
+    # adaptive chunks start small, are sized from the measured cost per item
+    # and never grow past an even share of a sized input
+    adaptive = chunksize is None
+    limit    = None
+    if adaptive:
+        chunksize = 1
+        try:
+            limit = max(1, len(iterable) // (workers * 4))
+        except TypeError:
+            pass
+
+    iterator  = iter(iterable)
+    pending   = collections.deque()
+    exhausted = False
+    spent     = 0.0
+    done      = 0
+    try:
+        while True:
+            while not exhausted and \
+                  len(pending) < workers * CHUNKS_PER_WORKER:
+                chunk = list(islice(iterator, chunksize))
+                if not chunk:
+                    exhausted = True
+                    break
+                pending.append(pool.submit(_run_chunk, f, chunk, remote))
+
+            if not pending:
+                break
+
+            values, errors, elapsed = pending.popleft().result()
+            if remote:
+                values = pickle.loads(values)
+            if adaptive:
+                spent += elapsed
+                done  += len(values)
+                chunksize = _chunksize(spent / done, limit)
+
+            results = [Success(v) for v in values]
+            for i, failure in errors:
+                results[i] = failure
+            for result in results:
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True)
+
+#------------------------------------------------------------------------------
+
+def _chunksize(per_item, limit):
+    """Number of items expected to take `TARGET_CHUNK_TIME`.
+    """
+
+    size = int(TARGET_CHUNK_TIME / per_item) if per_item > 0 else 1 << 16
+    if limit is not None:
+        size = min(size, limit)
+    return max(1, size)
+
+#------------------------------------------------------------------------------
+
+def _run_chunk(f, chunk, remote):
+    """Worker side, run f over the chunk.  Returns `(values, errors,
+    elapsed)` where errors lists `(index, failure)` for the items that
+    raised, their slot in values is None.  In a worker process values are
+    returned pickled, see `_dumps`.
+    """
+
+    start  = time.perf_counter()
+    values = []
+    errors = []
+    append = values.append
+    for i, x in enumerate(chunk):
+        try:
+            append(f(x))
+        except Exception as e:
+            append(None)
+            errors.append((i, _portable(e) if remote else _failure(e)))
+    if remote:
+        values = _dumps(values, errors)
+    return values, errors, time.perf_counter() - start
+
+#------------------------------------------------------------------------------
+
+def _dumps(values, errors):
+    """Pickle the values of a chunk.  If one of them can't be, it is replaced
+    by a `RemoteError` failure in errors so the rest of the chunk still makes
+    it back instead of the whole chunk failing to be sent.
+    """
+
+    try:
+        return pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        pass
+
+    for i, value in enumerate(values):
+        try:
+            pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            values[i] = None
+            errors.append((i, Failure(RemoteError(
+                "{0}.{1} result can't be pickled: {2}".format(
+                    type(value).__module__, type(value).__qualname__, e)))))
+    return pickle.dumps(values, pickle.HIGHEST_PROTOCOL)
+
+#------------------------------------------------------------------------------
+
+def _portable(e):
+    """Wrap an exception raised in a worker process in a failure that
+    survives a pickle round trip, see `Try.__reduce__`.  One that doesn't is
+    replaced by a `RemoteError` keeping the original traceback.
+    """
+
+    failure = _failure(e)
+    try:
+        pickle.loads(pickle.dumps(failure))
+    except Exception:
+        error = RemoteError("{0}.{1}: {2}".format(
+            type(e).__module__, type(e).__qualname__, e))
+        error.__traceback__ = e.__traceback__
+        if isinstance(e.__cause__, RemoteTraceback):
+            error.__cause__ = e.__cause__
+        failure = Failure(error)
+    return failure
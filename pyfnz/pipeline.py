@@ -0,0 +1,203 @@
+#------------------------------------------------------------------------------
+# pipeline.py - reusable railway pipelines of Either/Try steps
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import weakref
+
+from functools import wraps
+from itertools import islice
+from types import FunctionType
+
+from .either import Left
+from .tri import Failure
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['Pipeline',
+           'batched']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# batch implementations of the steps made by `batched`, by step
+_batched = weakref.WeakKeyDictionary()
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def batched(f):
+    """Decorator declaring a pipeline step by its batch implementation: f
+    takes a list of values and returns a list of Either/Try results of the
+    same length.  `Pipeline.run_batches` calls it once per batch, other run
+    modes call it with single item lists.
+
+    ex:
+        >>> @batched
+            def lookup(keys):
+                rows = db.fetch_many(keys)
+                return [Right(rows[k]) if k in rows else Left(k) for k in keys]
+    """
+
+    @wraps(f)
+    def step(x):
+        return f([x])[0]
+
+    step.batch = f
+    _batched[step] = f
+    return step
+
+#------------------------------------------------------------------------------
+# Pipeline
+#------------------------------------------------------------------------------
+
+class Pipeline(object):
+    """A fixed sequence of steps, each a function taking a plain value and
+    returning an Either or a Try.  The value inside each right/success is
+    passed to the next step, the first left/failure is returned as is and
+    skips the remaining steps.  Exceptions raised by a step are not caught.
+
+    ex:
+        >>> pipeline = Pipeline([parse, validate, lookup])
+        >>> pipeline.run('42')
+        >>> Right(...)
+        >>> list(pipeline.run_batches(lines, 100))
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_steps', '_batches')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, steps):
+        steps = tuple(steps)
+        if not steps:
+            raise ValueError("a pipeline needs at least one step")
+
+        self._steps   = steps
+        self._batches = tuple(_batched.get(step)
+                                  if type(step) is FunctionType else None
+                              for step in steps)
+
+    #--------------------------------------------------------------------------
+
+    def __repr__(self):
+        return "Pipeline([{0}])".format(', '.join(
+            getattr(step, '__name__', repr(step)) for step in self._steps))
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def run(self, x):
+        """Run the steps on x and return the final result.
+        """
+
+        for step in self._steps:
+            result = step(x)
+            cls = result.__class__
+            if cls is Left or cls is Failure:
+                return result
+            x = result._value
+        return result
+
+    #--------------------------------------------------------------------------
+
+    def run_many(self, iterable):
+        """Lazily run the steps on every item, yielding results in order.
+        """
+
+        run = self.run
+        for x in iterable:
+            yield run(x)
+
+    #--------------------------------------------------------------------------
+
+    def run_batches(self, iterable, size):
+        """Lazily run the steps on batches of up to `size` items, yielding
+        results in order.  Each step runs over the whole batch before the
+        next one, steps declared with `batched` are called once per batch.
+        Items that turned left are dropped from the batch handed to the
+        following steps.
+        """
+
+        if size < 1:
+            raise ValueError("batch size must be positive, got {0}".format(
+                size))
+
+        iterator = iter(iterable)
+        while True:
+            batch = list(islice(iterator, size))
+            if not batch:
+                return
+            for result in self._run_batch(batch):
+                yield result
+
+    #--------------------------------------------------------------------------
+    # internal methods
+    #--------------------------------------------------------------------------
+
+    def _run_batch(self, values):
+        results = [None] * len(values)
+        alive   = range(len(values))
+        for step, batch in zip(self._steps, self._batches):
+            if batch is None:
+                outputs = [step(x) for x in values]
+            else:
+                outputs = batch(values)
+                if len(outputs) != len(values):
+                    raise ValueError("{0} returned {1} results for {2} "
+                                     "values".format(step.__name__,
+                                                     len(outputs),
+                                                     len(values)))
+
+            indices, values = [], []
+            for i, result in zip(alive, outputs):
+                results[i] = result
+                cls = result.__class__
+                if cls is not Left and cls is not Failure:
+                    indices.append(i)
+                    values.append(result._value)
+
+            alive = indices
+            if not alive:
+                break
+        return results
@@ -0,0 +1,231 @@
+#------------------------------------------------------------------------------
+# retry.py - retrying Try with backoff, jitter and budgets
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+import random
+import threading
+import time
+
+from .tri import Failure, Success, _captured
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['RetryError',
+           'RetryBudget',
+           'retry',
+           'retry_async',
+           'constant',
+           'exponential',
+           'full_jitter',
+           'equal_jitter']
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class RetryError(Exception):
+    """The exception of a failed retry, `errors` lists the exception raised
+    by every attempt in order.
+    """
+
+    def __init__(self, errors):
+        Exception.__init__(self, errors)
+        self.errors = errors
+
+    def __str__(self):
+        return "{0} attempt(s) failed, last: {1!r}".format(
+            len(self.errors), self.errors[-1])
+
+#------------------------------------------------------------------------------
+# RetryBudget
+#------------------------------------------------------------------------------
+
+class RetryBudget(object):
+    """Token bucket shared by retrying calls, capping the retries they make
+    together to `per_second` on average with bursts of up to `burst`.  First
+    attempts are free, a retry without a token left is not made so a
+    struggling backend doesn't see its load multiplied.  Thread safe.
+
+    ex:
+        >>> budget = RetryBudget(10)
+        >>> retry(fetch, 3, key, budget=budget)
+    """
+
+    #--------------------------------------------------------------------------
+    # fields
+    #--------------------------------------------------------------------------
+
+    __slots__ = ('_rate', '_burst', '_tokens', '_last', '_lock')
+
+    #--------------------------------------------------------------------------
+    # base
+    #--------------------------------------------------------------------------
+
+    def __init__(self, per_second, burst=None):
+        if per_second <= 0:
+            raise ValueError("per_second must be positive, got {0}".format(
+                per_second))
+
+        self._rate   = float(per_second)
+        self._burst  = float(per_second if burst is None else burst)
+        self._tokens = self._burst
+        self._last   = time.monotonic()
+        self._lock   = threading.Lock()
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def acquire(self):
+        """Take a token for one retry, return false if there is none left.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst,
+                               self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def constant(delay):
+    """Backoff waiting the same `delay` before every retry.
+    """
+
+    return lambda retry: delay
+
+#------------------------------------------------------------------------------
+
+def exponential(base=0.1, cap=10.0):
+    """Backoff waiting `base * 2 ** n` before retry n (from 0), at most
+    `cap` seconds.
+    """
+
+    return lambda retry: min(cap, base * 2 ** retry)
+
+#------------------------------------------------------------------------------
+
+def full_jitter(delay):
+    """Jitter picking uniformly between no wait and the full delay.
+    """
+
+    return random.uniform(0, delay)
+
+#------------------------------------------------------------------------------
+
+def equal_jitter(delay):
+    """Jitter keeping half the delay and picking the rest uniformly.
+    """
+
+    return delay / 2.0 + random.uniform(0, delay / 2.0)
+
+#------------------------------------------------------------------------------
+
+def retry(f, attempts, *args, backoff=exponential(), jitter=None,
+          retry_on=(Exception,), budget=None, **kwargs):
+    """Call f until it succeeds.  See `Try.retry`.
+    """
+
+    _check(attempts)
+
+    errors = []
+    for n in range(attempts):
+        try:
+            return Success(f(*args, **kwargs))
+        except Exception as e:
+            errors.append(_captured(e))
+            if not _again(e, n, attempts, retry_on, budget):
+                break
+        time.sleep(_delay(backoff, jitter, n))
+
+    return _failed(errors)
+
+#------------------------------------------------------------------------------
+
+async def retry_async(f, attempts, *args, backoff=exponential(), jitter=None,
+                      retry_on=(Exception,), budget=None, **kwargs):
+    """Await the coroutine function f until it succeeds.  See
+    `Try.retry_async`.
+    """
+
+    import asyncio
+
+    _check(attempts)
+
+    errors = []
+    for n in range(attempts):
+        try:
+            return Success(await f(*args, **kwargs))
+        except Exception as e:
+            errors.append(_captured(e))
+            if not _again(e, n, attempts, retry_on, budget):
+                break
+        await asyncio.sleep(_delay(backoff, jitter, n))
+
+    return _failed(errors)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _check(attempts):
+    if attempts < 1:
+        raise ValueError("attempts must be positive, got {0}".format(attempts))
+
+#------------------------------------------------------------------------------
+
+def _again(e, n, attempts, retry_on, budget):
+    """Return true if attempt n failing with e should be retried.
+    """
+
+    return n + 1 < attempts and isinstance(e, retry_on) and \
+           (budget is None or budget.acquire())
+
+#------------------------------------------------------------------------------
+
+def _delay(backoff, jitter, n):
+    delay = backoff(n)
+    return delay if jitter is None else jitter(delay)
+
+#------------------------------------------------------------------------------
+
+def _failed(errors):
+    return Failure(RetryError(errors))
@@ -0,0 +1,443 @@
+#------------------------------------------------------------------------------
+# transducers.py - composable transformations of reductions
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Electronic Dreams, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#------------------------------------------------------------------------------
+
+from .clj import identity
+
+#------------------------------------------------------------------------------
+# module
+#------------------------------------------------------------------------------
+
+__all__ = ['Reduced',
+           'reduced',
+           'is_reduced',
+           'ensure_reduced',
+           'unreduced',
+           'completing',
+           'transduce',
+           'into',
+           'sequence',
+           'mapping',
+           'filtering',
+           'removing',
+           'keeping',
+           'cat',
+           'mapcat',
+           'taking',
+           'taking_while',
+           'dropping',
+           'dropping_while',
+           'partitioning_all',
+           'deduping',
+           'distinct']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# marks nothing seen yet in deduping
+_NOTHING = object()
+
+#------------------------------------------------------------------------------
+# Reduced
+#------------------------------------------------------------------------------
+
+class Reduced(object):
+    """Wraps the accumulated value of a reduction which should stop early.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return "Reduced({0!r})".format(self.value)
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def reduced(x):
+    """Returns x wrapped so the reduction stops with it.
+    """
+
+    return Reduced(x)
+
+#------------------------------------------------------------------------------
+
+def is_reduced(x):
+    """Returns true if x is wrapped by `reduced`.
+    """
+
+    return type(x) is Reduced
+
+#------------------------------------------------------------------------------
+
+def ensure_reduced(x):
+    """Returns x if it is reduced, otherwise x wrapped by `reduced`.
+    """
+
+    return x if type(x) is Reduced else Reduced(x)
+
+#------------------------------------------------------------------------------
+
+def unreduced(x):
+    """Returns the value of x if it is reduced, otherwise x.
+    """
+
+    return x.value if type(x) is Reduced else x
+
+#------------------------------------------------------------------------------
+
+def completing(f, complete=identity):
+    """Returns the reducing function f with the given completion, called once
+    with the final accumulated value.
+    """
+
+    def step(acc, x):
+        return f(acc, x)
+    step.complete = complete
+    return step
+
+#------------------------------------------------------------------------------
+
+def transduce(xform, f, init, coll):
+    """Reduce coll with f transformed by xform, starting from init.  A
+    transducer is a function from one reducing function `f(acc, x)` to
+    another, compose them with `clj.comp`, the leftmost sees each item
+    first.  Items are pulled from coll one at a time and the reduction stops
+    as soon as a step returns a `reduced` value.
+
+    A reducing function may have a `complete` attribute, called on the final
+    value, see `completing`.
+
+    ex:
+        >>> transduce(comp(filtering(is_odd), mapping(inc), taking(3)),
+                      operator.add, 0, itertools.count())
+        >>> 12
+    """
+
+    rf = xform(f)
+    return _complete(rf)(_reduce(rf, init, coll))
+
+#------------------------------------------------------------------------------
+
+def into(to, xform, coll):
+    """Returns a copy of the list, set or dict `to` with the items of coll
+    transformed by xform added, dicts take `(key, value)` items.
+    """
+
+    acc = type(to)(to)
+    if isinstance(acc, dict):
+        rf = _assoc
+    elif isinstance(acc, set):
+        rf = _conj
+    else:
+        rf = _append
+    return transduce(xform, rf, acc, coll)
+
+#------------------------------------------------------------------------------
+
+def sequence(xform, coll):
+    """Returns an iterator of the items of coll transformed by xform, reading
+    coll only as far as needed for each item.
+    """
+
+    return _stream(xform, coll)
+
+#------------------------------------------------------------------------------
+# transducers
+#------------------------------------------------------------------------------
+
+def mapping(f):
+    """Transducer applying f to each item.
+    """
+
+    def xform(rf):
+        def step(acc, x):
+            return rf(acc, f(x))
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def filtering(p):
+    """Transducer keeping the items for which p is logical true.
+    """
+
+    def xform(rf):
+        def step(acc, x):
+            return rf(acc, x) if p(x) else acc
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def removing(p):
+    """Transducer dropping the items for which p is logical true.
+    """
+
+    def xform(rf):
+        def step(acc, x):
+            return acc if p(x) else rf(acc, x)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def keeping(f):
+    """Transducer of the results of f on each item which are not None.
+    """
+
+    def xform(rf):
+        def step(acc, x):
+            y = f(x)
+            return acc if y is None else rf(acc, y)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def cat(rf):
+    """Transducer passing on the items of each item, which must be iterable.
+    """
+
+    def step(acc, xs):
+        for x in xs:
+            acc = rf(acc, x)
+            if type(acc) is Reduced:
+                break
+        return acc
+    return _passing(step, rf)
+
+#------------------------------------------------------------------------------
+
+def mapcat(f):
+    """Transducer passing on the items of f applied to each item.
+    """
+
+    to_items = mapping(f)
+    return lambda rf: to_items(cat(rf))
+
+#------------------------------------------------------------------------------
+
+def taking(n):
+    """Transducer passing on the first n items, then stopping the reduction.
+    """
+
+    def xform(rf):
+        left = n
+        def step(acc, x):
+            nonlocal left
+            if left > 0:
+                acc = rf(acc, x)
+            left -= 1
+            return acc if left > 0 else ensure_reduced(acc)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def taking_while(p):
+    """Transducer passing on items while p is logical true, then stopping
+    the reduction.
+    """
+
+    def xform(rf):
+        def step(acc, x):
+            return rf(acc, x) if p(x) else Reduced(acc)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def dropping(n):
+    """Transducer dropping the first n items.
+    """
+
+    def xform(rf):
+        left = n
+        def step(acc, x):
+            nonlocal left
+            if left > 0:
+                left -= 1
+                return acc
+            return rf(acc, x)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def dropping_while(p):
+    """Transducer dropping items while p is logical true.
+    """
+
+    def xform(rf):
+        dropping = True
+        def step(acc, x):
+            nonlocal dropping
+            if dropping and p(x):
+                return acc
+            dropping = False
+            return rf(acc, x)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def partitioning_all(n):
+    """Transducer grouping items in lists of n, the last one may be shorter.
+    """
+
+    if n < 1:
+        raise ValueError("partition size must be positive, got {0}".format(n))
+
+    def xform(rf):
+        complete = _complete(rf)
+        part     = []
+        def step(acc, x):
+            part.append(x)
+            if len(part) < n:
+                return acc
+            chunk = part[:]
+            del part[:]
+            return rf(acc, chunk)
+        def finish(acc):
+            if part:
+                chunk = part[:]
+                del part[:]
+                acc = unreduced(rf(acc, chunk))
+            return complete(acc)
+        step.complete = finish
+        return step
+    return xform
+
+#------------------------------------------------------------------------------
+
+def deduping():
+    """Transducer dropping items equal to the one before.
+    """
+
+    def xform(rf):
+        prior = _NOTHING
+        def step(acc, x):
+            nonlocal prior
+            if x == prior:
+                return acc
+            prior = x
+            return rf(acc, x)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+
+def distinct():
+    """Transducer dropping items seen before, items must be hashable.
+    """
+
+    def xform(rf):
+        seen = set()
+        def step(acc, x):
+            if x in seen:
+                return acc
+            seen.add(x)
+            return rf(acc, x)
+        return _passing(step, rf)
+    return xform
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _complete(rf):
+    """The completion of a reducing function, identity if it has none.
+    """
+
+    return getattr(rf, 'complete', identity)
+
+#------------------------------------------------------------------------------
+
+def _passing(step, rf):
+    """Give step the completion of rf, for transducers without state to
+    flush.
+    """
+
+    step.complete = _complete(rf)
+    return step
+
+#------------------------------------------------------------------------------
+
+def _reduce(rf, acc, coll):
+    for x in coll:
+        acc = rf(acc, x)
+        if type(acc) is Reduced:
+            return acc.value
+    return acc
+
+#------------------------------------------------------------------------------
+
+def _append(acc, x):
+    acc.append(x)
+    return acc
+
+#------------------------------------------------------------------------------
+
+def _conj(acc, x):
+    acc.add(x)
+    return acc
+
+#------------------------------------------------------------------------------
+
+def _assoc(acc, item):
+    acc[item[0]] = item[1]
+    return acc
+
+#------------------------------------------------------------------------------
+
+def _stream(xform, coll):
+    """Generator behind `sequence`, steps fill a buffer emptied after each
+    item of coll.
+    """
+
+    buffer = []
+    rf     = xform(_append)
+    for x in coll:
+        acc = rf(buffer, x)
+        if buffer:
+            yield from buffer
+            del buffer[:]
+        if type(acc) is Reduced:
+            break
+    _complete(rf)(buffer)
+    yield from buffer
@@ -34,6 +34,9 @@
 #------------------------------------------------------------------------------
 
 import abc
+import traceback
+
+from functools import wraps
 
 from .either import Left, Right
 
@@ -41,7 +44,43 @@ from .either import Left, Right
 # module
 #------------------------------------------------------------------------------
 
-__all__ = ['Try']
+__all__ = ['Try',
+           'RemoteTraceback',
+           'partition_results',
+           'CAPTURE_FULL',
+           'CAPTURE_SUMMARY',
+           'CAPTURE_ARGS']
+
+#------------------------------------------------------------------------------
+# globals
+#------------------------------------------------------------------------------
+
+# variant tags written by `__reduce__` and hashed with the value, distinct
+# from the tags of the either variants so equal values of different variants
+# don't collide.  A failure holding an exception is tagged separately as its
+# value is encoded
+_FAILURE   = 3
+_SUCCESS   = 4
+_EXCEPTION = 5
+
+# tags written by earlier versions, still read by `_restore`
+_OLD_TAGS = {0 : _FAILURE,
+             1 : _SUCCESS,
+             2 : _EXCEPTION}
+
+# formatted traceback texts by path of (code, line), see `_trace`
+_traces     = {}
+_MAX_TRACES = 1024
+
+# traceback capture policies, see `Try.set_capture`
+CAPTURE_FULL    = 'full'
+CAPTURE_SUMMARY = 'summary'
+CAPTURE_ARGS    = 'args'
+
+# current policy and the function applying it to caught exceptions, None
+# keeps them untouched
+_policy  = CAPTURE_FULL
+_capture = None
 
 #------------------------------------------------------------------------------
 # helper classes
@@ -54,6 +93,17 @@ class TryIterExcept(Exception):
     def __init__(self, obj):
         self.obj = obj
 
+#------------------------------------------------------------------------------
+
+class RemoteTraceback(Exception):
+    """Set as the `__cause__` of an exception whose traceback was dropped,
+    ie. unpickled from a failure or caught under the summary capture policy.
+    Its message is the traceback formatted before it was dropped.
+    """
+
+    def __str__(self):
+        return self.args[0]
+
 #------------------------------------------------------------------------------
 # Try (Monad / Functor)
 #------------------------------------------------------------------------------
@@ -69,6 +119,10 @@ class Try(object):
     Always construct a Try using the Try constructor and not the Failure and
     Success classes.
 
+    The methods below document the interface, `Failure` and `Success` each
+    carry their own implementation so a call dispatches once through the class
+    instead of branching on the type of the instance.
+
     Note: This class is currently experimental and the implementation will
     change, but the interface will stay consistent.
     """
@@ -93,6 +147,8 @@ class Try(object):
             instance = object.__new__(Success)
             instance._value = value
         except Exception as e:
+            if _capture is not None:
+                _capture(e)
             instance = object.__new__(Failure)
             instance._value = e
 
@@ -127,6 +183,13 @@ class Try(object):
 
     #--------------------------------------------------------------------------
 
+    def __hash__(self):
+        """Hash of the variant tag and the value, consistent with `==`.
+        Computed on first use and kept with the try.
+        """
+
+    #--------------------------------------------------------------------------
+
     def __repr__(self):
         return "{cls}({value!r})".format(**{
             'cls' : self.__class__.__name__,
@@ -138,10 +201,17 @@ class Try(object):
         """Yield successful value, throw exception if failure.
         """
 
-        if type(self) is Failure:
-            raise TryIterExcept(self)
-        elif type(self) is Success:
-            yield self._value
+    #--------------------------------------------------------------------------
+
+    def __reduce__(self):
+        """Pickle as a one byte variant tag plus the value instead of the
+        generic slot state.  A failure holding an exception is written as the
+        exception's own reduce value (constructor, args and state) plus its
+        formatted traceback, without the traceback object itself which can't
+        be pickled.  An exception whose constructor doesn't accept its args is
+        rebuilt without calling `__init__`, the traceback text is attached as
+        a `RemoteTraceback` cause.
+        """
 
     #--------------------------------------------------------------------------
     # public methods
@@ -175,26 +245,398 @@ class Try(object):
 
     #--------------------------------------------------------------------------
 
+    @staticmethod
+    def do_block(f):
+        """Decorator version of `do` notation.  The decorated generator
+        function yields trys and is sent back their successful values, the
+        value it returns is wrapped in a success.  The first failure yielded is
+        returned and the generator closed, running its `finally` clauses, so
+        unlike `do` no exception is raised to short-circuit.
+
+        ex:
+            >>> @do_block
+                def div(a, b):
+                    x = yield Try(int, a)
+                    y = yield Try(int, b)
+                    z = yield Try(lambda: x / y)
+                    return [z] * 2
+
+            >>> div('4', '2')
+            >>> Success([2.0, 2.0])
+
+            >>> div('4', '0')
+            >>> Failure(ZeroDivisionError('division by zero',))
+        """
+
+        @wraps(f)
+        def block(*args, **kwargs):
+            generator = f(*args, **kwargs)
+            send      = generator.send
+            try:
+                value = next(generator)
+                while type(value) is not Failure:
+                    value = send(value._value)
+                generator.close()
+                return value
+            except StopIteration as e:
+                return Success(e.value)
+        return block
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def do_async(generator):
+        """Async version of `do`, expects an asynchronous generator expression
+        ie. one awaiting inside its clauses.  Must be awaited.
+
+        ex:
+            >>> await do_async(x + y
+                               for x in await Try.of_async(fetch, 'a')
+                               for y in await Try.of_async(fetch, x))
+            >>> Success(...)
+        """
+
+        # a generator awaiting only in its first clause is not asynchronous,
+        # that iterable is evaluated before the generator is created
+        if not hasattr(generator, '__anext__'):
+            return Try.do(generator)
+
+        try:
+            return Success(await generator.__anext__())
+        except TryIterExcept as e:
+            return e.obj
+        finally:
+            await generator.aclose()
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def tailrec(step, seed):
+        """Stack safe monadic recursion, modeled after scala's `tailRecM`.
+        `step` is called with the seed and must return a failure to stop with
+        an error, a `Success(Left(a))` to step again with `a`, or a
+        `Success(Right(b))` to stop with `Success(b)`, anything else raises a
+        TypeError.  An exception raised by `step` stops with a failure.  The
+        chain is run in a loop so its depth is not bound by the recursion
+        limit.
+
+        ex:
+            >>> tailrec(lambda n: Try(lambda: Left(n - 1) if n > 0
+                                         else Right(1 / n)),
+                        100000)
+            >>> Failure(ZeroDivisionError('division by zero',))
+        """
+
+        value = seed
+        while True:
+            try:
+                result = step(value)
+            except Exception as e:
+                return _failure(e)
+            if type(result) is Failure:
+                return result
+
+            inner = result._value if type(result) is Success else None
+            if type(inner) is Left:
+                value = inner._value
+            elif type(inner) is Right:
+                return Success(inner._value)
+            else:
+                raise TypeError("tailrec step must return a Failure, "
+                                "Success(Left) or Success(Right), got "
+                                "{0!r}".format(result))
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def of_async(f, *args, **kwargs):
+        """Async version of the Try constructor, awaits the result of f, ie. a
+        coroutine function, and wraps it in a success or the exception raised
+        in a failure.  Cancellation is not caught.
+
+        ex:
+            >>> await of_async(fetch, 'http://example.com')
+            >>> Success(...)
+        """
+
+        try:
+            value = await f(*args, **kwargs)
+        except Exception as e:
+            return _failure(e)
+        return Success(value)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def gather(*aws, limit=None):
+        """Await the given awaitables concurrently and return a list of their
+        results as trys, in order.  Unlike `asyncio.gather` a failing
+        awaitable is returned as a failure and doesn't affect the others.
+        With a `limit` at most that many are awaited at a time, coroutines
+        beyond it are only started once a slot frees up.
+
+        ex:
+            >>> await gather(*(fetch(url) for url in urls), limit=10)
+            >>> [Success(...), Failure(TimeoutError()), ...]
+        """
+
+        import asyncio
+
+        if limit is None:
+            return list(await asyncio.gather(*[_settle(aw) for aw in aws]))
+
+        if limit < 1:
+            raise ValueError("limit must be positive, got {0}".format(limit))
+
+        semaphore = asyncio.Semaphore(limit)
+        async def bounded(aw):
+            async with semaphore:
+                return await _settle(aw)
+        return list(await asyncio.gather(*[bounded(aw) for aw in aws]))
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def with_timeout(f, seconds, *args, executor=None, **kwargs):
+        """Run f with the given arguments on a thread pool, a shared one
+        unless an `executor` is given, and wait at most `seconds`.  Returns a
+        `Failure(TimeoutError)` once the time is up, f itself can't be
+        interrupted and keeps its thread until it returns.
+
+        `seconds` may be a `pyfnz.deadline.Deadline` shared by the stages of
+        a flatmap chain, each stage then only waits for what is left of it and
+        one starting after it passed fails without running.
+
+        ex:
+            >>> with_timeout(fetch, 0.2, 'key')
+            >>> Failure(TimeoutError('timed out after 0.2s',))
+
+            >>> deadline = Deadline(0.5)
+            >>> with_timeout(fetch, deadline, 'key').flatmap(
+                    lambda row: with_timeout(render, deadline, row))
+        """
+
+        from .deadline import with_timeout
+        return with_timeout(f, seconds, *args, executor=executor, **kwargs)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def with_timeout_async(f, seconds, *args, **kwargs):
+        """Async version of `with_timeout`, awaits the coroutine function f
+        for at most `seconds`, a number or a `Deadline`, cancelling it once
+        the time is up.
+        """
+
+        from .deadline import with_timeout_async
+        return await with_timeout_async(f, seconds, *args, **kwargs)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def hedged(f, *args, after=0.05, max_attempts=2, executor=None, **kwargs):
+        """Run f with the given arguments on a thread pool, a shared one
+        unless an `executor` is given, and start another attempt whenever
+        `after` seconds pass without an answer, up to `max_attempts` running
+        side by side.  A failed attempt is replaced right away.  Returns the
+        first success, or a failure holding the last exception once every
+        attempt failed.  Losing attempts still queued are cancelled, running
+        ones finish in the background, so f should be idempotent.
+
+        ex:
+            >>> hedged(read_replica, 'key', after=0.05, max_attempts=2)
+            >>> Success(...)
+        """
+
+        from .hedge import hedged
+        return hedged(f, *args, after=after, max_attempts=max_attempts,
+                      executor=executor, **kwargs)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def hedged_async(f, *args, after=0.05, max_attempts=2, **kwargs):
+        """Async version of `hedged` racing tasks of the coroutine function f,
+        losing tasks are cancelled.
+        """
+
+        from .hedge import hedged_async
+        return await hedged_async(f, *args, after=after,
+                                  max_attempts=max_attempts, **kwargs)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def retry(f, attempts, *args, backoff=None, jitter=None,
+              retry_on=(Exception,), budget=None, **kwargs):
+        """Call f with the given arguments up to `attempts` times until it
+        succeeds.  Before retry n (from 0) it sleeps `backoff(n)` seconds,
+        passed through `jitter(delay)` if given, see `exponential`, `constant`,
+        `full_jitter` and `equal_jitter` in `pyfnz.retry`.  The default backoff
+        is `exponential(0.1, 10.0)`.  Only exceptions of the `retry_on` types
+        are retried, and with a shared `RetryBudget` only while it has tokens.
+
+        Returns the first success or a `Failure(RetryError)` whose `errors`
+        lists the exception of every attempt made.
+
+        ex:
+            >>> retry(fetch, 3, 'key', backoff=exponential(0.05, 1.0),
+                      jitter=full_jitter, retry_on=(IOError,))
+            >>> Failure(RetryError([TimeoutError(), TimeoutError(), ...]))
+        """
+
+        from .retry import exponential, retry
+        return retry(f, attempts, *args, backoff=backoff or exponential(),
+                     jitter=jitter, retry_on=retry_on, budget=budget, **kwargs)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    async def retry_async(f, attempts, *args, backoff=None, jitter=None,
+                          retry_on=(Exception,), budget=None, **kwargs):
+        """Async version of `retry` for a coroutine function f, sleeping with
+        `asyncio.sleep` between attempts.
+        """
+
+        from .retry import exponential, retry_async
+        return await retry_async(f, attempts, *args,
+                                 backoff=backoff or exponential(),
+                                 jitter=jitter, retry_on=retry_on,
+                                 budget=budget, **kwargs)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def set_capture(policy):
+        """Set how much of a caught exception a failure keeps alive and return
+        the previous policy.  A traceback references every frame along the
+        failing call path and all of their local variables, so holding many
+        failures can pin a lot of memory.
+
+            CAPTURE_FULL     keep the exception as raised, the default
+            CAPTURE_SUMMARY  replace the traceback by its formatted frames,
+                             attached as a `RemoteTraceback` cause
+            CAPTURE_ARGS     keep only the exception type and args
+
+        Under the last two chained exceptions are dropped as well.  The policy
+        applies process wide, to exceptions caught from then on.
+
+        ex:
+            >>> previous = set_capture(CAPTURE_SUMMARY)
+            >>> Try(lambda: 1 / 0)._value.__traceback__
+            >>> None
+        """
+
+        global _policy, _capture
+
+        captures = {CAPTURE_FULL    : None,
+                    CAPTURE_SUMMARY : _summarize,
+                    CAPTURE_ARGS    : _strip}
+        if policy not in captures:
+            raise ValueError("unknown capture policy {0!r}".format(policy))
+
+        previous = _policy
+        _policy, _capture = policy, captures[policy]
+        return previous
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def vectorize(f):
+        """Wrap the element-wise numpy function f so it returns a columnar
+        `TryArray`, capturing floating point errors per element instead of
+        failing the whole array.  Requires numpy, see `pyfnz.array.vectorize`.
+
+        ex:
+            >>> inv = vectorize(lambda x: 1.0 / x)
+            >>> inv(np.array([1.0, 0.0, 4.0]))
+            >>> TryArray([Success(1.0), Failure(ElementError(1)), Success(0.25)])
+        """
+
+        # numpy is an optional dependency
+        from .array import vectorize
+        return vectorize(f)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def map_parallel(f, iterable, executor='process', chunksize=None,
+                     max_workers=None, lazy=False):
+        """Run f over every item on a `concurrent.futures` pool, `executor` is
+        'process', 'thread' or an existing Executor which is left running.
+        Returns a list of Success/Failure in input order, or an iterator of
+        them if `lazy`, which keeps only a few chunks in flight.
+
+        Items are sent to the workers in chunks.  Unless `chunksize` is given
+        it adapts to the measured cost of f so each chunk holds roughly 10ms
+        of work, capped to a quarter of an even share per worker for sized
+        inputs.  With processes f must be picklable.  Exceptions are sent back
+        with the worker's traceback attached as a `RemoteTraceback` cause, one
+        that doesn't survive pickling becomes a `RemoteError`.
+
+        ex:
+            >>> map_parallel(int, ['1', 'a', '3'])
+            >>> [Success(1), Failure(ValueError(...)), Success(3)]
+        """
+
+        from .parallel import map_parallel
+        return map_parallel(f, iterable, executor, chunksize, max_workers,
+                            lazy)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def traverse(f, iterable):
+        """Run f over every item and collect the results into a list wrapped in
+        a success.  Like the Try constructor f returns a plain value, the first
+        exception raised is returned as a failure and the remaining items are
+        not visited.  A single exception guard covers the whole batch.
+
+        ex:
+            >>> traverse(int, ['1', '2'])
+            >>> Success([1, 2])
+
+            >>> traverse(int, ['1', 'a', '2'])
+            >>> Failure(ValueError("invalid literal for int() with base 10: 'a'",))
+        """
+
+        values = []
+        append = values.append
+        try:
+            for x in iterable:
+                append(f(x))
+        except Exception as e:
+            return _failure(e)
+        return Success(values)
+
+    #--------------------------------------------------------------------------
+
+    @staticmethod
+    def sequence(iterable):
+        """Turn an iterable of trys into a success of the list of their values,
+        or the first failure.
+        """
+
+        values = []
+        append = values.append
+        for result in iterable:
+            if type(result) is Failure:
+                return result
+            append(result._value)
+        return Success(values)
+
+    #--------------------------------------------------------------------------
+
     def is_failure(self):
         """Returns true if the Try is a Failure, false otherwise.
         """
 
-        if type(self) is Failure:
-            return True
-        elif type(self) is Success:
-            return False
-
     #--------------------------------------------------------------------------
 
     def is_success(self):
         """Returns true if the Try is a Success, false otherwise.
         """
 
-        if type(self) is Failure:
-            return False
-        elif type(self) is Success:
-            return True
-
     #--------------------------------------------------------------------------
 
     def foreach(self, g):
@@ -202,9 +644,6 @@ class Try(object):
         nothing.
         """
 
-        if type(self) is Success:
-            g(self._value)
-
     #--------------------------------------------------------------------------
 
     def to_either(self):
@@ -212,11 +651,6 @@ class Try(object):
         Success a Right.
         """
 
-        if type(self) is Failure:
-            return Left(self._value)
-        elif type(self) is Success:
-            return Right(self._value)
-
     #--------------------------------------------------------------------------
 
     def get(self):
@@ -224,11 +658,6 @@ class Try(object):
         is a Failure.
         """
 
-        if type(self) is Failure:
-            raise self._value
-        elif type(self) is Success:
-            return self._value
-
     #--------------------------------------------------------------------------
 
     def get_or_else(self, x):
@@ -236,11 +665,6 @@ class Try(object):
         this is a Failure.  Alias for `|`.
         """
 
-        if type(self) is Failure:
-            return x
-        elif type(self) is Success:
-            return self._value
-
     #--------------------------------------------------------------------------
 
     def or_else(self, x):
@@ -248,11 +672,6 @@ class Try(object):
         this is a Failure.
         """
 
-        if type(self) is Failure:
-            return x
-        elif type(self) is Success:
-            return self
-
     #--------------------------------------------------------------------------
 
     def recover(self, f):
@@ -260,11 +679,6 @@ class Try(object):
         this if this is a Success. Like map, f should return a value.
         """
 
-        if type(self) is Failure:
-            return Try(f, self._value)
-        elif type(self) is Success:
-            return self
-
     #--------------------------------------------------------------------------
 
     def recover_with(self, f):
@@ -272,11 +686,6 @@ class Try(object):
         this if this is a Success. Like flatmap, f should return a Try.
         """
 
-        if type(self) is Failure:
-            return f(self._value)
-        elif type(self) is Success:
-            return self
-
     #- Functor ----------------------------------------------------------------
 
     def map(self, f):
@@ -284,10 +693,11 @@ class Try(object):
         this if this is a Failure.
         """
 
-        if type(self) is Failure:
-            return self
-        elif type(self) is Success:
-            return Try(f, self._value)
+    #--------------------------------------------------------------------------
+
+    async def map_async(self, f):
+        """Async version of `map` for a coroutine function f, must be awaited.
+        """
 
     #- Monad ------------------------------------------------------------------
 
@@ -305,10 +715,25 @@ class Try(object):
         returns this if this is a Failure.
         """
 
-        if type(self) is Failure:
-            return self
-        elif type(self) is Success:
-            return g(self._value)
+    #--------------------------------------------------------------------------
+
+    async def flatmap_async(self, g):
+        """Async version of `flatmap` for a coroutine function g returning a
+        Try, must be awaited.
+        """
+
+    #--------------------------------------------------------------------------
+
+    def lazy(self):
+        """Start a lazy pipeline on this Try.  Stages added with `map` and
+        `flatmap` are only recorded, consecutive maps are fused into a single
+        call under one exception guard and the pipeline runs on `run`.  See
+        `pyfnz.lazy.Lazy`.
+        """
+
+        # prevent circular imports
+        from .lazy import Lazy
+        return Lazy(self)
 
 #------------------------------------------------------------------------------
 
@@ -318,7 +743,7 @@ class Failure(Try):
     # fields
     #--------------------------------------------------------------------------
 
-    __slots__ = ('_value',)
+    __slots__ = ('_value', '_hash')
 
     #--------------------------------------------------------------------------
     # base
@@ -330,6 +755,124 @@ class Failure(Try):
 
         return object.__new__(Failure)
 
+    #--------------------------------------------------------------------------
+
+    def __or__(self, other):
+        return other
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        # raise on the first `next`, not on `iter`, so `do` can catch it
+        raise TryIterExcept(self)
+        yield
+
+    #--------------------------------------------------------------------------
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = h = hash((_FAILURE, self._value))
+            return h
+
+    #--------------------------------------------------------------------------
+
+    def __reduce__(self):
+        return self.__reduce_ex__(2)
+
+    #--------------------------------------------------------------------------
+
+    def __reduce_ex__(self, protocol):
+        e = self._value
+        if not isinstance(e, BaseException):
+            return _restore, (_FAILURE, e)
+
+        reduced = e.__reduce_ex__(protocol)
+        state   = reduced[2] if len(reduced) > 2 else None
+        if isinstance(state, dict) and '__traceback__' in state:
+            state = dict(state)
+            del state['__traceback__']
+        return _restore, (_EXCEPTION, (reduced[0], reduced[1], state,
+                                       _trace(e)))
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def is_failure(self):
+        return True
+
+    #--------------------------------------------------------------------------
+
+    def is_success(self):
+        return False
+
+    #--------------------------------------------------------------------------
+
+    def foreach(self, g):
+        pass
+
+    #--------------------------------------------------------------------------
+
+    def to_either(self):
+        return Left(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def get(self):
+        raise self._value
+
+    #--------------------------------------------------------------------------
+
+    def get_or_else(self, x):
+        return x
+
+    #--------------------------------------------------------------------------
+
+    def or_else(self, x):
+        return x
+
+    #--------------------------------------------------------------------------
+
+    def recover(self, f):
+        try:
+            value = f(self._value)
+            instance = object.__new__(Success)
+            instance._value = value
+        except Exception as e:
+            if _capture is not None:
+                _capture(e)
+            instance = object.__new__(Failure)
+            instance._value = e
+
+        return instance
+
+    #--------------------------------------------------------------------------
+
+    def recover_with(self, f):
+        return f(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def map(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def flatmap(self, g):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    async def map_async(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    async def flatmap_async(self, g):
+        return self
+
 #------------------------------------------------------------------------------
 
 class Success(Try):
@@ -338,7 +881,7 @@ class Success(Try):
     # fields
     #--------------------------------------------------------------------------
 
-    __slots__ = ('_value',)
+    __slots__ = ('_value', '_hash')
 
     #--------------------------------------------------------------------------
     # base
@@ -349,3 +892,268 @@ class Success(Try):
         """
 
         return object.__new__(Success)
+
+    #--------------------------------------------------------------------------
+
+    def __or__(self, other):
+        return self._value
+
+    #--------------------------------------------------------------------------
+
+    def __iter__(self):
+        yield self._value
+
+    #--------------------------------------------------------------------------
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = h = hash((_SUCCESS, self._value))
+            return h
+
+    #--------------------------------------------------------------------------
+
+    def __reduce__(self):
+        return _restore, (_SUCCESS, self._value)
+
+    #--------------------------------------------------------------------------
+    # public methods
+    #--------------------------------------------------------------------------
+
+    def is_failure(self):
+        return False
+
+    #--------------------------------------------------------------------------
+
+    def is_success(self):
+        return True
+
+    #--------------------------------------------------------------------------
+
+    def foreach(self, g):
+        g(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def to_either(self):
+        return Right(self._value)
+
+    #--------------------------------------------------------------------------
+
+    def get(self):
+        return self._value
+
+    #--------------------------------------------------------------------------
+
+    def get_or_else(self, x):
+        return self._value
+
+    #--------------------------------------------------------------------------
+
+    def or_else(self, x):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def recover(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def recover_with(self, f):
+        return self
+
+    #--------------------------------------------------------------------------
+
+    def map(self, f):
+        try:
+            value = f(self._value)
+            instance = object.__new__(Success)
+            instance._value = value
+        except Exception as e:
+            if _capture is not None:
+                _capture(e)
+            instance = object.__new__(Failure)
+            instance._value = e
+
+        return instance
+
+    #--------------------------------------------------------------------------
+
+    def flatmap(self, g):
+        return g(self._value)
+
+    #--------------------------------------------------------------------------
+
+    async def map_async(self, f):
+        try:
+            value = await f(self._value)
+        except Exception as e:
+            return _failure(e)
+        return Success(value)
+
+    #--------------------------------------------------------------------------
+
+    async def flatmap_async(self, g):
+        return await g(self._value)
+
+#------------------------------------------------------------------------------
+# functions
+#------------------------------------------------------------------------------
+
+def partition_results(iterable, f=None):
+    """Split results in a single pass, returns `(successes, failures)`: the
+    values of every Success/Right and of every Failure/Left.  When f is given
+    it is run over each item instead and its return values and raised
+    exceptions are collected directly, without building a Try per item.
+
+    ex:
+        >>> partition_results([Right(1), Left('a'), Success(2)])
+        >>> ([1, 2], ['a'])
+
+        >>> partition_results(['1', 'a', '2'], int)
+        >>> ([1, 2], [ValueError("invalid literal for int() with base 10: 'a'",)])
+    """
+
+    successes, failures = [], []
+    succeed, fail = successes.append, failures.append
+
+    if f is None:
+        for result in iterable:
+            cls = type(result)
+            if cls is Success or cls is Right:
+                succeed(result._value)
+            else:
+                fail(result._value)
+    else:
+        iterator = iter(iterable)
+        while True:
+            # resume the loop under a fresh guard after each failure
+            try:
+                for x in iterator:
+                    succeed(f(x))
+                break
+            except Exception as e:
+                if _capture is not None:
+                    _capture(e)
+                fail(e)
+
+    return successes, failures
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def _trace(e):
+    """Formatted stack of e's traceback, or the text carried over from an
+    earlier pickling.  None if there is neither.  Only the file, line and
+    function of each frame are listed, the exception itself is shown by
+    chaining.  Texts are shared between failures raised along the same path
+    so a pickle holding many of them stores each path once.
+    """
+
+    tb = e.__traceback__
+    if tb is None:
+        cause = e.__cause__
+        return cause.args[0] if isinstance(cause, RemoteTraceback) else None
+
+    path  = tuple((frame.f_code, lineno)
+                  for frame, lineno in traceback.walk_tb(tb))
+    trace = _traces.get(path)
+    if trace is None:
+        if len(_traces) >= _MAX_TRACES:
+            _traces.clear()
+        trace = _traces[path] = '\n'.join(
+            ['Traceback (most recent call last):'] +
+            ['  File "{0}", line {1}, in {2}'.format(
+                code.co_filename, lineno, code.co_name)
+             for code, lineno in path])
+    return trace
+
+#------------------------------------------------------------------------------
+
+def _strip(e):
+    """Drop the traceback and chained exceptions of e.
+    """
+
+    e.__traceback__ = None
+    e.__cause__     = None
+    e.__context__   = None
+    e.__suppress_context__ = False
+
+#------------------------------------------------------------------------------
+
+def _summarize(e):
+    """Replace the traceback of e by its formatted frames.
+    """
+
+    trace = _trace(e)
+    _strip(e)
+    if trace is not None:
+        e.__cause__ = RemoteTraceback(trace)
+
+#------------------------------------------------------------------------------
+
+def _captured(e):
+    """Apply the capture policy to a caught exception and return it.
+    """
+
+    if _capture is not None:
+        _capture(e)
+    return e
+
+#------------------------------------------------------------------------------
+
+def _failure(e):
+    """Build a failure for a caught exception under the capture policy.
+    """
+
+    if _capture is not None:
+        _capture(e)
+    instance = object.__new__(Failure)
+    instance._value = e
+    return instance
+
+#------------------------------------------------------------------------------
+
+async def _settle(aw):
+    """Await aw and wrap its outcome in a try.
+    """
+
+    try:
+        value = await aw
+    except Exception as e:
+        return _failure(e)
+    return Success(value)
+
+#------------------------------------------------------------------------------
+
+def _restore(tag, value):
+    """Rebuild a pickled try from its variant tag and value.
+    """
+
+    tag = _OLD_TAGS.get(tag, tag)
+    if tag == _EXCEPTION:
+        make, args, state, trace = value
+        try:
+            e = make(*args)
+        except TypeError:
+            # constructor not matching the args, as the reduce of exceptions
+            # assumes
+            if not isinstance(make, type):
+                raise
+            e = make.__new__(make, *args)
+            e.args = args
+        if state:
+            if hasattr(e, '__setstate__'):
+                e.__setstate__(state)
+            else:
+                e.__dict__.update(state)
+        if trace is not None:
+            e.__cause__ = RemoteTraceback(trace)
+        value = e
+
+    instance = object.__new__(Success if tag == _SUCCESS else Failure)
+    instance._value = value
+    return instance
@@ -46,10 +46,19 @@ setup(
     author_email='moiz@electronicdreams.io',
     url='https://github.com/papaver/pyfnz',
     license='BSD 3-Clause License',
-    packages=['pyfnz'],
+    packages=['pyfnz', 'pyfnz.bench'],
+    python_requires='>=3.8',
+    extras_require={
+        'numpy': ['numpy']
+    },
     classifiers=[
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
-        'Programming Language :: Python :: 2.7',
-        'Programming Language :: Python :: 3.7'
+        'Programming Language :: Python :: 3',
+        'Programming Language :: Python :: 3 :: Only',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12'
     ])
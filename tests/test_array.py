@@ -0,0 +1,295 @@
+#------------------------------------------------------------------------------
+# test_array.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+try:
+    import numpy as np
+    from pyfnz.array import *
+except ImportError:
+    np = None
+
+from pyfnz.either import *
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+@unittest.skipIf(np is None, "numpy not installed")
+class EitherArrayTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_init(self):
+        """Test wrapping arrays and validating shapes.
+        """
+
+        array = EitherArray(np.arange(3))
+
+        self.assertEqual(3, len(array))
+        self.assertEqual([True] * 3, array.is_right().tolist())
+        with self.assertRaises(ValueError):
+            EitherArray(np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            EitherArray(np.arange(3), [True])
+
+        masked = EitherArray([1.0, 2.0], mask=[True, False])
+
+        self.assertEqual([Right(1.0), Left(None)], masked.to_list())
+        self.assertEqual("EitherArray([Right(1.0), Left(None)])", repr(masked))
+        self.assertEqual([None], masked.partition()[0].tolist())
+
+    #--------------------------------------------------------------------------
+
+    def test_list_conversion(self):
+        """Test converting from and to lists of eithers.
+        """
+
+        eithers = [Right(1), Left('a'), Right(3), Left(['b'])]
+        array   = EitherArray.from_list(eithers)
+
+        self.assertEqual(eithers, array.to_list())
+        self.assertEqual(eithers, list(array))
+        self.assertEqual([True, False, True, False], array.mask.tolist())
+        self.assertEqual([Right(1), Right(3)], EitherArray.from_list(
+            [Right(1), Right(3)]).to_list())
+
+    #--------------------------------------------------------------------------
+
+    def test_getitem(self):
+        """Test indexing single elements and sub arrays.
+        """
+
+        array = EitherArray.from_list([Right(1), Left('a'), Right(3)])
+
+        self.assertEqual(Right(1), array[0])
+        self.assertEqual(Left('a'), array[1])
+        self.assertEqual(Right(3), array[-1])
+        self.assertEqual([Left('a'), Right(3)], array[1:].to_list())
+        self.assertEqual([Right(1), Right(3)], array[array.mask].to_list())
+
+    #--------------------------------------------------------------------------
+
+    def test_map(self):
+        """Test mapping a ufunc over the rights.
+        """
+
+        array  = EitherArray.from_list([Right(1.0), Left('a'), Right(4.0)])
+        result = array.map(np.sqrt)
+
+        self.assertEqual([Right(1.0), Left('a'), Right(2.0)], result.to_list())
+
+        # f doesn't see the slots under lefts
+        column = EitherArray(np.array([4.0, -1.0, 9.0]))
+        with np.errstate(all='raise'):
+            result = column.ensure(lambda v: v >= 0, 'negative') \
+                           .map(np.sqrt)
+        self.assertEqual([Right(2.0), Left('negative'), Right(3.0)],
+                         result.to_list())
+
+    #--------------------------------------------------------------------------
+
+    def test_left_map(self):
+        """Test mapping over the lefts.
+        """
+
+        array = EitherArray.from_list([Right(1), Left('a')])
+        plain = EitherArray(np.arange(2))
+
+        self.assertEqual([Right(1), Left('A')],
+                         array.left_map(str.upper).to_list())
+        self.assertTrue(plain.left_map(str.upper) is plain)
+
+    #--------------------------------------------------------------------------
+
+    def test_ensure(self):
+        """Test validating rights with a vectorized predicate.
+        """
+
+        array  = EitherArray.from_list([Right(4), Left('a'), Right(-1)])
+        result = array.ensure(lambda v: v >= 0, 'negative')
+        per    = array.ensure(lambda v: v > 5, np.array(['x', 'y', 'z']))
+
+        self.assertEqual([Right(4), Left('a'), Left('negative')], result.to_list())
+        self.assertEqual([Left('x'), Left('a'), Left('z')], per.to_list())
+        self.assertTrue(array.ensure(lambda v: v < 10, 'big') is array)
+
+    #--------------------------------------------------------------------------
+
+    def test_flatmap(self):
+        """Test binding merges masks, the first left wins.
+        """
+
+        array  = EitherArray.from_list([Right(1), Left('a'), Right(30)])
+        bind   = lambda v: EitherArray(v * 2).ensure(lambda w: w < 10, 'big')
+        result = array.flatmap(bind)
+
+        self.assertEqual([Right(2), Left('a'), Left('big')], result.to_list())
+        self.assertEqual([Right(2), Right(60)],
+                         EitherArray(np.array([1, 30])).flatmap(
+                             lambda v: EitherArray(v * 2)).to_list())
+
+        column = EitherArray(np.array([4.0, -1.0, 0.0]))
+        with np.errstate(all='raise'):
+            result = column.ensure(lambda v: v >= 0, 'negative') \
+                           .flatmap(lambda v: EitherArray(np.log(v + 1)))
+        self.assertEqual([Left('negative')], result.to_list()[1:2])
+        with self.assertRaises(TypeError):
+            array.flatmap(lambda v: v)
+
+    #--------------------------------------------------------------------------
+
+    def test_get_or_else(self):
+        """Test filling lefts with a default.
+        """
+
+        array = EitherArray.from_list([Right(1), Left('a'), Right(3)])
+
+        self.assertEqual([1, 0, 3], array.get_or_else(0).tolist())
+        self.assertEqual([1, 8, 3],
+                         array.get_or_else(np.array([7, 8, 9])).tolist())
+
+    #--------------------------------------------------------------------------
+
+    def test_partition(self):
+        """Test splitting lefts from rights.
+        """
+
+        lefts, rights = EitherArray.from_list(
+            [Right(1), Left('a'), Right(3)]).partition()
+        no_lefts, all_rights = EitherArray(np.arange(2)).partition()
+
+        self.assertEqual(['a'], lefts.tolist())
+        self.assertEqual([1, 3], rights.tolist())
+        self.assertEqual([], no_lefts.tolist())
+        self.assertEqual([0, 1], all_rights.tolist())
+
+#------------------------------------------------------------------------------
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TryArrayTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_list_conversion(self):
+        """Test converting from and to lists of trys.
+        """
+
+        tries = [Try(lambda: 1), Try(lambda: 1 / 0)]
+        array = TryArray.from_list(tries)
+
+        self.assertEqual(tries, array.to_list())
+
+    #--------------------------------------------------------------------------
+
+    def test_map(self):
+        """Test an exception in map fails every success.
+        """
+
+        array  = TryArray.from_list([Try(lambda: 1), Try(lambda: 1 / 0)])
+        result = array.map(lambda v: v['x'])
+
+        self.assertEqual([False, False], result.mask.tolist())
+        self.assertTrue(isinstance(result[0]._value, IndexError))
+        self.assertTrue(isinstance(result[1]._value, ZeroDivisionError))
+        self.assertEqual([2, 0], array.map(lambda v: v * 2).get_or_else(0).tolist())
+
+    #--------------------------------------------------------------------------
+
+    def test_vectorize(self):
+        """Test capturing floating point errors per element.
+        """
+
+        inv    = Try.vectorize(lambda x: 1.0 / x)
+        result = inv(np.array([1.0, 0.0, 4.0]))
+
+        self.assertEqual([True, False, True], result.mask.tolist())
+        self.assertEqual([ERR_NONE, ERR_DIVIDE, ERR_NONE], result.codes.tolist())
+        self.assertEqual([1.0, 0.25], result.partition()[1].tolist())
+        with self.assertRaises(FloatingPointError):
+            result[1].get()
+
+    #--------------------------------------------------------------------------
+
+    def test_vectorize_codes(self):
+        """Test classifying the different floating point errors.
+        """
+
+        exp   = Try.vectorize(np.exp)(np.array([1.0, 1000.0, np.nan, -1e5]))
+        log   = Try.vectorize(np.log)(np.array([-1.0, 0.0, 1.0]))
+        idiv  = Try.vectorize(np.floor_divide)(np.arange(4), [1, 0, 1, 0])
+        codes = lambda r: r.codes.tolist()
+
+        self.assertEqual([ERR_NONE, ERR_OVERFLOW, ERR_NONFINITE, ERR_NONE],
+                         codes(exp))
+        self.assertEqual([ERR_INVALID, ERR_DIVIDE, ERR_NONE], codes(log))
+        self.assertEqual([ERR_NONE, ERR_DIVIDE, ERR_NONE, ERR_DIVIDE],
+                         codes(idiv))
+
+    #--------------------------------------------------------------------------
+
+    def test_vectorize_empty_search(self):
+        """Test errors reported for no element in particular don't search
+        forever, on empty input or once every failure is explained.
+        """
+
+        nan    = lambda x: x + (np.float64(0.0) / np.float64(0.0) == 1)
+        center = Try.vectorize(lambda x: x - x.mean())
+        result = center(np.array([1.0, np.inf, 3.0]))
+
+        self.assertEqual(0, len(Try.vectorize(nan)(np.array([], float))))
+        self.assertEqual([False, False, False], result.mask.tolist())
+
+    #--------------------------------------------------------------------------
+
+    def test_vectorize_inputs(self):
+        """Test failures of TryArray inputs are kept and broadcasting works.
+        """
+
+        first  = Try.vectorize(lambda x: x * 1.0)(np.array([1.0, 0.0, 2.0]))
+        inputs = TryArray(first.values, [True, False, True],
+                          [None, KeyError('k'), None])
+        result = Try.vectorize(np.divide)(inputs, np.array([0.0, 1.0, 2.0]))
+        scaled = Try.vectorize(np.multiply)(inputs, 2.0)
+
+        self.assertEqual([ERR_DIVIDE, ERR_RAISED, ERR_NONE], result.codes.tolist())
+        self.assertTrue(isinstance(result[1]._value, KeyError))
+        self.assertEqual([2.0, 0.0, 4.0], scaled.get_or_else(0.0).tolist())
+        with self.assertRaises(ValueError):
+            Try.vectorize(np.add)(inputs, np.arange(6).reshape(2, 3))
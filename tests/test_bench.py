@@ -0,0 +1,142 @@
+#------------------------------------------------------------------------------
+# test_bench.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from pyfnz import bench
+from pyfnz.bench import __main__ as cli
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class BenchTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # setup
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    #--------------------------------------------------------------------------
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_registry(self):
+        """Test every suite registered its benchmarks.
+        """
+
+        groups = set(b.group for b in bench.registry())
+
+        self.assertTrue(set(['either', 'try', 'clj']).issubset(groups))
+
+    #--------------------------------------------------------------------------
+
+    def test_measure(self):
+        """Test timing a callable.
+        """
+
+        number, seconds = bench.measure(lambda: None, min_time=0.001, repeat=2)
+
+        self.assertTrue(number >= 1)
+        self.assertTrue(seconds > 0)
+
+    #--------------------------------------------------------------------------
+
+    def test_run(self):
+        """Test running a filtered set of benchmarks with overridden sizes.
+        """
+
+        out     = io.StringIO()
+        results = bench.run('clj.first', sizes=(3, 5), min_time=0.001,
+                            repeat=1, out=out)
+
+        self.assertEqual([3, 5], [r['size'] for r in results])
+        self.assertTrue(all(r['ops_per_sec'] > 0 for r in results))
+        self.assertTrue(all(r['ns_per_op'] > 0 for r in results))
+        self.assertEqual(3, len(out.getvalue().splitlines()))
+
+    #--------------------------------------------------------------------------
+
+    def test_info(self):
+        """Test extra figures attached to an operation are reported.
+        """
+
+        out     = io.StringIO()
+        results = bench.run('pickle.dumps_right_compact', min_time=0.001,
+                            repeat=1, out=out)
+
+        self.assertTrue(results[0]['info']['bytes/obj'] > 0)
+        self.assertTrue('bytes/obj=' in out.getvalue())
+
+    #--------------------------------------------------------------------------
+
+    def test_dump_load_compare(self):
+        """Test round tripping results through json and comparing runs.
+        """
+
+        path    = os.path.join(self.tmpdir, 'results.json')
+        results = bench.run('either.map_*', min_time=0.001, repeat=1)
+
+        bench.dump(results, path)
+        with open(path) as f:
+            document = json.load(f)
+
+        self.assertTrue('python' in document)
+        self.assertEqual(results, bench.load(path))
+        self.assertEqual(set([1.0]), set(bench.compare(results, results).values()))
+        self.assertTrue('1.00x' in bench.report(results, results))
+
+    #--------------------------------------------------------------------------
+
+    def test_main(self):
+        """Test the command line entry point.
+        """
+
+        path = os.path.join(self.tmpdir, 'results.json')
+        args = ['-k', 'try.get_or_else_*', '-t', '0.001', '-r', '1', '-o', path]
+
+        self.assertEqual(0, cli.main(args))
+        self.assertEqual(2, len(bench.load(path)))
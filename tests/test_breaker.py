@@ -0,0 +1,277 @@
+#------------------------------------------------------------------------------
+# test_breaker.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import threading
+import time
+import unittest
+
+from pyfnz.breaker import *
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def fail():
+    raise IOError('down')
+
+#------------------------------------------------------------------------------
+
+def ok():
+    return 1
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_call(self):
+        """Test calls are wrapped in a Try while closed.
+        """
+
+        breaker = CircuitBreaker()
+
+        self.assertEqual(3, breaker.call(lambda x, y: x + y, 1, y=2) | None)
+        self.assertTrue(isinstance(breaker.call(fail)._value, IOError))
+        self.assertEqual(CLOSED, breaker.state)
+        with self.assertRaises(ValueError):
+            CircuitBreaker(failure_rate=0)
+
+    #--------------------------------------------------------------------------
+
+    def test_open(self):
+        """Test the circuit opens on the failure rate of the window and then
+        rejects without calling through.
+        """
+
+        calls   = []
+        breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4)
+        for f in (ok, fail, ok):
+            breaker.call(f)
+
+        self.assertEqual(CLOSED, breaker.state)
+
+        breaker.call(fail)
+        result = breaker.call(calls.append, 1)
+
+        self.assertEqual(OPEN, breaker.state)
+        self.assertTrue(isinstance(result._value, CircuitOpen))
+        self.assertEqual([], calls)
+
+    #--------------------------------------------------------------------------
+
+    def test_window(self):
+        """Test old outcomes slide out of the window.
+        """
+
+        breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4)
+        for f in (fail, ok, ok, ok, fail, ok, ok, ok, fail):
+            breaker.call(f)
+
+        self.assertEqual(CLOSED, breaker.state)
+
+    #--------------------------------------------------------------------------
+
+    def test_trip_on_success(self):
+        """Test a success bringing the count up to min_calls trips the circuit
+        when the failure rate is over the threshold.
+        """
+
+        breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=10)
+        for f in [fail] * 9 + [ok]:
+            breaker.call(f)
+
+        self.assertEqual(OPEN, breaker.state)
+        self.assertTrue(isinstance(breaker.call(ok)._value, CircuitOpen))
+
+    #--------------------------------------------------------------------------
+
+    def test_failure_on(self):
+        """Test only the given exception types count as failures.
+        """
+
+        breaker = CircuitBreaker(window=2, min_calls=2, failure_on=(IOError,))
+        for _ in range(4):
+            result = breaker.call(lambda: 1 / 0)
+
+        self.assertTrue(isinstance(result._value, ZeroDivisionError))
+        self.assertEqual(CLOSED, breaker.state)
+
+    #--------------------------------------------------------------------------
+
+    def test_half_open(self):
+        """Test probes close the circuit on success and reopen it on failure.
+        """
+
+        breaker = CircuitBreaker(window=2, min_calls=2, reset_timeout=0.01)
+        breaker.call(fail)
+        breaker.call(fail)
+        time.sleep(0.02)
+
+        self.assertEqual(HALF_OPEN, breaker.state)
+        self.assertTrue(isinstance(breaker.call(fail)._value, IOError))
+        self.assertEqual(OPEN, breaker.state)
+
+        time.sleep(0.02)
+
+        self.assertEqual(1, breaker.call(ok) | None)
+        self.assertEqual(CLOSED, breaker.state)
+
+    #--------------------------------------------------------------------------
+
+    def test_probes(self):
+        """Test only `probes` calls go through while half open.
+        """
+
+        breaker = CircuitBreaker(window=1, min_calls=1, reset_timeout=0.01,
+                                 probes=1)
+        breaker.call(fail)
+        time.sleep(0.02)
+
+        started = threading.Event()
+        release = threading.Event()
+        def slow():
+            started.set()
+            release.wait()
+            return 1
+
+        probe = threading.Thread(target=breaker.call, args=(slow,))
+        probe.start()
+        started.wait()
+        result = breaker.call(ok)
+        release.set()
+        probe.join()
+
+        self.assertTrue(isinstance(result._value, CircuitOpen))
+        self.assertEqual(CLOSED, breaker.state)
+
+    #--------------------------------------------------------------------------
+
+    def test_stale_success(self):
+        """Test a call started while closed doesn't count as a probe when it
+        finishes while half open.
+        """
+
+        breaker = CircuitBreaker(window=2, min_calls=2, reset_timeout=0.01)
+        events  = dict((name, (threading.Event(), threading.Event()))
+                       for name in ('old', 'probe'))
+        for started, release in events.values():
+            self.addCleanup(release.set)
+        def slow(name):
+            started, release = events[name]
+            started.set()
+            release.wait()
+            return 1
+
+        threads = {}
+        def start(name):
+            threads[name] = threading.Thread(target=breaker.call,
+                                             args=(slow, name))
+            threads[name].start()
+            events[name][0].wait()
+
+        start('old')
+        breaker.call(fail)
+        breaker.call(fail)
+        time.sleep(0.02)
+        start('probe')
+        events['old'][1].set()
+        threads['old'].join()
+
+        self.assertEqual(HALF_OPEN, breaker.state)
+
+        events['probe'][1].set()
+        threads['probe'].join()
+
+        self.assertEqual(CLOSED, breaker.state)
+
+    #--------------------------------------------------------------------------
+
+    def test_threads(self):
+        """Test concurrent calls keep the window consistent.
+        """
+
+        breaker = CircuitBreaker(window=100, min_calls=100)
+        def worker():
+            for _ in range(1000):
+                breaker.call(ok)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(100, breaker._count)
+        self.assertEqual(0, breaker._failures)
+
+    #--------------------------------------------------------------------------
+
+    def test_call_async(self):
+        """Test awaiting through the breaker, and a cancelled probe releasing
+        its slot.
+        """
+
+        breaker = CircuitBreaker(window=1, min_calls=1, reset_timeout=0.01)
+
+        async def value():
+            return 1
+
+        async def broken():
+            raise IOError('down')
+
+        async def run():
+            self.assertEqual(1, await breaker.call_async(value) | None)
+            await breaker.call_async(broken)
+            rejected = await breaker.call_async(value)
+            await asyncio.sleep(0.02)
+
+            probe = asyncio.ensure_future(
+                breaker.call_async(asyncio.sleep, 10))
+            await asyncio.sleep(0)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+            return rejected, await breaker.call_async(value)
+
+        rejected, result = asyncio.run(run())
+
+        self.assertTrue(isinstance(rejected._value, CircuitOpen))
+        self.assertEqual(1, result | None)
+        self.assertEqual(CLOSED, breaker.state)
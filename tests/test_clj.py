@@ -33,8 +33,14 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #------------------------------------------------------------------------------
 
+import builtins
+import gc
 import unittest
+import weakref
 
+from unittest import mock
+
+from pyfnz import clj
 from pyfnz.clj import *
 
 #------------------------------------------------------------------------------
@@ -93,6 +99,8 @@ class CoreTest(unittest.TestCase):
         self.assertEqual(None, second([]))
         self.assertEqual(None, second([1]))
         self.assertEqual(2, second([1, 2, 3]))
+        self.assertEqual(2, second(iter([1, 2, 3])))
+        self.assertEqual(None, second(x for x in [1]))
 
     #--------------------------------------------------------------------------
 
@@ -213,6 +221,13 @@ class CoreTest(unittest.TestCase):
         self.assertEqual('a', some(fn_a, ['b', 'a']))
         self.assertEqual('a', some(fn_a, ['b', 'a', 'c']))
 
+        items = iter(['b', 'a', 'c'])
+
+        self.assertEqual('a', some(fn_a, items))
+        self.assertEqual(['c'], list(items))
+        self.assertEqual(None, some(fn_a, (x for x in 'bcd')))
+        self.assertEqual(True, some(lambda x: x == 99999, range(100000)))
+
     #--------------------------------------------------------------------------
 
     def test_identity(self):
@@ -269,3 +284,192 @@ class CoreTest(unittest.TestCase):
         self.assertEqual(['d', 'c', 'b', 'a'], fg("abcd"))
         self.assertEqual("dcba", fgh("abcd"))
         self.assertEqual("d.c.b.a", fghi(['a', 'b', 'c', 'd'], "."))
+
+    #--------------------------------------------------------------------------
+
+    def test_comp_flatten(self):
+        """Test nested compositions are flattened and long ones still apply
+        right to left.
+        """
+
+        inc    = lambda x: x + 1
+        double = lambda x: x * 2
+        inner  = comp(inc, double)
+        outer  = comp(str, inner, inner)
+
+        self.assertEqual('7', outer(1))
+        self.assertEqual((str, inc, double, inc, double), clj._composed[outer])
+        self.assertEqual('7', comp(str, mock.MagicMock(return_value=7))(1))
+        self.assertEqual(14, comp(*([inc] * 10 + [double]))(2))
+        self.assertEqual(4, comp(inc, lambda x, y=0: x + y)(1, y=2))
+
+#------------------------------------------------------------------------------
+
+class SeqViewTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_view(self):
+        """Test view mode of rest, nxt and butlast on sequences.
+        """
+
+        items = tuple('abcdef')
+        tail  = nxt(items, view=True)
+
+        self.assertTrue(isinstance(tail, SeqView))
+        self.assertEqual(list('bcdef'), tail)
+        self.assertEqual(5, len(tail))
+        self.assertEqual('f', tail[-1])
+        self.assertEqual(['c', 'e'], tail[1::2])
+        self.assertEqual(['c', 'd', 'e'], butlast(rest(tail, view=True),
+                                                   view=True))
+        self.assertEqual('b', first(tail))
+        self.assertEqual('c', second(tail))
+        self.assertEqual('f', last(tail))
+        self.assertTrue('d' in tail)
+        self.assertEqual(None, nxt(['a'], view=True))
+        self.assertEqual([], rest(['a'], view=True))
+        self.assertEqual(None, butlast(['a'], view=True))
+        with self.assertRaises(IndexError):
+            tail[5]
+
+    #--------------------------------------------------------------------------
+
+    def test_shared(self):
+        """Test views read the original sequence instead of a copy.
+        """
+
+        items = [1, 2, 3]
+        tail  = rest(rest(items, view=True), view=True)
+        items[2] = 4
+
+        self.assertEqual(4, tail[0])
+        self.assertTrue(tail._seq is items)
+
+    #--------------------------------------------------------------------------
+
+    def test_buffer(self):
+        """Test buffers give memoryviews.
+        """
+
+        payload = bytearray(b'header:body')
+        tail    = nxt(payload, view=True)
+        body    = rest(tail, view=True)
+
+        self.assertTrue(isinstance(tail, memoryview))
+        self.assertEqual(b'eader:body', tail.tobytes())
+        self.assertEqual(b'ader:body', body.tobytes())
+        self.assertEqual(b'header:bod', butlast(payload, view=True).tobytes())
+        self.assertTrue(body.obj is payload)
+
+#------------------------------------------------------------------------------
+
+class LazySeqTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_seq(self):
+        """Test the clj functions on a sequence read once from a generator.
+        """
+
+        reads = []
+        def source():
+            for x in 'abc':
+                reads.append(x)
+                yield x
+
+        seq = LazySeq(source())
+
+        self.assertEqual('a', first(seq))
+        self.assertEqual(['a'], reads)
+        self.assertEqual('b', second(seq))
+        self.assertEqual('b', first(rest(seq)))
+        self.assertTrue(rest(seq) is seq.rest())
+        self.assertEqual(['c'], list(nxt(nxt(seq))))
+        self.assertEqual('c', last(seq))
+        self.assertEqual(['a', 'b'], list(butlast(seq)))
+        self.assertEqual(['a', 'b', 'c'], list(seq))
+        self.assertEqual(['a', 'b', 'c'], reads)
+        self.assertEqual("LazySeq(['a', 'b', 'c'])", repr(seq))
+
+    #--------------------------------------------------------------------------
+
+    def test_empty(self):
+        """Test the ends of a sequence.
+        """
+
+        one = LazySeq([1])
+
+        self.assertTrue(is_empty(LazySeq()))
+        self.assertFalse(LazySeq())
+        self.assertEqual(None, first(LazySeq()))
+        self.assertEqual(None, nxt(one))
+        self.assertTrue(is_empty(rest(one)))
+        self.assertEqual(None, butlast(one))
+        self.assertEqual("LazySeq([...])", repr(LazySeq([1])))
+
+    #--------------------------------------------------------------------------
+
+    def test_constructors(self):
+        """Test the lazy sequence constructors, infinite ones included.
+        """
+
+        self.assertEqual([1, 2, 4, 8], list(take(4, iterate(lambda x: 2 * x,
+                                                             1))))
+        self.assertEqual(['a', 'a'], list(repeat('a', 2)))
+        self.assertEqual(['a', 'a'], list(take(2, repeat('a'))))
+        self.assertEqual([1, 2, 1], list(take(3, cycle([1, 2]))))
+        self.assertEqual([1, 2, 3], list(concat([1], (2,), LazySeq([3]))))
+        self.assertEqual([0, 1, 2], list(take(3, clj.range())))
+        self.assertEqual([2, 4], list(clj.range(2, 6, 2)))
+        self.assertTrue(range is builtins.range)
+        self.assertEqual([3, 4], list(drop(3, clj.range(5))))
+        self.assertEqual(1000, first(drop(1000, clj.range())))
+
+    #--------------------------------------------------------------------------
+
+    def test_error(self):
+        """Test an error of the source is raised on every access instead of
+        ending the sequence.
+        """
+
+        def source():
+            yield 1
+            yield 2
+            raise IOError('lost connection')
+
+        seq = LazySeq(source())
+        with self.assertRaises(IOError):
+            list(seq)
+        with self.assertRaises(IOError):
+            list(seq)
+
+        self.assertEqual(2, second(seq))
+
+    #--------------------------------------------------------------------------
+
+    def test_release(self):
+        """Test consumed cells are collected once the head is dropped.
+        """
+
+        class Item(object):
+            pass
+
+        seq = LazySeq(Item() for _ in repeat(None))
+        ref = weakref.ref(first(seq))
+        seq = rest(seq)
+        first(seq)
+        gc.collect()
+
+        self.assertEqual(None, ref())
+
+        items = iter(LazySeq(Item() for _ in repeat(None, 10)))
+        ref   = weakref.ref(next(items))
+        next(items)
+        gc.collect()
+
+        self.assertEqual(None, ref())
@@ -0,0 +1,228 @@
+#------------------------------------------------------------------------------
+# test_compiler.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import types
+import unittest
+
+from pyfnz.compiler import *
+from pyfnz.either import *
+from pyfnz.tri import *
+from pyfnz.tri import TryIterExcept
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def parse(s):
+    return Right(int(s)) if s.isdigit() else Left(s)
+
+#------------------------------------------------------------------------------
+
+def has_generator(f):
+    return any(isinstance(c, types.CodeType) and c.co_name == '<genexpr>'
+               for c in f.__code__.co_consts)
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class CompileDoTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_either(self):
+        """Test lowering Either.do matches the runtime implementation.
+        """
+
+        def add(a, b, k=10):
+            x = 'untouched'
+            result = Either.do(x + y * k
+                               for x in parse(a)
+                               for y in parse(str(x + int(b))))
+            return result, x
+
+        compiled = compile_do(add)
+
+        self.assertFalse(has_generator(compiled))
+        for a, b in (('1', '2'), ('a', '2'), ('1', '-5'), ('3', '0')):
+            self.assertEqual(add(a, b), compiled(a, b))
+        self.assertEqual((Right(34), 'untouched'), compiled('1', '2', k=11))
+
+    #--------------------------------------------------------------------------
+
+    def test_try(self):
+        """Test lowering Try.do matches the runtime implementation.
+        """
+
+        @compile_do
+        def div(a, b):
+            return Try.do(z
+                          for x in Try(int, a)
+                          for y in Try(int, b)
+                          for z in Try(lambda: x / y))
+
+        self.assertFalse(has_generator(div))
+        self.assertEqual(2, div('4', '2') | None)
+        self.assertTrue(div('a', '2').is_failure())
+        self.assertTrue(div('4', '0').is_failure())
+        with self.assertRaises(ZeroDivisionError):
+            div('4', '0').get()
+
+    #--------------------------------------------------------------------------
+
+    def test_targets(self):
+        """Test tuple targets, nested do calls and shadowing scopes.
+        """
+
+        @compile_do
+        def f(a):
+            return Either.do((p, q, [p for p in range(2)], (lambda q: q)(0), r)
+                             for (p, q) in Right((a, a * 2))
+                             for r in Either.do(p + w
+                                                for w in parse(str(q))))
+
+        self.assertFalse(has_generator(f))
+        self.assertEqual(Right((2, 4, [0, 1], 0, 6)), f(2))
+        self.assertEqual(Left('-2'), f(-1))
+
+    #--------------------------------------------------------------------------
+
+    def test_closure(self):
+        """Test free variables keep tracking the enclosing scope.
+        """
+
+        k = 1
+
+        @compile_do
+        def f(a):
+            return Either.do(x + k for x in parse(a))
+
+        self.assertEqual(Right(2), f('1'))
+        k = 5
+        self.assertEqual(Right(6), f('1'))
+
+    #--------------------------------------------------------------------------
+
+    def test_method(self):
+        """Test compiling a method.
+        """
+
+        class Adder(object):
+            def __init__(self, n):
+                self.n = n
+
+            @compile_do
+            def add(self, a):
+                """Add n."""
+                return Either.do(x + self.n for x in parse(a))
+
+        self.assertEqual(Right(5), Adder(3).add('2'))
+        self.assertEqual('Add n.', Adder.add.__doc__)
+        self.assertTrue(Adder.add.__qualname__.endswith('Adder.add'))
+
+    #--------------------------------------------------------------------------
+
+    def test_private(self):
+        """Test private names of a method are mangled for its class.
+        """
+
+        class _Adder(object):
+            __base = 1
+
+            def __init__(self, n):
+                self.__n = n
+
+            @compile_do
+            def add(self, a, __k=0):
+                def scale(__v):
+                    return __v * 2
+                return Either.do(scale(x) + self.__n + _Adder.__base + __k
+                                 for x in parse(a))
+
+        self.assertEqual(Right(8), _Adder(3).add('2'))
+        self.assertEqual(Right(9), _Adder(3).add('2', 1))
+        with self.assertRaises(TypeError):
+            class Nested(object):
+                @compile_do
+                def f(self):
+                    def __g():
+                        return 1
+                    return Either.do(x for x in Right(__g()))
+
+    #--------------------------------------------------------------------------
+
+    def test_mixed(self):
+        """Test clauses over the other monad behave like the generator.
+        """
+
+        def either(f):
+            return Either.do(x + y for x in Try(f) for y in Right(2))
+
+        def not_monad():
+            return Either.do(x for x in [1])
+
+        compiled = compile_do(either)
+
+        self.assertEqual(Right(3), compiled(lambda: 1))
+        with self.assertRaises(TryIterExcept):
+            either(lambda: 1 / 0)
+        with self.assertRaises(TryIterExcept):
+            compiled(lambda: 1 / 0)
+        with self.assertRaises(TypeError):
+            compile_do(not_monad)()
+
+    #--------------------------------------------------------------------------
+
+    def test_untouched(self):
+        """Test calls that can't be lowered keep their runtime behaviour.
+        """
+
+        def f(a):
+            return Either.do(x for x in parse(a) if x > 1)
+
+        compiled = compile_do(f)
+
+        self.assertTrue(compiled is f)
+        self.assertEqual(Right(2), compiled('2'))
+
+    #--------------------------------------------------------------------------
+
+    def test_errors(self):
+        """Test functions that can't be compiled.
+        """
+
+        with self.assertRaises(TypeError):
+            compile_do(lambda: Either.do(x for x in Right(1)))
@@ -0,0 +1,153 @@
+#------------------------------------------------------------------------------
+# test_deadline.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pyfnz.deadline import *
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class DeadlineTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # setup
+    #--------------------------------------------------------------------------
+
+    def setUp(self):
+        self.release = threading.Event()
+
+    #--------------------------------------------------------------------------
+
+    def tearDown(self):
+        self.release.set()
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_deadline(self):
+        """Test the remaining budget of a deadline.
+        """
+
+        deadline = Deadline(10)
+        expired  = Deadline(-1)
+
+        self.assertTrue(9 < deadline.remaining() <= 10)
+        self.assertFalse(deadline.expired())
+        self.assertEqual(0.0, expired.remaining())
+        self.assertTrue(expired.expired())
+
+    #--------------------------------------------------------------------------
+
+    def test_with_timeout(self):
+        """Test calls finishing in time, raising and timing out.
+        """
+
+        start   = time.monotonic()
+        blocked = Try.with_timeout(self.release.wait, 0.01)
+
+        self.assertTrue(time.monotonic() - start < 1)
+        self.assertTrue(isinstance(blocked._value, TimeoutError))
+        self.assertEqual(3, Try.with_timeout(lambda x, y=0: x + y, 1, 1, y=2)
+                            | None)
+        self.assertTrue(isinstance(Try.with_timeout(lambda: 1 / 0, 1)._value,
+                                   ZeroDivisionError))
+        def expire():
+            raise TimeoutError('upstream')
+        own = Try.with_timeout(expire, 1)._value
+        self.assertEqual('upstream', str(own))
+        with ThreadPoolExecutor(1) as pool:
+            self.assertEqual(1, Try.with_timeout(lambda: 1, 1, executor=pool)
+                                | None)
+
+    #--------------------------------------------------------------------------
+
+    def test_deadline_chain(self):
+        """Test later stages of a flatmap chain only get what is left.
+        """
+
+        calls    = []
+        deadline = Deadline(0.05)
+        call     = lambda x: calls.append(x) or self.release.wait(x)
+
+        result = Try.with_timeout(call, deadline, 0.0) \
+                    .flatmap(lambda _: Try.with_timeout(call, deadline, 10)) \
+                    .flatmap(lambda _: Try.with_timeout(call, deadline, 0.0))
+
+        self.assertTrue(isinstance(result._value, TimeoutError))
+        self.assertEqual([0.0, 10], calls)
+        self.assertTrue(Try.with_timeout(call, deadline, 0.0).is_failure())
+        self.assertEqual([0.0, 10], calls)
+
+    #--------------------------------------------------------------------------
+
+    def test_with_timeout_async(self):
+        """Test awaiting coroutines with a timeout.
+        """
+
+        async def sleep(seconds, value=None):
+            await asyncio.sleep(seconds)
+            return value
+
+        async def fail():
+            raise ValueError()
+
+        async def expire():
+            raise TimeoutError('upstream')
+
+        async def run():
+            deadline = Deadline(0.05)
+            return [await Try.with_timeout_async(sleep, 1, 0, value=1),
+                    await Try.with_timeout_async(sleep, 0.01, 10),
+                    await Try.with_timeout_async(fail, 1),
+                    await Try.with_timeout_async(sleep, deadline, 10),
+                    await Try.with_timeout_async(sleep, deadline, 0),
+                    await Try.with_timeout_async(expire, 1)]
+
+        done, slow, failed, first, second, own = asyncio.run(run())
+
+        self.assertEqual(1, done | None)
+        self.assertTrue(isinstance(slow._value, TimeoutError))
+        self.assertTrue(isinstance(failed._value, ValueError))
+        self.assertTrue(isinstance(first._value, TimeoutError))
+        self.assertTrue(isinstance(second._value, TimeoutError))
+        self.assertEqual('upstream', str(own._value))
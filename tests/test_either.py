@@ -32,6 +32,9 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #------------------------------------------------------------------------------
 
+import asyncio
+import pickle
+import sys
 import unittest
 
 from pyfnz.either import *
@@ -62,6 +65,33 @@ class EitherTest(unittest.TestCase):
 
     #--------------------------------------------------------------------------
 
+    def test_pickle(self):
+        """Test pickling keeps the variant and value in a few bytes.
+        """
+
+        for either in (Left('a'), Right([1, 2])):
+            self.assertEqual(either, pickle.loads(pickle.dumps(either)))
+        self.assertTrue(len(pickle.dumps([Right(i) for i in range(1000)])) <=
+                        len(pickle.dumps(list(range(1000)))) + 1000 * 9)
+
+    #--------------------------------------------------------------------------
+
+
+    def test_hash(self):
+        """Test equal disjunctions hash alike and the variant is part of the
+        hash.
+        """
+
+        results = [Right(1), Left(1), Right(1), Left((1, 2)), Left((1, 2))]
+
+        self.assertEqual(3, len(set(results)))
+        self.assertEqual(hash(Right('a')), hash(Right('a')))
+        self.assertNotEqual(hash(Right(1)), hash(Left(1)))
+        self.assertEqual(2, {Right(1) : 1, Right(1) : 2}[Right(1)])
+        with self.assertRaises(TypeError):
+            hash(Right([1]))
+
+    #--------------------------------------------------------------------------
 
     def test_repr(self):
         """Test string representation.
@@ -96,6 +126,67 @@ class EitherTest(unittest.TestCase):
 
     #--------------------------------------------------------------------------
 
+    def test_do_block(self):
+        """Test decorator based do notation.
+        """
+
+        seen = []
+
+        @Either.do_block
+        def mul(a, b):
+            l = yield a
+            seen.append(l)
+            r = yield b
+            seen.append(r)
+            return l * r
+
+        @Either.do_block
+        def guarded(a):
+            try:
+                yield a
+            finally:
+                seen.append('closed')
+
+        @Either.do_block
+        def const():
+            return 'a'
+            yield
+
+        self.assertEqual(Right(8), mul(Right(2), Right(4)))
+        self.assertEqual(Left(1), mul(Left(1), Right(4)))
+        self.assertEqual(Left(3), mul(Right(2), Left(3)))
+        self.assertEqual([2, 4, 2], seen)
+        self.assertEqual(Left(5), guarded(Left(5)))
+        self.assertEqual([2, 4, 2, 'closed'], seen)
+        self.assertEqual(Right('a'), const())
+        self.assertEqual('mul', mul.__name__)
+
+    #--------------------------------------------------------------------------
+
+    def test_traverse(self):
+        """Test running an either returning function over many items.
+        """
+
+        seen  = []
+        check = lambda x: seen.append(x) or (Right(x * 2) if x < 3 else Left(x))
+
+        self.assertEqual(Right([2, 4]), Either.traverse(check, [1, 2]))
+        self.assertEqual(Left(3), Either.traverse(check, iter([1, 3, 4])))
+        self.assertEqual(Right([]), Either.traverse(check, []))
+        self.assertEqual([1, 2, 1, 3], seen)
+
+    #--------------------------------------------------------------------------
+
+    def test_sequence(self):
+        """Test turning many eithers into one.
+        """
+
+        self.assertEqual(Right([1, 2]), Either.sequence([Right(1), Right(2)]))
+        self.assertEqual(Left('a'), Either.sequence([Right(1), Left('a'),
+                                                     Left('b')]))
+
+    #--------------------------------------------------------------------------
+
     def test_is_left(self):
         """Test checking if an either is a left.
         """
@@ -378,6 +469,43 @@ class EitherTest(unittest.TestCase):
 
     #--------------------------------------------------------------------------
 
+    def test_do_async(self):
+        """Test async do notation.
+        """
+
+        async def lookup(key):
+            await asyncio.sleep(0)
+            return Right(key * 2) if key < 3 else Left(key)
+
+        async def total(a):
+            return await Either.do_async(x + y
+                                         for x in await lookup(a)
+                                         for y in await lookup(x))
+
+        self.assertEqual(Right(6), asyncio.run(total(1)))
+        self.assertEqual(Left(4), asyncio.run(total(2)))
+        self.assertEqual(Left(3), asyncio.run(total(3)))
+
+    #--------------------------------------------------------------------------
+
+    def test_tailrec(self):
+        """Test stack safe recursion through a right.
+        """
+
+        countdown = lambda n: Right(Left(n - 1)) if n > 0 else Right(Right(n))
+        fail_at_5 = lambda n: Left(n) if n == 5 else Right(Left(n - 1))
+        depth     = sys.getrecursionlimit() * 100
+
+        self.assertEqual(Right(0), Either.tailrec(countdown, depth))
+        self.assertEqual(Left(5), Either.tailrec(fail_at_5, depth))
+        self.assertEqual(Right('a'), Either.tailrec(lambda x: Right(Right(x)), 'a'))
+        with self.assertRaises(TypeError):
+            Either.tailrec(lambda n: Right(5), 0)
+        with self.assertRaises(TypeError):
+            Either.tailrec(lambda n: 5, 0)
+
+    #--------------------------------------------------------------------------
+
     def test_applicative_laws(self):
         """Test the applicative laws hold for Either.
         """
@@ -0,0 +1,149 @@
+#------------------------------------------------------------------------------
+# test_hedge.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import itertools
+import time
+import unittest
+
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def fake(outcomes):
+    """A fake call whose attempts play the given outcomes in turn: a number
+    of seconds to block before returning the attempt number, or an exception
+    to raise.  Returns the call and the list of attempts started.
+    """
+
+    started = []
+    counter = itertools.count()
+    def call():
+        attempt = next(counter)
+        started.append(attempt)
+        outcome = outcomes[attempt]
+        if isinstance(outcome, Exception):
+            raise outcome
+        time.sleep(outcome)
+        return attempt
+    return call, started
+
+#------------------------------------------------------------------------------
+
+def fake_async(outcomes):
+    started = []
+    counter = itertools.count()
+    async def call():
+        attempt = next(counter)
+        started.append(attempt)
+        outcome = outcomes[attempt]
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(outcome)
+        return attempt
+    return call, started
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class HedgedTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_fast(self):
+        """Test no hedge is started when the first attempt answers in time.
+        """
+
+        call, started = fake([0])
+
+        self.assertEqual(0, Try.hedged(call, after=1) | None)
+        self.assertEqual([0], started)
+
+    #--------------------------------------------------------------------------
+
+    def test_slow(self):
+        """Test the hedge wins over a slow first attempt.
+        """
+
+        call, started = fake([0.5, 0])
+        start  = time.monotonic()
+        result = Try.hedged(call, after=0.01)
+
+        self.assertEqual(1, result | None)
+        self.assertTrue(time.monotonic() - start < 0.4)
+        self.assertEqual([0, 1], started)
+
+    #--------------------------------------------------------------------------
+
+    def test_failures(self):
+        """Test failed attempts are replaced and the last error returned.
+        """
+
+        call, started = fake([ValueError(0), 0])
+        self.assertEqual(1, Try.hedged(call, after=1) | None)
+
+        call, started = fake([ValueError(0), KeyError(1)])
+        result = Try.hedged(call, after=1)
+
+        self.assertTrue(isinstance(result._value, KeyError))
+        self.assertEqual([0, 1], started)
+        with self.assertRaises(ValueError):
+            Try.hedged(call, max_attempts=0)
+
+    #--------------------------------------------------------------------------
+
+    def test_hedged_async(self):
+        """Test racing coroutines.
+        """
+
+        async def run(outcomes, **kwargs):
+            call, started = fake_async(outcomes)
+            return await Try.hedged_async(call, **kwargs), started
+
+        slow, slow_started = asyncio.run(run([10, 0], after=0.01))
+        fast, fast_started = asyncio.run(run([0], after=1))
+        fail, fail_started = asyncio.run(run([ValueError(), ValueError(), 0],
+                                             after=1, max_attempts=2))
+
+        self.assertEqual(1, slow | None)
+        self.assertEqual([0, 1], slow_started)
+        self.assertEqual(0, fast | None)
+        self.assertEqual([0], fast_started)
+        self.assertTrue(isinstance(fail._value, ValueError))
+        self.assertEqual([0, 1], fail_started)
@@ -0,0 +1,103 @@
+#------------------------------------------------------------------------------
+# test_lazy.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from pyfnz.either import *
+from pyfnz.lazy import *
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class LazyTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_either(self):
+        """Test running an either pipeline matches eager evaluation.
+        """
+
+        calls    = []
+        inc      = lambda x: calls.append(x) or x + 1
+        check    = lambda x: Right(x) if x < 5 else Left(x)
+        pipeline = Right(1).lazy().map(inc).map(inc).flatmap(check).map(inc)
+
+        self.assertEqual([], calls)
+        self.assertEqual(Right(4), pipeline.run())
+        self.assertEqual(Right(1).map(inc).map(inc).flatmap(check).map(inc),
+                         pipeline.run())
+        self.assertEqual(Left(6), pipeline.run(4))
+        self.assertEqual(Left('a'), Left('a').lazy().map(inc).run())
+        self.assertEqual(Right(1), Right(1).lazy().run())
+        with self.assertRaises(TypeError):
+            pipeline.run('a')
+
+    #--------------------------------------------------------------------------
+
+    def test_try(self):
+        """Test map stages are guarded and flatmap stages aren't.
+        """
+
+        pipeline = Try.pure(' 2').lazy().map(str.strip).map(int) \
+                                        .flatmap(lambda x: Try(lambda: 4 // x))
+
+        self.assertEqual(2, pipeline.run() | None)
+        self.assertTrue(isinstance(pipeline.run('a')._value, ValueError))
+        self.assertTrue(isinstance(pipeline.run('0')._value, ZeroDivisionError))
+        self.assertTrue(Try(lambda: 1 / 0).lazy().map(int).run().is_failure())
+        with self.assertRaises(ZeroDivisionError):
+            Try.pure(0).lazy().flatmap(lambda x: 1 / x).run()
+
+    #--------------------------------------------------------------------------
+
+    def test_reuse(self):
+        """Test pipelines are immutable and compiled once.
+        """
+
+        base     = Right(1).lazy().map(str)
+        extended = base.map(len)
+        base.run()
+        plan     = base._plan
+        base.run(2)
+
+        self.assertEqual(Right('1'), base.run())
+        self.assertEqual(Right(1), extended.run())
+        self.assertTrue(plan is base._plan)
+        self.assertEqual(1, len(plan))
+        self.assertEqual(2, len(extended._stages))
+        self.assertEqual(1, len(extended._plan))
@@ -0,0 +1,172 @@
+#------------------------------------------------------------------------------
+# test_memoize.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+import time
+import unittest
+
+from pyfnz import Left, Right, Try, memoize_either, memoize_try
+from pyfnz.memoize import CacheInfo
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class MemoizeTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_memoize_try(self):
+        """Test successes are cached and exceptions cached as failures.
+        """
+
+        calls = []
+
+        @memoize_try()
+        def lookup(key, scale=1):
+            calls.append(key)
+            return Try(lambda: 10 // key * scale)
+
+        self.assertEqual(5, lookup(2) | None)
+        self.assertEqual(5, lookup(2) | None)
+        self.assertEqual(10, lookup(2, scale=2) | None)
+        self.assertTrue(lookup(0).is_failure())
+        self.assertTrue(lookup(0).is_failure())
+        self.assertEqual([2, 2, 0], calls)
+        self.assertEqual(CacheInfo(2, 3, 0, 128, 3), lookup.cache_info())
+
+        lookup.cache_clear()
+
+        self.assertEqual(CacheInfo(0, 0, 0, 128, 0), lookup.cache_info())
+
+    #--------------------------------------------------------------------------
+
+    def test_failure_ttl(self):
+        """Test failures expire after failure_ttl and successes after ttl.
+        """
+
+        calls = []
+
+        @memoize_either(ttl=0.05, failure_ttl=0.01)
+        def lookup(key):
+            calls.append(key)
+            return Right(key) if key else Left('missing')
+
+        lookup(0)
+        lookup(1)
+        lookup(0)
+        lookup(1)
+        time.sleep(0.02)
+        lookup(0)
+        lookup(1)
+        time.sleep(0.04)
+        lookup(1)
+
+        self.assertEqual([0, 1, 0, 1], calls)
+
+    #--------------------------------------------------------------------------
+
+    def test_no_failure_cache(self):
+        """Test failures aren't cached with a failure_ttl of 0, and raised
+        exceptions pass through memoize_either.
+        """
+
+        calls = []
+
+        @memoize_either(failure_ttl=0)
+        def lookup(key):
+            calls.append(key)
+            if key is None:
+                raise KeyError(key)
+            return Left(key)
+
+        lookup(1)
+        lookup(1)
+        with self.assertRaises(KeyError):
+            lookup(None)
+
+        self.assertEqual([1, 1, None], calls)
+        self.assertEqual(0, lookup.cache_info().currsize)
+
+    #--------------------------------------------------------------------------
+
+    def test_eviction(self):
+        """Test the least recently used result is evicted first.
+        """
+
+        calls = []
+
+        @memoize_try(maxsize=2)
+        def lookup(key):
+            calls.append(key)
+            return Try.pure(key)
+
+        for key in (1, 2, 1, 3, 1, 2):
+            lookup(key)
+
+        self.assertEqual([1, 2, 3, 2], calls)
+        self.assertEqual(2, lookup.cache_info().evictions)
+        with self.assertRaises(ValueError):
+            memoize_try(maxsize=0)(lookup)
+
+    #--------------------------------------------------------------------------
+
+    def test_coalesce(self):
+        """Test concurrent misses of a key make a single call.
+        """
+
+        calls   = []
+        release = threading.Event()
+
+        @memoize_try()
+        def lookup(key):
+            calls.append(key)
+            release.wait()
+            return Try.pure(key)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(lookup(1)))
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        while lookup.cache_info().hits < 3:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual([1], calls)
+        self.assertEqual([Try.pure(1)] * 4, results)
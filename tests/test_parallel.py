@@ -0,0 +1,177 @@
+#------------------------------------------------------------------------------
+# test_parallel.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import threading
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from pyfnz.parallel import *
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class Custom(Exception):
+    """Its constructor takes two args but only passes one on, which the
+    default exception pickling can't rebuild.
+    """
+
+    def __init__(self, a, b):
+        Exception.__init__(self, a)
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def parse(s):
+    if s == 'custom':
+        raise Custom('custom', None)
+    elif s == 'lambda':
+        raise ValueError(lambda: s)
+    elif s == 'lock':
+        return threading.Lock()
+    return int(s)
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class MapParallelTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_thread(self):
+        """Test mapping on a thread pool keeps order and failures.
+        """
+
+        inputs  = [str(i) if i % 7 else 'x' for i in range(500)]
+        results = Try.map_parallel(int, inputs, executor='thread',
+                                   max_workers=4)
+
+        self.assertEqual(500, len(results))
+        self.assertEqual([i for i in range(500) if i % 7],
+                         [r.get() for r in results if r.is_success()])
+        self.assertTrue(all(isinstance(r._value, ValueError)
+                            for r in results[::7]))
+        self.assertTrue(results[0]._value.__traceback__ is not None)
+
+    #--------------------------------------------------------------------------
+
+    def test_lazy(self):
+        """Test lazily mapping an iterator with a fixed chunk size.
+        """
+
+        seen    = []
+        inputs  = (seen.append(i) or i for i in range(10000))
+        results = Try.map_parallel(lambda x: x * 2, inputs, executor='thread',
+                                   chunksize=10, max_workers=2, lazy=True)
+
+        self.assertEqual([0, 2, 4], [next(results).get() for _ in range(3)])
+        self.assertTrue(len(seen) < 10000)
+        self.assertEqual(sum(range(10000)) * 2, 6 + sum(r.get() for r in results))
+
+    #--------------------------------------------------------------------------
+
+    def test_executor(self):
+        """Test running on a caller owned pool, which is left running.
+        """
+
+        with ThreadPoolExecutor(2) as pool:
+            first  = Try.map_parallel(int, ['1', '2'], executor=pool)
+            second = Try.map_parallel(int, ['3'], executor=pool)
+
+        self.assertEqual([1, 2, 3], [r.get() for r in first + second])
+        with self.assertRaises(ValueError):
+            Try.map_parallel(int, [], executor='fiber')
+
+    #--------------------------------------------------------------------------
+
+    def test_process(self):
+        """Test exceptions sent back from worker processes.
+        """
+
+        results = Try.map_parallel(parse, ['1', 'x', 'custom', 'lambda', '4'],
+                                   max_workers=2)
+        _, invalid, custom, unpicklable, _ = [r._value for r in results]
+
+        self.assertEqual([1, 4], [results[0].get(), results[4].get()])
+        self.assertTrue(isinstance(invalid, ValueError))
+        self.assertTrue(isinstance(invalid.__cause__, RemoteTraceback))
+        self.assertTrue('in parse' in str(invalid.__cause__))
+        self.assertTrue(isinstance(custom, Custom))
+        self.assertEqual(('custom',), custom.args)
+        self.assertTrue(isinstance(unpicklable, RemoteError))
+        self.assertTrue('ValueError: <function' in str(unpicklable))
+        self.assertTrue('in parse' in str(unpicklable.__cause__))
+
+    #--------------------------------------------------------------------------
+
+    def test_process_results(self):
+        """Test a result that can't be sent back only fails its own item.
+        """
+
+        results = Try.map_parallel(parse, ['1', 'lock', 'x', '4'],
+                                   chunksize=4, max_workers=1)
+        _, lock, invalid, _ = [r._value for r in results]
+
+        self.assertEqual([1, 4], [results[0].get(), results[3].get()])
+        self.assertTrue(isinstance(lock, RemoteError))
+        self.assertTrue("_thread.lock result can't be pickled" in str(lock))
+        self.assertTrue(isinstance(invalid, ValueError))
+
+    #--------------------------------------------------------------------------
+
+    def test_adaptive_chunksize(self):
+        """Test chunks grow for cheap work and stay within an even share.
+        """
+
+        sizes = []
+
+        # record the chunks as they are submitted
+        class Pool(ThreadPoolExecutor):
+            def submit(self, fn, *args):
+                sizes.append(len(args[1]))
+                return ThreadPoolExecutor.submit(self, fn, *args)
+
+        with Pool(2) as pool:
+            results = Try.map_parallel(abs, list(range(100000)), executor=pool)
+
+        self.assertEqual(100000, len(results))
+        self.assertEqual(1, sizes[0])
+        self.assertTrue(max(sizes) > 1)
+        self.assertTrue(max(sizes) <= 100000 // 8)
@@ -0,0 +1,123 @@
+#------------------------------------------------------------------------------
+# test_pipeline.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from unittest import mock
+
+from pyfnz import Pipeline, batched
+from pyfnz.either import *
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def parse(s):
+    return Try(int, s)
+
+#------------------------------------------------------------------------------
+
+def positive(x):
+    return Right(x) if x > 0 else Left('not positive: {0}'.format(x))
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class PipelineTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_run(self):
+        """Test running the steps on a single value.
+        """
+
+        calls    = []
+        double   = lambda x: calls.append(x) or Right(x * 2)
+        pipeline = Pipeline([parse, positive, double])
+
+        self.assertEqual(Right(4), pipeline.run('2'))
+        self.assertEqual(Left('not positive: -1'), pipeline.run('-1'))
+        self.assertTrue(pipeline.run('a').is_failure())
+        self.assertEqual([2], calls)
+        with self.assertRaises(ValueError):
+            Pipeline([])
+
+    #--------------------------------------------------------------------------
+
+    def test_run_many(self):
+        """Test streaming results.
+        """
+
+        seen    = []
+        inputs  = (seen.append(s) or s for s in ['1', '0', '3'])
+        results = Pipeline([parse, positive]).run_many(inputs)
+
+        self.assertEqual(Right(1), next(results))
+        self.assertEqual(['1'], seen)
+        self.assertEqual([Left('not positive: 0'), Right(3)], list(results))
+
+    #--------------------------------------------------------------------------
+
+    def test_run_batches(self):
+        """Test batch aware steps are called once per batch with the values
+        still on the right track.
+        """
+
+        batches = []
+
+        @batched
+        def lookup(keys):
+            batches.append(keys)
+            return [Right(k * 10) if k < 4 else Left(k) for k in keys]
+
+        pipeline = Pipeline([parse, positive, lookup])
+        results  = list(pipeline.run_batches(['1', 'a', '2', '0', '3', '4'], 4))
+
+        self.assertEqual([Right(10), Right(20), Right(30), Left(4)],
+                         [results[i] for i in (0, 2, 4, 5)])
+        self.assertTrue(results[1].is_failure())
+        self.assertEqual(Left('not positive: 0'), results[3])
+        self.assertEqual([[1, 2], [3, 4]], batches)
+        self.assertEqual(Right(20), pipeline.run('2'))
+        self.assertEqual([], list(pipeline.run_batches([], 4)))
+        with self.assertRaises(ValueError):
+            list(Pipeline([batched(lambda xs: [])]).run_batches([1], 1))
+
+        # objects answering any attribute are not batch steps
+        step = mock.MagicMock(side_effect=lambda x: Right(x + 1))
+        self.assertEqual([Right(2)], list(Pipeline([step]).run_batches([1], 1)))
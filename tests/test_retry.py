@@ -0,0 +1,152 @@
+#------------------------------------------------------------------------------
+# test_retry.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import asyncio
+import itertools
+import time
+import unittest
+
+from pyfnz.retry import *
+from pyfnz.tri import Try
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+def flaky(errors):
+    """A call raising the given exceptions in turn, then returning the number
+    of calls made before.
+    """
+
+    counter = itertools.count()
+    def call():
+        n = next(counter)
+        if n < len(errors):
+            raise errors[n]
+        return n
+    return call
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class RetryTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_retry(self):
+        """Test retrying until success and recording every failure.
+        """
+
+        none   = constant(0)
+        errors = [IOError(0), IOError(1)]
+
+        self.assertEqual(2, Try.retry(flaky(errors), 3, backoff=none) | None)
+
+        failure = Try.retry(flaky(errors * 2), 3, backoff=none)
+
+        self.assertTrue(isinstance(failure._value, RetryError))
+        self.assertEqual(errors + errors[:1], failure._value.errors)
+        self.assertEqual(3, Try.retry(lambda x, y: x + y, 1, 1, y=2) | None)
+        with self.assertRaises(ValueError):
+            Try.retry(flaky([]), 0)
+
+    #--------------------------------------------------------------------------
+
+    def test_retry_on(self):
+        """Test only the given exception types are retried.
+        """
+
+        failure = Try.retry(flaky([IOError(), KeyError(), IOError()]), 5,
+                            backoff=constant(0), retry_on=(IOError,))
+
+        self.assertEqual([IOError, KeyError],
+                         [type(e) for e in failure._value.errors])
+
+    #--------------------------------------------------------------------------
+
+    def test_backoff(self):
+        """Test backoff delays and jitter.
+        """
+
+        delays  = exponential(0.1, 0.5)
+        start   = time.monotonic()
+        Try.retry(flaky([IOError()] * 2), 3, backoff=constant(0.01))
+
+        self.assertTrue(time.monotonic() - start >= 0.02)
+        self.assertEqual([0.1, 0.2, 0.4, 0.5], [delays(n) for n in range(4)])
+        self.assertTrue(all(0 <= full_jitter(1.0) <= 1.0 for _ in range(100)))
+        self.assertTrue(all(0.5 <= equal_jitter(1.0) <= 1.0
+                            for _ in range(100)))
+
+    #--------------------------------------------------------------------------
+
+    def test_budget(self):
+        """Test a shared budget caps the retries made.
+        """
+
+        budget  = RetryBudget(0.001, burst=2)
+        first   = Try.retry(flaky([IOError()] * 5), 5, backoff=constant(0),
+                            budget=budget)
+        second  = Try.retry(flaky([IOError()] * 5), 5, backoff=constant(0),
+                            budget=budget)
+
+        self.assertEqual(3, len(first._value.errors))
+        self.assertEqual(1, len(second._value.errors))
+        self.assertTrue(RetryBudget(1000, burst=1).acquire())
+        with self.assertRaises(ValueError):
+            RetryBudget(0)
+
+    #--------------------------------------------------------------------------
+
+    def test_retry_async(self):
+        """Test retrying coroutines.
+        """
+
+        def flaky_async(errors):
+            call = flaky(errors)
+            async def run():
+                await asyncio.sleep(0)
+                return call()
+            return run
+
+        success = asyncio.run(Try.retry_async(flaky_async([IOError()]), 2,
+                                              backoff=constant(0)))
+        failure = asyncio.run(Try.retry_async(flaky_async([IOError()] * 2), 2,
+                                              backoff=constant(0)))
+
+        self.assertEqual(1, success | None)
+        self.assertEqual(2, len(failure._value.errors))
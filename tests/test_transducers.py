@@ -0,0 +1,148 @@
+#------------------------------------------------------------------------------
+# test_transducers.py
+#------------------------------------------------------------------------------
+# BSD 3-Clause License
+#
+# Copyright (c) 2018, Affirm
+# Copyright (c) 2018, Moiz Merchant
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# * Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+#
+# * Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+#
+# * Neither the name of the copyright holder nor the names of its
+#   contributors may be used to endorse or promote products derived from
+#   this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import itertools
+import operator
+import unittest
+
+from pyfnz.clj import comp
+from pyfnz.transducers import *
+
+#------------------------------------------------------------------------------
+# helper functions
+#------------------------------------------------------------------------------
+
+inc    = lambda x: x + 1
+is_odd = lambda x: x % 2 == 1
+
+#------------------------------------------------------------------------------
+# test classes
+#------------------------------------------------------------------------------
+
+class TransducersTest(unittest.TestCase):
+
+    #--------------------------------------------------------------------------
+    # tests
+    #--------------------------------------------------------------------------
+
+    def test_transduce(self):
+        """Test composed transducers apply left to right and stop early on an
+        infinite input.
+        """
+
+        xform = comp(filtering(is_odd), mapping(inc), taking(3))
+
+        self.assertEqual(12, transduce(xform, operator.add, 0,
+                                       itertools.count()))
+        self.assertEqual(0, transduce(mapping(inc), operator.add, 0, []))
+
+    #--------------------------------------------------------------------------
+
+    def test_into(self):
+        """Test collecting into copies of lists, sets and dicts.
+        """
+
+        to = [0]
+
+        self.assertEqual([0, 2, 3], into(to, mapping(inc), [1, 2]))
+        self.assertEqual([0], to)
+        self.assertEqual({1, 2}, into(set(), mapping(inc), [0, 1, 0]))
+        self.assertEqual({0: 0, 1: 1}, into({}, mapping(lambda x: (x, x * x)),
+                                            range(2)))
+
+    #--------------------------------------------------------------------------
+
+    def test_sequence(self):
+        """Test streaming reads the input only as far as needed.
+        """
+
+        reads = []
+        def source():
+            for x in itertools.count():
+                reads.append(x)
+                yield x
+
+        items = sequence(comp(mapcat(lambda x: [x] * x), taking(4)), source())
+
+        self.assertEqual(1, next(items))
+        self.assertEqual([0, 1], reads)
+        self.assertEqual([2, 2, 3], list(items))
+        self.assertEqual([0, 1, 2, 3], reads)
+        self.assertEqual([[0, 1], [2]], list(sequence(partitioning_all(2),
+                                                      range(3))))
+
+    #--------------------------------------------------------------------------
+
+    def test_transducers(self):
+        """Test each transducer.
+        """
+
+        items = [1, 1, 2, 3, 3, 4, 1, 5]
+
+        self.assertEqual([2], into([], removing(is_odd), [1, 2, 3]))
+        self.assertEqual([1, 3], into([], keeping(lambda x: x if is_odd(x)
+                                                  else None), [1, 2, 3]))
+        self.assertEqual([1, 2, 3], into([], cat, [[1], [], [2, 3]]))
+        self.assertEqual([1, 1, 2], into([], taking_while(lambda x: x < 3),
+                                         items))
+        self.assertEqual([2, 3], into([], comp(dropping(2), taking(2)), items))
+        self.assertEqual([3, 3, 4, 1, 5],
+                         into([], dropping_while(lambda x: x < 3), items))
+        self.assertEqual([[1, 1, 2], [3, 3, 4], [1, 5]],
+                         into([], partitioning_all(3), items))
+        self.assertEqual([1, 2, 3, 4, 1, 5], into([], deduping(), items))
+        self.assertEqual([1, 2, 3, 4, 5], into([], distinct(), items))
+        self.assertEqual([], into([], taking(0), items))
+        with self.assertRaises(ValueError):
+            partitioning_all(0)
+
+    #--------------------------------------------------------------------------
+
+    def test_reduced(self):
+        """Test early termination through cat and the flush of a partial
+        partition.
+        """
+
+        xform = comp(taking(3), partitioning_all(2))
+
+        self.assertEqual([[1, 2], [3]], into([], xform, itertools.count(1)))
+        self.assertEqual([1, 2], into([], comp(cat, taking(2)),
+                                      [[1, 2, 3], itertools.count()]))
+        self.assertEqual(3, transduce(mapping(inc),
+                                      lambda acc, x: reduced(acc + x), 2, [0]))
+        self.assertEqual(1, unreduced(ensure_reduced(reduced(1))))
+        self.assertTrue(is_reduced(reduced(None)))
+        self.assertEqual(6, transduce(mapping(inc),
+                                      completing(operator.add, lambda a: 2 * a),
+                                      0, [0, 1]))
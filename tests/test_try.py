@@ -32,13 +32,30 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #------------------------------------------------------------------------------
 
+import asyncio
+import pickle
 import re
+import sys
 import unittest
 
 from functools import partial
 
+from pyfnz import tri
+from pyfnz.either import Left, Right
 from pyfnz.tri import *
 
+#------------------------------------------------------------------------------
+# helper classes
+#------------------------------------------------------------------------------
+
+class Custom(Exception):
+    """Its constructor doesn't match its args, which the default exception
+    pickling can't rebuild.
+    """
+
+    def __init__(self, a, b):
+        Exception.__init__(self, a)
+
 #------------------------------------------------------------------------------
 # test classes
 #------------------------------------------------------------------------------
@@ -82,6 +99,73 @@ class TryTest(unittest.TestCase):
 
     #--------------------------------------------------------------------------
 
+    def test_pickle(self):
+        """Test pickling keeps the variant, value and failure details.
+        """
+
+        def fail():
+            raise Custom('boom', None)
+
+        failure = Try(fail)
+        failure._value.code = 42
+        copies  = [pickle.loads(pickle.dumps(t))
+                   for t in (Try.pure([1]), Left('a').to_try(), failure)]
+        error   = copies[2]._value
+        again   = pickle.loads(pickle.dumps(copies[2]))._value
+
+        self.assertEqual(Try.pure([1]), copies[0])
+        self.assertEqual(Left('a').to_try(), copies[1])
+        self.assertTrue(type(error) is Custom)
+        self.assertEqual(('boom',), error.args)
+        self.assertEqual(42, error.code)
+        self.assertTrue(error.__traceback__ is None)
+        self.assertTrue(isinstance(error.__cause__, RemoteTraceback))
+        self.assertTrue('in fail' in str(error.__cause__))
+        self.assertEqual(str(error.__cause__), str(again.__cause__))
+        self.assertTrue(len(pickle.dumps([Try.pure(i) for i in range(1000)])) <=
+                        len(pickle.dumps(list(range(1000)))) + 1000 * 9)
+
+        # tags written before they were made distinct from the either ones
+        self.assertEqual(Try.pure([1]), tri._restore(1, [1]))
+        self.assertEqual(Left('a').to_try(), tri._restore(0, 'a'))
+
+    #--------------------------------------------------------------------------
+
+    def test_pickle_exceptions(self):
+        """Test pickling keeps what the exception's own pickling keeps.
+        """
+
+        def copy(e):
+            def fail():
+                raise e
+            return pickle.loads(pickle.dumps(Try(fail)))._value
+
+        error  = copy(OSError(2, 'nope', 'file.txt'))
+        decode = UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid byte')
+
+        self.assertEqual((2, 'file.txt'), (error.errno, error.filename))
+        self.assertTrue(isinstance(error.__cause__, RemoteTraceback))
+        self.assertEqual(5, copy(StopIteration(5)).value)
+        self.assertEqual(str(decode), str(copy(decode)))
+        self.assertEqual(3, copy(SyntaxError('bad', ('f.py', 3, 1, 'x'))).lineno)
+
+    #--------------------------------------------------------------------------
+
+    def test_hash(self):
+        """Test equal tries hash alike, failures by their exception.
+        """
+
+        error   = ValueError()
+        results = [Try.pure(1), Try.pure(1), Left(error).to_try(),
+                   Left(error).to_try(), Left(ValueError()).to_try()]
+
+        self.assertEqual(3, len(set(results)))
+        self.assertNotEqual(hash(Try.pure(1)), hash(Left(1).to_try()))
+        self.assertNotEqual(hash(Try.pure(1)), hash(Right(1)))
+        self.assertNotEqual(hash(Left(1).to_try()), hash(Left(1)))
+
+    #--------------------------------------------------------------------------
+
     def test_repr(self):
         """Test string representation.
         """
@@ -115,6 +199,119 @@ class TryTest(unittest.TestCase):
 
     #--------------------------------------------------------------------------
 
+    def test_do_block(self):
+        """Test decorator based do notation.
+        """
+
+        seen = []
+
+        @Try.do_block
+        def div(a, b):
+            x = yield Try(int, a)
+            seen.append(x)
+            y = yield Try(int, b)
+            seen.append(y)
+            z = yield Try(lambda: x // y)
+            return [z] * 2
+
+        @Try.do_block
+        def guarded(a):
+            try:
+                yield Try(int, a)
+            finally:
+                seen.append('closed')
+
+        self.assertEqual([2, 2], div('4', '2') | None)
+        self.assertTrue(div('a', '2').is_failure())
+        self.assertTrue(div('4', 'b').is_failure())
+        self.assertTrue(div('4', '0').is_failure())
+        self.assertEqual([4, 2, 4, 4, 0], seen)
+        self.assertTrue(guarded('a').is_failure())
+        self.assertEqual([4, 2, 4, 4, 0, 'closed'], seen)
+
+    #--------------------------------------------------------------------------
+
+    def test_set_capture(self):
+        """Test the traceback capture policies.
+        """
+
+        def fail():
+            try:
+                {}['key']
+            except KeyError:
+                raise ValueError('boom')
+
+        previous = Try.set_capture(CAPTURE_SUMMARY)
+        try:
+            summary = Try(fail)._value
+            Try.set_capture(CAPTURE_ARGS)
+            stripped = Try.traverse(lambda x: fail(), [1])._value
+            _, errors = partition_results([1], lambda x: fail())
+            with self.assertRaises(ValueError):
+                Try.set_capture('none')
+        finally:
+            self.assertEqual(CAPTURE_ARGS, Try.set_capture(previous))
+
+        full = Try.pure(1).map(lambda x: fail())._value
+
+        self.assertEqual(CAPTURE_FULL, previous)
+        self.assertTrue(summary.__traceback__ is None)
+        self.assertTrue(summary.__context__ is None)
+        self.assertTrue(isinstance(summary.__cause__, RemoteTraceback))
+        self.assertTrue('in fail' in str(summary.__cause__))
+        for e in (stripped, errors[0]):
+            self.assertEqual(('boom',), e.args)
+            self.assertTrue(e.__traceback__ is None)
+            self.assertTrue(e.__cause__ is None and e.__context__ is None)
+        self.assertTrue(full.__traceback__ is not None)
+        self.assertTrue(isinstance(full.__context__, KeyError))
+
+    #--------------------------------------------------------------------------
+
+    def test_traverse(self):
+        """Test running a function over many items.
+        """
+
+        seen   = []
+        to_int = lambda x: seen.append(x) or int(x)
+
+        self.assertEqual([1, 2], Try.traverse(to_int, ['1', '2']) | None)
+        self.assertTrue(Try.traverse(to_int, iter(['1', 'a', '2'])).is_failure())
+        self.assertEqual([], Try.traverse(to_int, []) | None)
+        self.assertEqual(['1', '2', '1', 'a'], seen)
+
+    #--------------------------------------------------------------------------
+
+    def test_sequence(self):
+        """Test turning many trys into one.
+        """
+
+        failure = Try(lambda: 1 / 0)
+
+        self.assertEqual([1, 2], Try.sequence([Try.pure(1), Try.pure(2)]) | None)
+        self.assertTrue(Try.sequence([Try.pure(1), failure]) is failure)
+
+    #--------------------------------------------------------------------------
+
+    def test_partition_results(self):
+        """Test splitting results and function calls in a single pass.
+        """
+
+        results = [Try.pure(1), Try(lambda: 1 / 0), Right(2), Left('a')]
+
+        successes, failures = partition_results(results)
+        values, errors      = partition_results(['1', 'a', '2', 'b'], int)
+
+        self.assertEqual([1, 2], successes)
+        self.assertTrue(isinstance(failures[0], ZeroDivisionError))
+        self.assertEqual('a', failures[1])
+        self.assertEqual([1, 2], values)
+        self.assertEqual(2, len(errors))
+        self.assertTrue(all(isinstance(e, ValueError) for e in errors))
+        self.assertEqual(([], []), partition_results([]))
+
+    #--------------------------------------------------------------------------
+
     def test_is_failure(self):
         """Test checking if try is a failure.
         """
@@ -324,6 +521,120 @@ class TryTest(unittest.TestCase):
 
     #--------------------------------------------------------------------------
 
+    def test_do_async(self):
+        """Test async do notation.
+        """
+
+        async def parse(s):
+            await asyncio.sleep(0)
+            return Try(int, s)
+
+        async def add(a, b):
+            return await Try.do_async(x + y
+                                      for x in await parse(a)
+                                      for y in await parse(b))
+
+        async def first(a):
+            return await Try.do_async(x for x in await parse(a))
+
+        self.assertEqual(3, asyncio.run(add('1', '2')) | None)
+        self.assertTrue(asyncio.run(add('a', '2')).is_failure())
+        self.assertTrue(asyncio.run(add('1', 'b')).is_failure())
+        self.assertEqual(1, asyncio.run(first('1')) | None)
+
+    #--------------------------------------------------------------------------
+
+    def test_of_async(self):
+        """Test wrapping coroutines.
+        """
+
+        async def div(x, y=1):
+            await asyncio.sleep(0)
+            return x / y
+
+        async def cancelled():
+            raise asyncio.CancelledError()
+
+        self.assertEqual(2, asyncio.run(Try.of_async(div, 4, y=2)) | None)
+        self.assertTrue(asyncio.run(Try.of_async(div, 1, 0)).is_failure())
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(Try.of_async(cancelled))
+
+    #--------------------------------------------------------------------------
+
+    def test_map_async(self):
+        """Test mapping and binding coroutine functions.
+        """
+
+        async def inv(x):
+            return 1 / x
+
+        async def inv_safe(x):
+            return await Try.of_async(inv, x)
+
+        async def run():
+            failure = Try(lambda: 1 / 0)
+            return [await Try.pure(2).map_async(inv),
+                    await Try.pure(0).map_async(inv),
+                    await Try.pure(4).flatmap_async(inv_safe),
+                    await Try.pure(0).flatmap_async(inv_safe),
+                    await failure.map_async(inv) is failure,
+                    await failure.flatmap_async(inv_safe) is failure]
+
+        half, zero, quarter, zero_safe, *same = asyncio.run(run())
+
+        self.assertEqual(0.5, half | None)
+        self.assertTrue(isinstance(zero._value, ZeroDivisionError))
+        self.assertEqual(0.25, quarter | None)
+        self.assertTrue(zero_safe.is_failure())
+        self.assertEqual([True, True], same)
+
+    #--------------------------------------------------------------------------
+
+    def test_gather(self):
+        """Test awaiting many awaitables, failures don't affect the others.
+        """
+
+        running = []
+        peak    = []
+
+        async def work(x):
+            running.append(x)
+            peak.append(len(running))
+            await asyncio.sleep(0.001)
+            running.remove(x)
+            if x == 2:
+                raise ValueError(x)
+            return x
+
+        results = asyncio.run(Try.gather(*[work(x) for x in range(6)], limit=2))
+        unbound = asyncio.run(Try.gather(work(1), work(2)))
+
+        self.assertEqual([0, 1, None, 3, 4, 5], [r | None for r in results])
+        self.assertTrue(isinstance(results[2]._value, ValueError))
+        self.assertEqual(2, max(peak[:6]))
+        self.assertEqual([1, None], [r | None for r in unbound])
+        self.assertEqual([], asyncio.run(Try.gather()))
+
+    #--------------------------------------------------------------------------
+
+    def test_tailrec(self):
+        """Test stack safe recursion through a success.
+        """
+
+        countdown = lambda n: Try(lambda: Left(n - 1) if n > 0 else Right(n))
+        fail_at_5 = lambda n: Try(lambda: Left(n - 1) if n != 5 else 1 / 0)
+        raise_now = lambda n: [][0]
+        depth     = sys.getrecursionlimit() * 100
+
+        self.assertEqual(0, Try.tailrec(countdown, depth) | -1)
+        self.assertTrue(Try.tailrec(fail_at_5, depth).is_failure())
+        self.assertTrue(Try.tailrec(raise_now, depth).is_failure())
+        with self.assertRaises(TypeError):
+            Try.tailrec(lambda n: Try.pure(5), 0)
+
+    #--------------------------------------------------------------------------
+
     def test_monad_laws(self):
         """Test the monad laws holds for Try.
         """